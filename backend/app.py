@@ -2,7 +2,7 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
 from config import SECRET_KEY
-from db.database import init_db
+from db.database import init_db, init_app as init_db_app, connection_profile, pool_stats
 from flask_jwt_extended import JWTManager
 from dotenv import load_dotenv
 
@@ -15,7 +15,7 @@ from routes.recommendation_routes import recommendation_bp
 from routes.activity_routes import activity_bp
 from routes.calendar_routes import calendar_bp
 from routes.chatbot_routes import chatbot_bp
-from routes.community_routes import community_bp, init_community_tables
+from routes.community_routes import community_bp
 from routes.memo_routes import memo_bp
 from routes.diet_routes import diet_bp
 from routes.preference_routes import pref_bp
@@ -23,44 +23,82 @@ from routes.plan_routes import plan_bp
 from routes.calorie_routes import calorie_bp
 from routes.weeklytrend_routes import stats_bp
 from routes.workout_routes import workout_bp
+from services.llm_cache import llm_cache_stats
+from models.profile_snapshot import profile_cache_stats
+from routes.ai_engine import USER_STATE
+from services.log_writer import chat_log_writer
+from utils.json_provider import FastJSONProvider
+from utils.compression import init_app as init_compression, available_encodings
+from services.lifecycle import readiness
 
-app = Flask(__name__)
-app.config["SECRET_KEY"] = SECRET_KEY
+def create_app() -> Flask:
+    """
+    Flask 앱 생성 (운영: wsgi.py + gunicorn.conf.py, 개발: python app.py)
+    init_db() 는 스키마가 최신이면 SELECT 한 번이라 워커마다 호출해도 비용이 거의 없다
+    """
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = SECRET_KEY
+    # 빠른 JSON 직렬화 (orjson 있으면 사용) + 응답 압축 (gzip/br)
+    app.json = FastJSONProvider(app)
+    init_compression(app)
 
-app.config["JWT_SECRET_KEY"] = SECRET_KEY
-# flask_jwt_extended 만 사용합니다. (PyJWT 의존성 제거)
-JWTManager(app)
+    app.config["JWT_SECRET_KEY"] = SECRET_KEY
+    # flask_jwt_extended 만 사용합니다. (PyJWT 의존성 제거)
+    JWTManager(app)
 
-# CORS (React 연동)
-# CORS(app, origins=["http://localhost:5173"], supports_credentials=True) - 기존 CORS 코드
+    # CORS (React 연동)
+    # CORS(app, origins=["http://localhost:5173"], supports_credentials=True) - 기존 CORS 코드
 
-# 개발 환경(3000)과 배포 환경(80 또는 도메인) 모두 허용 - 배포 위해 수정
-CORS(app, resources={r"/api/*": {"origins": ["http://localhost", "http://localhost:5173", "http://localhost:80"]}}, supports_credentials=True)
+    # 개발 환경(3000)과 배포 환경(80 또는 도메인) 모두 허용 - 배포 위해 수정
+    CORS(app, resources={r"/api/*": {"origins": ["http://localhost", "http://localhost:5173", "http://localhost:80"]}}, supports_credentials=True)
 
-# DB 초기화
-init_db()
-init_community_tables()
+    # DB 초기화 + 요청 단위 연결 공유
+    init_db()
+    init_db_app(app)
 
-# Blueprint 등록 (React API 기준)
-app.register_blueprint(user_bp, url_prefix="/api/user")
-app.register_blueprint(schedule_bp, url_prefix="/api/schedule")
-app.register_blueprint(recommendation_bp, url_prefix="/api/recommendation")
-app.register_blueprint(activity_bp, url_prefix="/api/activity")
-app.register_blueprint(calendar_bp, url_prefix="/api/calendar")
-app.register_blueprint(chatbot_bp, url_prefix="/api/ai")
-app.register_blueprint(community_bp, url_prefix="/api/community")
-app.register_blueprint(memo_bp, url_prefix="/api/memo")
-app.register_blueprint(diet_bp, url_prefix="/api/diet")
-app.register_blueprint(pref_bp, url_prefix="/api/preferences")
-app.register_blueprint(plan_bp, url_prefix="/api/plan")
-app.register_blueprint(calorie_bp, url_prefix="/api/summary")
-app.register_blueprint(stats_bp, url_prefix="/api/stats")
-app.register_blueprint(workout_bp, url_prefix="/api")
+    # Blueprint 등록 (React API 기준)
+    app.register_blueprint(user_bp, url_prefix="/api/user")
+    app.register_blueprint(schedule_bp, url_prefix="/api/schedule")
+    app.register_blueprint(recommendation_bp, url_prefix="/api/recommendation")
+    app.register_blueprint(activity_bp, url_prefix="/api/activity")
+    app.register_blueprint(calendar_bp, url_prefix="/api/calendar")
+    app.register_blueprint(chatbot_bp, url_prefix="/api/ai")
+    app.register_blueprint(community_bp, url_prefix="/api/community")
+    app.register_blueprint(memo_bp, url_prefix="/api/memo")
+    app.register_blueprint(diet_bp, url_prefix="/api/diet")
+    app.register_blueprint(pref_bp, url_prefix="/api/preferences")
+    app.register_blueprint(plan_bp, url_prefix="/api/plan")
+    app.register_blueprint(calorie_bp, url_prefix="/api/summary")
+    app.register_blueprint(stats_bp, url_prefix="/api/stats")
+    app.register_blueprint(workout_bp, url_prefix="/api")
 
-# Health Check
-@app.route("/api/health")
-def health():
-    return jsonify({"status": "ok"})
+    # Health Check (생존 + 지표)
+    @app.route("/api/health")
+    def health():
+        return jsonify({
+            "status": "ok",
+            "db": {
+                "pragmas": connection_profile(),
+                "pool": pool_stats(),
+            },
+            "llm_cache": llm_cache_stats(),
+            "profile_cache": profile_cache_stats(),
+            "chat_state": USER_STATE.stats(),
+            "chat_log_writer": chat_log_writer.stats(),
+            "http": {"json": app.json.backend, "compression": available_encodings()},
+        })
+
+    # Readiness (트래픽 받을 준비 여부 - 종료 중/DB 불가면 503)
+    @app.route("/api/ready")
+    def ready():
+        ok, checks = readiness()
+        return jsonify({"ready": ok, **checks}), (200 if ok else 503)
+
+    return app
+
+
+app = create_app()
 
 if __name__ == "__main__":
+    # 개발용 서버 (운영은 gunicorn -c gunicorn.conf.py wsgi:app)
     app.run(host="0.0.0.0", port=5000)  # 0.0.0.0 = 모든 인터페이스에서 접근 허용
@@ -0,0 +1,233 @@
+"""
+의도 분류기 골든셋 검증 + 마이크로 벤치마크
+
+    python -m benchmarks.intent_classifier            # 골든셋 + 벤치마크
+    python -m benchmarks.intent_classifier --check    # 골든셋만 (CI 용)
+
+- 골든셋: 메시지별 기대 (intent, meta_intent, greeting, goal, slots)
+- 기존 구현(키워드 리스트 순회)과 결과가 같은지 랜덤 조합 메시지로도 비교
+- 종료 코드: 불일치가 있으면 1
+"""
+import argparse
+import random
+import re
+import sys
+import time
+
+from routes.intent_classifier import classify
+
+
+# ===============================
+# 기존 구현 (비교 기준)
+# ===============================
+def _legacy_normalize_goal(msg: str):
+    if ("체지방" in msg and "근육" in msg) or ("감량" in msg and "근육" in msg) or ("리컴" in msg):
+        return "recomposition"
+    if ("감량" in msg) or ("체지방" in msg) or ("다이어트" in msg):
+        return "fat_loss"
+    if ("근육" in msg) or ("근대비" in msg) or ("증량" in msg) or ("벌크" in msg):
+        return "muscle_gain"
+    return None
+
+
+def _legacy_extract(message: str):
+    msg = (message or "").strip()
+    data = {}
+    m_h = re.search(r"(\d{3})\s*cm", msg, re.IGNORECASE)
+    m_w = re.search(r"(\d{2,3})\s*kg", msg, re.IGNORECASE)
+    if m_h:
+        data["height"] = int(m_h.group(1))
+    if m_w:
+        data["weight"] = int(m_w.group(1))
+    m_meals = re.search(r"(\d)\s*끼", msg)
+    if m_meals:
+        data["meals_per_day"] = int(m_meals.group(1))
+    else:
+        if re.fullmatch(r"\s*\d\s*", msg):
+            data["meals_per_day"] = int(msg.strip())
+    if ("헬스장" in msg) or ("헬스" in msg) or ("짐" in msg):
+        data["environment"] = "gym"
+        data["equipment"] = "full gym equipment"
+    if "5일" in msg:
+        data["environment"] = "gym 5x/week"
+    goal = _legacy_normalize_goal(msg)
+    if goal:
+        data["goal"] = goal
+    return data
+
+
+def _legacy_detect_intent(message: str) -> str:
+    text = message.lower().strip()
+    if any(k in text for k in [
+        "내 키", "키는", "신장은",
+        "내 몸무게", "몸무게는", "체중은",
+        "내 이름", "이름은",
+        "내 목표", "목표는",
+        "내 칼로리", "섭취 칼로리", "섭취칼로리",
+        "단백질은", "단백질 목표",
+        "활동 소모", "운동 소모", "소모 칼로리"
+    ]):
+        return "info_request"
+    if any(k in text for k in ["칼로리", "단백질"]) and "식단" not in text:
+        return "food_nutrition"
+    if any(k in text for k in ["포함", "넣어서", "같이", "먹을건데"]) and "식단" in text:
+        return "diet_with_food"
+    if any(k in text for k in ["대신", "말고", "다른"]):
+        return "diet_food_specific"
+    if "식단" in text:
+        return "diet"
+    if any(k in text for k in ["운동", "루틴"]):
+        return "exercise"
+    return "unknown"
+
+
+_LEGACY_META = {
+    "WHY_NOT_WORK": ["왜 안돼", "왜 안됨", "안돼?", "왜 그래"],
+    "CONFIRM_MEMORY": ["저장", "기억", "기억해", "남아있어"],
+    "CONFUSED": ["뭐야 이게", "뭔데 이거", "이상해", "왜 이래", "말이 안돼"],
+    "FOLLOW_UP": ["그럼", "그래서", "그러면"]
+}
+
+
+def _legacy_detect_meta_intent(message: str):
+    text = message.lower().strip()
+    if any(k in text for k in ["저장해", "기억해줘", "남겨줘"]):
+        return "CONFIRM_MEMORY"
+    if len(text) > 20:
+        return None
+    for intent, keywords in _LEGACY_META.items():
+        if any(k in text for k in keywords):
+            return intent
+    return None
+
+
+def _legacy_is_greeting(message: str) -> bool:
+    text = message.lower().strip()
+    greetings = [
+        "안녕", "안녕하세요", "ㅎㅇ", "하이", "hello",
+        "좋은 아침", "굿모닝", "굿이브닝", "반가워"
+    ]
+    return any(g in text for g in greetings)
+
+
+def legacy_classify(message: str):
+    slots = _legacy_extract(message)
+    return (
+        _legacy_detect_intent(message),
+        _legacy_detect_meta_intent(message),
+        _legacy_is_greeting(message),
+        _legacy_normalize_goal((message or "").strip()),
+        slots,
+    )
+
+
+def new_classify(message: str):
+    c = classify(message)
+    return (c.intent, c.meta_intent, c.greeting, c.goal, c.slots)
+
+
+# ===============================
+# 골든셋: (메시지, intent, meta_intent, greeting, goal, slots)
+# ===============================
+GOLDEN = [
+    ("안녕하세요", "unknown", None, True, None, {}),
+    ("Hello coach", "unknown", None, True, None, {}),
+    ("내 키는 얼마야?", "info_request", None, False, None, {}),
+    ("내 칼로리 목표 알려줘", "info_request", None, False, None, {}),
+    ("섭취칼로리는?", "info_request", None, False, None, {}),
+    ("닭가슴살 칼로리 알려줘", "food_nutrition", None, False, None, {}),
+    ("단백질 많은 식단 짜줘", "diet", None, False, None, {}),
+    ("바나나 포함해서 식단 짜줘", "diet_with_food", None, False, None, {}),
+    ("그릭 요거트 대신 먹을 거", "diet_food_specific", None, False, None, {}),
+    ("오늘 식단 추천해줘", "diet", None, False, None, {}),
+    ("하체 운동 루틴 추천", "exercise", None, False, None, {}),
+    ("오늘 날씨 어때", "unknown", None, False, None, {}),
+    ("왜 안돼?", "unknown", "WHY_NOT_WORK", False, None, {}),
+    ("이거 저장해줘 나중에 다시 볼 수 있게 부탁해 정말로", "unknown", "CONFIRM_MEMORY", False, None, {}),
+    ("기억 남아있어?", "unknown", "CONFIRM_MEMORY", False, None, {}),
+    ("뭐야 이게", "unknown", "CONFUSED", False, None, {}),
+    ("그럼 다음은?", "unknown", "FOLLOW_UP", False, None, {}),
+    ("그러면 이 문장은 스무 글자를 훨씬 넘어가니까 메타 아님", "unknown", None, False, None, {}),
+    ("173cm 80kg 체지방 감량하고 근육 늘리고 싶어", "unknown", None, False, "recomposition",
+     {"height": 173, "weight": 80, "goal": "recomposition"}),
+    ("다이어트 중이고 하루 3끼 먹어", "unknown", None, False, "fat_loss",
+     {"meals_per_day": 3, "goal": "fat_loss"}),
+    ("벌크업 하고 싶어, 헬스장 주 5일", "unknown", None, False, "muscle_gain",
+     {"environment": "gym 5x/week", "equipment": "full gym equipment", "goal": "muscle_gain"}),
+    ("3", "unknown", None, False, None, {"meals_per_day": 3}),
+    ("좋은 아침! 운동 루틴 알려줘", "exercise", None, True, None, {}),
+]
+
+
+def check_golden() -> int:
+    failures = 0
+    for msg, *expected in GOLDEN:
+        got = new_classify(msg)
+        if list(got) != expected:
+            failures += 1
+            print(f"[GOLDEN] 불일치: {msg!r}\n  expected={expected}\n  got     ={list(got)}")
+    return failures
+
+
+def _fuzz_messages(n: int, seed: int = 7):
+    """키워드 조각을 섞은 메시지 - 기존 구현과 동치인지 확인용"""
+    from routes.intent_classifier import KEYWORDS
+
+    words = sorted({w for ws in KEYWORDS.values() for w in ws})
+    filler = ["오늘", "좀", "해줘", "?", "!", "173cm", "80kg", "2끼", "근데", "  ", "ABC", "닭가슴살"]
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        parts = rng.sample(words, rng.randint(0, 3)) + rng.sample(filler, rng.randint(0, 4))
+        rng.shuffle(parts)
+        sep = rng.choice([" ", ""])
+        out.append(sep.join(parts))
+    return out
+
+
+def check_equivalence(messages) -> int:
+    failures = 0
+    for msg in messages:
+        a, b = legacy_classify(msg), new_classify(msg)
+        if a != b:
+            failures += 1
+            if failures <= 10:
+                print(f"[EQUIV] 불일치: {msg!r}\n  legacy={a}\n  new   ={b}")
+    return failures
+
+
+def bench(fn, messages, repeat: int, rounds: int = 5) -> float:
+    """rounds 번 측정 중 최솟값 (us / message)"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for msg in messages:
+                fn(msg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / (repeat * len(messages)) * 1e6
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="intent classifier golden set + benchmark")
+    parser.add_argument("--check", action="store_true", help="골든셋/동치성 검사만 수행")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    fuzz = _fuzz_messages(2000)
+    failures = check_golden() + check_equivalence(fuzz)
+    print(f"golden={len(GOLDEN)} fuzz={len(fuzz)} failures={failures}")
+    if args.check or failures:
+        return 1 if failures else 0
+
+    messages = [g[0] for g in GOLDEN]
+    legacy_us = bench(legacy_classify, messages, args.repeat)
+    new_us = bench(new_classify, messages, args.repeat)
+    print(f"legacy : {legacy_us:8.2f} us/message")
+    print(f"classify: {new_us:8.2f} us/message  (x{legacy_us / new_us:.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
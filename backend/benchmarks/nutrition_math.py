@@ -0,0 +1,109 @@
+"""
+영양 목표 계산: 행 단위 vs NumPy 배치 검증 + 처리량 비교
+
+    python -m benchmarks.nutrition_math              # 검증 + 벤치마크
+    python -m benchmarks.nutrition_math --check      # 검증만 (CI 용)
+    python -m benchmarks.nutrition_math --sizes 1000 100000
+
+- 랜덤 프로필(누락값/다양한 표기 포함)에 대해 calc_nutrition_goal 과
+  calc_nutrition_goal_batch 결과가 모두 같은지 확인
+- 종료 코드: 불일치가 있으면 1
+"""
+import argparse
+import random
+import sys
+import time
+
+from utils.nutrition_math import calc_nutrition_goal, calc_nutrition_goal_batch
+
+_SEXES = ["male", "female", "M", "F", "남", "여", "", None]
+_LEVELS = ["low", "medium", "high", "sedentary", "light", "moderate", "active", "very_active", "", None, "unknown"]
+_GOALS = ["감량", "loss", "증량", "gain", "유지", "maintain", "", None, "recomposition"]
+
+
+def random_profiles(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        rows.append((
+            rng.choice([None, 0] + [round(rng.uniform(40, 130), 1)] * 8),   # weight
+            rng.choice([None] + [rng.randint(145, 200)] * 8),                 # height
+            rng.choice([None, 0] + [rng.randint(15, 80)] * 6),                # age
+            rng.choice(_SEXES),
+            rng.choice(_LEVELS),
+            rng.choice(_GOALS),
+        ))
+    return rows
+
+
+def per_row(rows):
+    out = []
+    for r in rows:
+        try:
+            out.append(calc_nutrition_goal(*r))
+        except ValueError:
+            out.append(None)
+    return out
+
+
+def batch(rows):
+    calories, protein, activity_kcal, valid = calc_nutrition_goal_batch(*zip(*rows))
+    return [
+        (int(calories[i]), int(protein[i]), int(activity_kcal[i])) if valid[i] else None
+        for i in range(len(rows))
+    ]
+
+
+def check(rows) -> int:
+    failures = 0
+    for r, a, b in zip(rows, per_row(rows), batch(rows)):
+        if a != b:
+            failures += 1
+            if failures <= 10:
+                print(f"[EQUIV] 불일치: {r}\n  per_row={a}\n  batch  ={b}")
+    return failures
+
+
+def bench(fn, rows, rounds: int = 3) -> float:
+    """rounds 번 측정 중 최솟값 (초)"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(rows)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _batch_columns(cols):
+    # 열 단위 입력(조회 결과를 한 번 전치한 형태)에서 순수 계산 시간
+    return calc_nutrition_goal_batch(*cols)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="nutrition math per-row vs batch")
+    parser.add_argument("--check", action="store_true", help="검증만 수행")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args(argv)
+
+    failures = check(random_profiles(20_000))
+    print(f"checked=20000 failures={failures}")
+    if args.check or failures:
+        return 1 if failures else 0
+
+    print(f"{'rows':>8}  {'per-row users/s':>16}  {'batch users/s':>14}  {'+transpose':>12}  speedup")
+    for n in args.sizes:
+        rows = random_profiles(n, seed=n)
+        cols = list(zip(*rows))
+        row_s = bench(per_row, rows)
+        batch_s = bench(_batch_columns, cols)
+        full_s = bench(lambda r: calc_nutrition_goal_batch(*zip(*r)), rows)
+        print(
+            f"{n:>8}  {n / row_s:>16,.0f}  {n / batch_s:>14,.0f}  {n / full_s:>12,.0f}  "
+            f"x{row_s / batch_s:.1f} (x{row_s / full_s:.1f})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+응답 직렬화/압축 벤치마크: Flask 기본 JSON vs FastJSONProvider, 무압축 vs gzip/br
+
+    python -m benchmarks.response_encoding            # 검증 + 벤치마크
+    python -m benchmarks.response_encoding --check    # 검증만 (CI 용)
+
+- 대표 응답: 주간 계획(_pack_recs x 7일), 월간 일정(list_month 항목), 대화 로그 내보내기(_log_item)
+- 검증: 두 provider 의 출력을 파싱한 결과가 같은지 (datetime/Decimal 등 Flask 기본 변환 포함)
+- 종료 코드: 불일치가 있으면 1
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from routes.chatbot_routes import _log_item
+from routes.plan_routes import _pack_recs
+from utils.compression import available_encodings, compress_bytes
+from utils.json_provider import FastJSONProvider
+
+_MENUS = ["현미밥 닭가슴살 샐러드", "귀리 오트밀과 블루베리", "연어 스테이크와 구운 채소", "두부 김치찌개와 잡곡밥", "그릭요거트와 견과류"]
+_WORKOUTS = ["빠르게 걷기", "맨몸 스쿼트", "플랭크", "덤벨 로우", "인터벌 러닝", "요가 스트레칭"]
+_TITLES = ["PT 수업", "식단 기록하기", "회사 회의", "러닝 모임", "병원 예약", "장보기"]
+_MESSAGES = [
+    "오늘 점심 뭐 먹으면 좋을까요? 다이어트 중이라 칼로리가 낮은 메뉴로 추천해 주세요.",
+    "어제 하체 운동을 했더니 근육통이 심한데 오늘은 어떤 운동을 하면 좋을까요?",
+    "닭가슴살 샐러드(약 350kcal)와 현미밥 반 공기를 추천드려요. 단백질이 충분하고 포만감도 좋아요.",
+    "오늘은 상체 위주로 가볍게 30분 정도 운동하고, 스트레칭으로 마무리하는 것을 추천드립니다.",
+]
+
+
+def week_plan(rng) -> dict:
+    days = []
+    start = date(2026, 1, 5)
+    for i in range(7):
+        d = (start + timedelta(days=i)).isoformat()
+        rec = {
+            "diets": [
+                {"id": i * 10 + j, "meal_type": mt, "menu": rng.choice(_MENUS), "calories": rng.randint(300, 800),
+                 "created_at": f"{d}T06:00:00", "confirmed": rng.randint(0, 1)}
+                for j, mt in enumerate(["breakfast", "lunch", "dinner"])
+            ],
+            "workouts": [
+                {"id": i * 10 + j, "workout": rng.choice(_WORKOUTS), "duration": rng.choice([20, 30, 45]),
+                 "calories": rng.randint(100, 400), "created_at": f"{d}T06:00:00", "confirmed": 0}
+                for j in range(2)
+            ],
+        }
+        days.append({"date": d, "recommendations": _pack_recs(rec)})
+    return {"days": days}
+
+
+def month_schedules(rng, n: int = 120) -> dict:
+    items = []
+    for i in range(n):
+        d = date(2026, 3, 1) + timedelta(days=rng.randrange(31))
+        items.append({
+            "id": i + 1,
+            "date": d.isoformat(),
+            "end_date": (d + timedelta(days=rng.choice([0, 0, 0, 1, 2]))).isoformat(),
+            "title": rng.choice(_TITLES),
+            "memo": rng.choice(["", "준비물 챙기기", "30분 일찍 도착"]),
+            "kind": rng.choice(["일반", "운동", "식단"]),
+            "time": f"{rng.randrange(6, 22):02d}:{rng.choice(['00', '30'])}",
+        })
+    return {"items": items}
+
+
+def chat_export(rng, n: int = 1000) -> dict:
+    base = datetime(2026, 1, 1, 9)
+    return {"items": [
+        _log_item({"id": i + 1, "role": "user" if i % 2 == 0 else "assistant",
+                   "message": rng.choice(_MESSAGES), "created_at": (base + timedelta(minutes=i)).isoformat()})
+        for i in range(n)
+    ]}
+
+
+def mixed_types() -> dict:
+    # Flask 기본 변환 규칙이 유지되는지 확인용
+    return {
+        "when": datetime(2026, 1, 2, 3, 4, 5),
+        "day": date(2026, 1, 2),
+        "amount": Decimal("12.50"),
+        "by_id": {2: "정수 키", 10: "열"},
+        "big": 2 ** 70,
+        "nested": [{"b": 1, "a": None, "한글": "값"}],
+    }
+
+
+def payloads():
+    rng = random.Random(24)
+    return {
+        "week_plan": week_plan(rng),
+        "month_schedules": month_schedules(rng),
+        "chat_export": chat_export(rng),
+    }
+
+
+def bench(fn, rounds: int = 5, inner: int = 20) -> float:
+    """1회 평균 소요 (ms, rounds 중 최솟값)"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(inner):
+            fn()
+        elapsed = (time.perf_counter() - start) / inner
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="JSON provider / compression benchmark")
+    parser.add_argument("--check", action="store_true", help="검증만 수행")
+    args = parser.parse_args(argv)
+
+    app = Flask(__name__)
+    std = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    def std_body(obj) -> bytes:
+        # jsonify 기본 동작 (separators 압축, ensure_ascii)
+        return std.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    failures = 0
+    cases = dict(payloads(), mixed_types=mixed_types())
+    for name, obj in cases.items():
+        if json.loads(std_body(obj)) != json.loads(fast.dumps_bytes(obj)):
+            failures += 1
+            print(f"[EQUIV] 불일치: {name}")
+    print(f"json backend={fast.backend} encodings={available_encodings()} checked={len(cases)} failures={failures}")
+    if args.check or failures:
+        return 1 if failures else 0
+
+    encodings = available_encodings()
+    header = f"{'payload':>16}  {'std ms':>7}  {'fast ms':>7}  {'std B':>8}  {'fast B':>8}"
+    for enc in encodings:
+        header += f"  {enc + ' B':>8}  {enc + ' ms':>7}"
+    print(header)
+    for name, obj in payloads().items():
+        std_ms = bench(lambda: std_body(obj))
+        fast_ms = bench(lambda: fast.dumps_bytes(obj))
+        body = fast.dumps_bytes(obj)
+        line = f"{name:>16}  {std_ms:>7.3f}  {fast_ms:>7.3f}  {len(std_body(obj)):>8,}  {len(body):>8,}"
+        for enc in encodings:
+            line += f"  {len(compress_bytes(body, enc)):>8,}  {bench(lambda: compress_bytes(body, enc)):>7.3f}"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,17 +4,92 @@ import csv
 from datetime import datetime
 from werkzeug.security import generate_password_hash
 import random
+from contextlib import contextmanager
+
+from db.pool import ConnectionPool, ConnectionManager
+from db.migrations import apply_migrations, current_version, read_version, LATEST_VERSION
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "agent.db")
 
+# 연결 풀 설정 (환경 변수로 조정)
+# 한 프로세스 안에서 요청 스레드(gunicorn threads), 채팅 스레드 풀(CHAT_WORKERS),
+# 로그 기록기, 대화 요약 스레드가 이 풀을 나눠 쓴다.
+# 연결은 짧게만 잡는다: 요청 스코프 연결도 모델 호출 전에는 release_connection() 으로 반납
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "8"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# dedicated_connection() 전용 풀: 요청 연결을 쥔 채로 빌리므로 요청 풀과 슬롯을 나누지 않는다
+# (같은 풀이면 스레드 수 = 풀 크기일 때 모두 두 번째 연결을 기다리며 멈춘다)
+DB_DEDICATED_POOL_SIZE = int(os.getenv("DB_DEDICATED_POOL_SIZE", "2"))
+
+# 연결 프로파일: 새 연결을 만들 때 한 번 적용
+# - WAL: 쓰기(채팅 로그, 요약 upsert) 중에도 읽기가 막히지 않음
+# - busy_timeout: 다른 워커가 쓰는 중이면 "database is locked" 대신 대기
+DB_PRAGMAS = {
+    "busy_timeout": int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000")),
+    "journal_mode": os.getenv("DB_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("DB_SYNCHRONOUS", "NORMAL"),
+    "cache_size": int(os.getenv("DB_CACHE_SIZE", "-16000")),  # 음수 = KiB 단위 (약 16MB)
+    "mmap_size": int(os.getenv("DB_MMAP_SIZE", str(128 * 1024 * 1024))),
+    "temp_store": os.getenv("DB_TEMP_STORE", "MEMORY"),
+}
+
+_pool = ConnectionPool(DB_PATH, max_size=DB_POOL_MAX_SIZE, timeout=DB_POOL_TIMEOUT, pragmas=DB_PRAGMAS)
+_manager = ConnectionManager(_pool)
+_dedicated_pool = ConnectionPool(
+    DB_PATH, max_size=DB_DEDICATED_POOL_SIZE, timeout=DB_POOL_TIMEOUT, pragmas=DB_PRAGMAS
+)
+
 
 def get_connection():
     """
     SQLite 연결 (RowFactory: dict-like)
+    - 요청(앱 컨텍스트) 안에서는 같은 연결을 공유하고, 요청 종료 시 풀로 반납
+    - conn.close()는 기존처럼 호출하면 되며 실제로는 참조만 해제
+    """
+    return _manager.connect()
+
+
+@contextmanager
+def dedicated_connection():
+    """
+    요청 공유 연결과 별개인 연결 (독립 트랜잭션용)
+    commit/rollback 이 호출자의 미커밋 변경에 영향을 주지 않는다. 블록을 나가면 반납
+    (커밋하지 않은 변경은 반납 시 롤백)
+    요청 풀이 아닌 전용 풀에서 빌리므로 요청 연결을 쥔 채 불러도 요청 풀 슬롯을 두 개 쓰지 않는다.
+    블록 안에서는 짧은 쓰기만 할 것
+    """
+    conn = _dedicated_pool.acquire()
+    try:
+        yield conn
+    finally:
+        _dedicated_pool.release(conn)
+
+
+def release_connection() -> bool:
+    """
+    요청 도중 공유 연결을 풀로 반납 (열린 참조가 없을 때만)
+    외부 API 호출 등 오래 걸리는 작업 전에 호출. 이후 get_connection() 은 새로 빌린다
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return _manager.release_idle()
+
+
+def init_app(app):
+    """Flask 앱에 요청 스코프 연결 반납 훅 등록"""
+    app.teardown_appcontext(_manager.teardown)
+
+
+def pool_stats() -> dict:
+    return {**_pool.stats(), "dedicated": _dedicated_pool.stats()}
+
+
+def connection_profile() -> dict:
+    """설정값(configured)과 실제 적용값(effective) - /api/health 노출용"""
+    conn = get_connection()
+    try:
+        effective = _pool.profile(conn)
+    finally:
+        conn.close()
+    return {"configured": dict(DB_PRAGMAS), "effective": effective}
 
 
 def ensure_columns(cur: sqlite3.Cursor, table: str, columns: dict):
@@ -34,8 +109,17 @@ def apply_schema_extra(cur: sqlite3.Cursor):
     path = os.path.join(os.path.dirname(__file__), "schema_extra.sql")
     if not os.path.exists(path):
         return
+    # executescript()는 먼저 COMMIT 을 실행해 init_db 의 잠금이 풀리므로
+    # 문장 단위로 나눠 같은 트랜잭션 안에서 실행 (트리거 BEGIN..END 포함)
+    buf = ""
     with open(path, "r", encoding="utf-8") as f:
-        cur.executescript(f.read())
+        for line in f:
+            if not buf and line.strip().startswith("--"):
+                continue
+            buf += line
+            if sqlite3.complete_statement(buf):
+                cur.execute(buf)
+                buf = ""
     print("[DB] schema_extra.sql 적용 완료")
 
 
@@ -155,117 +239,15 @@ def _seed_foods_workouts(cur: sqlite3.Cursor):
             print("[DB] workouts 기본값 seed 완료")
 
 
-# AI 추천 식단 3끼 조합 함수
 # 기존 DB_PATH 사용
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DATA_DIR = os.path.join(BASE_DIR, "data")  # food.csv / food_meal_type.csv 위치
 
-def _seed_diet_recommendations(cur):
-    """
-    diet_recommendations 테이블 초기화 + food.csv + food_meal_type.csv 기반 하루 3끼 랜덤 추천
-    """
-    # 1️⃣ 테이블 초기화
-    cur.execute("DELETE FROM diet_recommendations")
-    print("[DB] diet_recommendations 초기화 완료")
-
-    # 2️⃣ food.csv 읽기
-    food_path = os.path.join(DATA_DIR, "food.csv")
-    foods = {}
-    try:
-        with open(food_path, encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                foods[int(row["id"])] = {
-                    "id": int(row["id"]),
-                    "name": row["name"],
-                    "calories": int(row.get("calories") or 0),
-                    "protein": int(row.get("protein") or 0),
-                    "carbs": int(row.get("carbs") or 0),
-                    "fat": int(row.get("fat") or 0),
-                    "allergy": row.get("allergy") or None,
-                    "meal_types": [],
-                }
-    except Exception as e:
-        print("[DB] food.csv 읽기 실패:", e)
-        return
-
-    # 3️⃣ food_meal_type.csv 읽기
-    meal_path = os.path.join(DATA_DIR, "food_meal_type.csv")
-    try:
-        with open(meal_path, encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                fid = int(row["food_id"])
-                meal_type = row["meal_type"]
-                if fid in foods:
-                    foods[fid]["meal_types"].append(meal_type)
-    except Exception as e:
-        print("[DB] food_meal_type.csv 읽기 실패:", e)
-        return
-
-    # 4️⃣ meal_type별 후보군 만들기
-    meal_candidates = {"breakfast": [], "lunch": [], "dinner": []}
-    for f in foods.values():
-        for mt in f["meal_types"]:
-            if mt in meal_candidates:
-                meal_candidates[mt].append(f)
-
-    # 5️⃣ 하루 3끼 랜덤 조합
-    user_id = 1  # 초기 seed용
-    date = datetime.utcnow().date().isoformat()
-    rng = random.Random(f"{date}-{user_id}")
-
-    for meal_type in ["breakfast", "lunch", "dinner"]:
-        candidates = meal_candidates.get(meal_type, [])
-        if not candidates:
-            continue
-        food = rng.choice(candidates)
-        cur.execute(
-            """
-            INSERT INTO diet_recommendations
-            (user_id, date, meal_type, menu, calories, protein, created_at, confirmed)
-            VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-            """,
-            (
-                user_id,
-                date,
-                meal_type,
-                food["name"],
-                food["calories"],
-                food["protein"],
-                datetime.utcnow().isoformat(),
-            ),
-        )
-    print("[DB] diet_recommendations seed 완료 (하루 3끼 랜덤)")
-
-
-# diet_recommendations 테이블(AI 추천 식단 테이블) 삭제 생성 함수
-def _reset_diet_recommendations(cur):
-    cur.execute("DROP TABLE IF EXISTS diet_recommendations;")
-    print("[DB] diet_recommendations 삭제 완료")
-
-    cur.execute("""
-        CREATE TABLE diet_recommendations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            date TEXT NOT NULL,
-            meal_type TEXT,
-            menu TEXT,
-            calories INTEGER,
-            protein INTEGER,
-            created_at TEXT,
-            confirmed INTEGER DEFAULT 0
-        );
-    """)
-    print("[DB] diet_recommendations 생성 완료")
-
-
-def init_db():
+def _create_base_schema(cur: sqlite3.Cursor):
     """
-    DB 초기화 + 마이그레이션(컬럼 자동 추가) + seed
+    기본 테이블 생성 + 컬럼 보정 + 관리자 계정 (모두 멱등)
+    스키마 버전이 바뀔 때만 init_db()에서 호출된다.
     """
-    conn = get_connection()
-    cur: sqlite3.Cursor = conn.cursor()
 
     # users
     cur.execute(
@@ -661,6 +643,34 @@ def init_db():
         """
     )
 
+    # community (공지사항 / 문의)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS notices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            view_count INTEGER DEFAULT 0
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS inquiries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            status TEXT DEFAULT '답변대기',
+            answer TEXT,
+            created_at TEXT NOT NULL,
+            answered_at TEXT,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        """
+    )
+
     # --- migrations (columns) ---
     ensure_columns(
         cur,
@@ -714,6 +724,7 @@ def init_db():
             "created_at": "TEXT",
             "kind": "TEXT",  # 일반/식사/운동
             "repeat_rule": "TEXT",  # none/daily/weekly/weekday
+            "end_date": "TEXT",  # 기간 일정 (schedule_routes 사용)
         },
     )
 
@@ -741,27 +752,58 @@ def init_db():
             "allergies": "TEXT",
             "updated_at": "TEXT",
         },
-    ), 
-    # 관리자 계정이 있으면 role만 admin으로 변경
-    cur.execute(
-        """
-        INSERT OR IGNORE INTO users (email, password_hash, role, created_at)
-        VALUES (?, ?, 'admin', ?)
-        """,
-        (
-            "admin@test.com",                  # 이메일
-            generate_password_hash("admin1234"),  # 비밀번호 해시
-            datetime.utcnow().isoformat(),     # 생성 시간
-        ),
     )
 
-    # seed foods/workouts if empty
-    _reset_diet_recommendations(cur)   # 1️⃣ 구조 초기화(DROP+CREATE)
-    _seed_diet_recommendations(cur)    # 2️⃣ 데이터 seed
+    # 관리자 계정 (없을 때만 해시 계산)
+    cur.execute("SELECT 1 FROM users WHERE email=?", ("admin@test.com",))
+    if not cur.fetchone():
+        cur.execute(
+            """
+            INSERT OR IGNORE INTO users (email, password_hash, role, created_at)
+            VALUES (?, ?, 'admin', ?)
+            """,
+            (
+                "admin@test.com",                  # 이메일
+                generate_password_hash("admin1234"),  # 비밀번호 해시
+                datetime.utcnow().isoformat(),     # 생성 시간
+            ),
+        )
+
 
-    # extra schema (indexes/views/triggers)
-    apply_schema_extra(cur)
+def init_db():
+    """
+    DB 초기화 + 마이그레이션
 
-    conn.commit()
-    conn.close()
-    print("[DB] 초기화 완료")
+    - schema_version 이 최신이면 SELECT 한 번으로 끝 (워커 부팅 비용 O(1))
+    - 아니면 BEGIN IMMEDIATE 로 쓰기 잠금을 잡고 다시 확인한 뒤 한 워커만 적용
+      (gunicorn 워커 N개가 동시에 떠도 안전)
+    - 스키마를 바꿀 때는 db/migrations.py 의 MIGRATIONS 에 새 버전을 추가
+    """
+    conn = get_connection()
+    try:
+        version = read_version(conn)
+        if version >= LATEST_VERSION:
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        cur: sqlite3.Cursor = conn.cursor()
+        if current_version(cur) >= LATEST_VERSION:
+            # 잠금을 기다리는 동안 다른 워커가 먼저 끝냄
+            conn.rollback()
+            return
+
+        _create_base_schema(cur)
+
+        # 버전 관리 마이그레이션 (인덱스 등)
+        applied = apply_migrations(cur)
+
+        # extra schema (indexes/views/triggers)
+        apply_schema_extra(cur)
+
+        conn.commit()
+        print(f"[DB] 초기화 완료 (v{version} -> v{LATEST_VERSION}, 적용: {applied})")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,124 @@
+"""
+DB 진단: 자주 쓰는 쿼리의 EXPLAIN QUERY PLAN 출력
+
+사용법 (backend 디렉터리에서):
+    python -m db.diagnostics          # 사람이 읽는 형식
+    python -m db.diagnostics --json   # JSON
+"""
+import json
+import sys
+
+from db.database import get_connection
+from db.migrations import current_version
+
+
+# (이름, SQL, 예시 파라미터) - 라우트/모델에서 실제로 쓰는 형태 그대로
+HOT_QUERIES = [
+    (
+        "list_recommendations.diets",
+        "SELECT id, meal_type, menu, calories, protein, created_at, COALESCE(confirmed,0) AS confirmed "
+        "FROM diet_recommendations WHERE user_id=? AND date=? ORDER BY id ASC",
+        (1, "2025-01-01"),
+    ),
+    (
+        "list_recommendations.workouts",
+        "SELECT id, workout, duration, calories, created_at, COALESCE(confirmed,0) AS confirmed "
+        "FROM workout_recommendations WHERE user_id=? AND date=? ORDER BY id ASC",
+        (1, "2025-01-01"),
+    ),
+    (
+        "calorie.get_daily_summary",
+        "SELECT user_id, date, bmr, tdee, intake, exercise, deficit, est_weight_change_kg, updated_at "
+        "FROM calorie_summaries WHERE user_id=? AND date=?",
+        (1, "2025-01-01"),
+    ),
+    (
+        "chatbot.list_logs",
+        "SELECT id, user_id, role, message, created_at FROM chatbot_logs "
+        "WHERE user_id=? ORDER BY id DESC LIMIT ?",
+        (1, 50),
+    ),
+    (
+        "chatbot.list_logs_by_date",
+        "SELECT id, user_id, role, message, created_at FROM chatbot_logs "
+        "WHERE user_id=? AND day=? ORDER BY id DESC LIMIT ?",
+        (1, "2025-01-01", 50),
+    ),
+    (
+        "activity.list_logs",
+        "SELECT id, workout, duration, calories, completed_at, intensity, source "
+        "FROM activities WHERE user_id=? AND day=? ORDER BY id DESC",
+        (1, "2025-01-01"),
+    ),
+    (
+        "schedule.list_month",
+        "SELECT id, date, end_date, title, memo, kind, start_time FROM schedules "
+        "WHERE user_id=? AND date <= ? AND end_date >= ? ORDER BY date ASC, start_time ASC, id ASC",
+        (1, "2025-01-31", "2025-01-01"),
+    ),
+    (
+        "diet.today_items",
+        "SELECT * FROM today_meal_items WHERE today_meal_id=?",
+        (1,),
+    ),
+    (
+        "memo.get_memo",
+        "SELECT id, user_id, date, content, created_at FROM memos "
+        "WHERE user_id=? AND date=? ORDER BY id DESC LIMIT 1",
+        (1, "2025-01-01"),
+    ),
+]
+
+
+def explain(cur, sql: str, params=()) -> list:
+    cur.execute("EXPLAIN QUERY PLAN " + sql, params)
+    return [row["detail"] for row in cur.fetchall()]
+
+
+def _is_full_scan(details: list) -> bool:
+    # "SCAN <table>" (인덱스 없이 전체 스캔). "SCAN ... USING INDEX" 는 제외
+    return any(d.startswith("SCAN ") and "USING" not in d for d in details)
+
+
+def run_diagnostics() -> dict:
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        report = {"schema_version": current_version(cur), "queries": []}
+        for name, sql, params in HOT_QUERIES:
+            try:
+                details = explain(cur, sql, params)
+                report["queries"].append({
+                    "name": name,
+                    "plan": details,
+                    "full_scan": _is_full_scan(details),
+                })
+            except Exception as e:
+                report["queries"].append({"name": name, "error": str(e)})
+    finally:
+        conn.close()
+    return report
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    report = run_diagnostics()
+
+    if "--json" in argv:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"schema_version: {report['schema_version']}")
+    for q in report["queries"]:
+        if "error" in q:
+            print(f"[ERROR] {q['name']}: {q['error']}")
+            continue
+        flag = "FULL SCAN" if q["full_scan"] else "ok"
+        print(f"[{flag}] {q['name']}")
+        for d in q["plan"]:
+            print(f"    {d}")
+    return 1 if any(q.get("full_scan") for q in report["queries"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,592 @@
+"""
+버전 관리 마이그레이션
+
+- schema_version 테이블에 적용된 버전을 기록하고, 아직 적용되지 않은 버전만 실행
+- 각 마이그레이션은 (version, name, fn(cur)) 형태로 MIGRATIONS 에 순서대로 추가
+"""
+import sqlite3
+from datetime import datetime
+
+
+# 자주 쓰는 (user_id, date) 조회용 인덱스
+# (schema_extra.sql 에 이미 있는 인덱스는 다시 선언하지 않는다)
+HOT_TABLE_INDEXES = {
+    "diet_recommendations": [
+        "CREATE INDEX IF NOT EXISTS idx_diet_recs_user_date_confirmed "
+        "ON diet_recommendations(user_id, date, confirmed)",
+    ],
+    "workout_recommendations": [
+        "CREATE INDEX IF NOT EXISTS idx_workout_recs_user_date_confirmed "
+        "ON workout_recommendations(user_id, date, confirmed)",
+    ],
+    "chatbot_logs": [
+        "CREATE INDEX IF NOT EXISTS idx_chatbot_logs_user_id_desc "
+        "ON chatbot_logs(user_id, id DESC)",
+    ],
+    "today_meal_items": [
+        "CREATE INDEX IF NOT EXISTS idx_today_meal_items_meal "
+        "ON today_meal_items(today_meal_id)",
+        "CREATE INDEX IF NOT EXISTS idx_today_meal_items_user_date "
+        "ON today_meal_items(user_id, date)",
+    ],
+    "schedules": [
+        "CREATE INDEX IF NOT EXISTS idx_schedules_user_date_end "
+        "ON schedules(user_id, date, end_date)",
+    ],
+    "memos": [
+        "CREATE INDEX IF NOT EXISTS idx_memos_user_date "
+        "ON memos(user_id, date, id)",
+    ],
+}
+
+
+def _m001_hot_table_indexes(cur: sqlite3.Cursor):
+    for ddls in HOT_TABLE_INDEXES.values():
+        for ddl in ddls:
+            cur.execute(ddl)
+
+
+def _add_column_if_missing(cur: sqlite3.Cursor, table: str, column: str, col_type: str):
+    cur.execute(f"PRAGMA table_info({table})")
+    if column not in [row[1] for row in cur.fetchall()]:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+
+
+# DATE(completed_at)=? 같은 조건은 인덱스를 못 타므로
+# 날짜(YYYY-MM-DD)를 day 컬럼에 저장해 두고 day=? 로 조회
+DAY_COLUMNS = {
+    "activities": "completed_at",
+    "chatbot_logs": "created_at",
+}
+
+
+def _m002_day_columns(cur: sqlite3.Cursor):
+    for table, ts_col in DAY_COLUMNS.items():
+        _add_column_if_missing(cur, table, "day", "TEXT")
+
+        # 기존 행 backfill
+        cur.execute(f"UPDATE {table} SET day = DATE({ts_col}) WHERE day IS NULL")
+
+        # INSERT/UPDATE 경로가 여러 라우트에 흩어져 있으므로 트리거로 채운다
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_day_insert
+            AFTER INSERT ON {table}
+            WHEN NEW.day IS NULL
+            BEGIN
+                UPDATE {table} SET day = DATE(NEW.{ts_col}) WHERE id = NEW.id;
+            END
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_day_update
+            AFTER UPDATE OF {ts_col} ON {table}
+            BEGIN
+                UPDATE {table} SET day = DATE(NEW.{ts_col}) WHERE id = NEW.id;
+            END
+            """
+        )
+
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_activities_user_day ON activities(user_id, day)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_chatbot_logs_user_day ON chatbot_logs(user_id, day, id)")
+
+
+def _m003_llm_cache(cur: sqlite3.Cursor):
+    # AI 응답 캐시 영속 계층 (services/llm_cache.py)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            intent TEXT,
+            value TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at)")
+
+
+def _m004_conversation_state(cur: sqlite3.Cursor):
+    # 워커 간 공유 대화 상태 (services/state_store.py, CHAT_STATE_BACKEND=sqlite)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS conversation_state (
+            user_id INTEGER PRIMARY KEY,
+            state TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_conversation_state_updated ON conversation_state(updated_at)")
+
+
+def _m005_conversation_summaries(cur: sqlite3.Cursor):
+    # 대화 컨텍스트 창 밖으로 밀려난 오래된 대화의 누적 요약 (services/chat_context.py)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS conversation_summaries (
+            user_id INTEGER PRIMARY KEY,
+            summary TEXT NOT NULL,
+            upto_log_id INTEGER NOT NULL,
+            updated_at TEXT
+        )
+        """
+    )
+
+
+# calorie_summaries 를 변경분(delta)으로 유지하는 원천 테이블
+# (테이블, 반영할 요약 컬럼, 조회용 날짜 컬럼, 트리거용 날짜 식, 포함 조건)
+# - 트리거는 activities.day 가 채워지기 전에 실행될 수 있어 completed_at 에서 바로 구한다
+# - 추천은 확정 전(confirmed=0)만 계획치로 본다. 확정되면 diets/activities 로 옮겨진다
+CALORIE_SOURCES = [
+    ("diets", "intake_logged", "date", "{r}.date", "1"),
+    ("diet_recommendations", "intake_planned", "date", "{r}.date", "COALESCE({r}.confirmed, 0) = 0"),
+    ("activities", "exercise_logged", "day", "DATE({r}.completed_at)", "1"),
+    ("workout_recommendations", "exercise_planned", "date", "{r}.date", "COALESCE({r}.confirmed, 0) = 0"),
+]
+
+CALORIE_COMPONENTS = ("intake_logged", "intake_planned", "exercise_logged", "exercise_planned")
+
+# 구성 요소 → intake / exercise / deficit / 예상 체중 변화 (calorie_service 와 같은 식)
+CALORIE_DERIVED_SET = """
+    intake = ROUND(intake_logged + intake_planned, 2),
+    exercise = ROUND(exercise_logged + exercise_planned, 2),
+    deficit = ROUND(tdee + exercise_logged + exercise_planned - intake_logged - intake_planned, 2),
+    est_weight_change_kg = ROUND((tdee + exercise_logged + exercise_planned - intake_logged - intake_planned) / 7700.0, 4),
+    updated_at = STRFTIME('%Y-%m-%dT%H:%M:%f', 'now')
+"""
+
+
+def _calorie_delta_sql(row: str, column: str, date_expr: str, cond: str, sign: str) -> str:
+    """원천 행 하나(NEW/OLD)의 칼로리를 요약 행에 더하거나 빼는 트리거 본문"""
+    d = date_expr.format(r=row)
+    c = cond.format(r=row)
+    return f"""
+        INSERT INTO calorie_summaries (user_id, date, bmr, tdee)
+        SELECT {row}.user_id, {d},
+               COALESCE((SELECT bmr FROM calorie_summaries WHERE user_id = {row}.user_id ORDER BY date DESC LIMIT 1), 0),
+               COALESCE((SELECT tdee FROM calorie_summaries WHERE user_id = {row}.user_id ORDER BY date DESC LIMIT 1), 0)
+        WHERE {row}.user_id IS NOT NULL AND {d} IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM calorie_summaries WHERE user_id = {row}.user_id AND date = {d});
+        UPDATE calorie_summaries
+        SET {column} = {column} {sign} (CASE WHEN {c} THEN COALESCE({row}.calories, 0) ELSE 0 END)
+        WHERE user_id = {row}.user_id AND date = {d};
+        UPDATE calorie_summaries SET {CALORIE_DERIVED_SET}
+        WHERE user_id = {row}.user_id AND date = {d};
+    """
+
+
+def rebuild_calorie_components(cur: sqlite3.Cursor, user_id: int | None = None) -> int:
+    """
+    원천 테이블을 다시 합산해 calorie_summaries 의 구성 요소를 맞춘다 (복구용)
+    user_id 가 없으면 전체. 갱신된 요약 행 수 반환
+    """
+    user_filter = "" if user_id is None else "AND user_id = :user_id"
+    source_filter = "" if user_id is None else "AND s.user_id = :user_id"
+    params = {"user_id": user_id}
+
+    # 원천에는 있는데 요약이 없는 날짜 행 생성
+    for table, _, date_col, _, _ in CALORIE_SOURCES:
+        cur.execute(
+            f"""
+            INSERT INTO calorie_summaries (user_id, date)
+            SELECT DISTINCT s.user_id, s.{date_col}
+            FROM {table} s
+            WHERE s.user_id IS NOT NULL AND s.{date_col} IS NOT NULL {source_filter}
+              AND NOT EXISTS (
+                  SELECT 1 FROM calorie_summaries cs WHERE cs.user_id = s.user_id AND cs.date = s.{date_col}
+              )
+            """,
+            params,
+        )
+
+    # (user_id, date) 인덱스를 타는 상관 서브쿼리로 다시 합산
+    sets = []
+    for table, column, date_col, _, cond in CALORIE_SOURCES:
+        c = cond.format(r="s")
+        sets.append(
+            f"""{column} = (
+                SELECT COALESCE(SUM(CASE WHEN {c} THEN COALESCE(s.calories, 0) ELSE 0 END), 0)
+                FROM {table} s
+                WHERE s.user_id = calorie_summaries.user_id AND s.{date_col} = calorie_summaries.date
+            )"""
+        )
+    cur.execute(
+        f"UPDATE calorie_summaries SET {', '.join(sets)} WHERE 1=1 {user_filter}",
+        params,
+    )
+    updated = cur.rowcount
+    cur.execute(f"UPDATE calorie_summaries SET {CALORIE_DERIVED_SET} WHERE 1=1 {user_filter}", params)
+    return updated
+
+
+def _m006_calorie_summary_deltas(cur: sqlite3.Cursor):
+    # 식단/활동/추천이 바뀔 때마다 전체 재계산 대신 변경분만 calorie_summaries 에 반영
+    # (쓰기 경로가 여러 라우트에 흩어져 있으므로 트리거로 처리)
+    for column in CALORIE_COMPONENTS:
+        _add_column_if_missing(cur, "calorie_summaries", column, "REAL DEFAULT 0")
+
+    for table, column, _, date_expr, cond in CALORIE_SOURCES:
+        cur.execute(f"PRAGMA table_info({table})")
+        cols = {row[1] for row in cur.fetchall()}
+        watched = [c for c in ("user_id", "date", "completed_at", "calories", "confirmed") if c in cols]
+
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_calorie_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                {_calorie_delta_sql("NEW", column, date_expr, cond, "+")}
+            END
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_calorie_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                {_calorie_delta_sql("OLD", column, date_expr, cond, "-")}
+            END
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_calorie_update
+            AFTER UPDATE OF {", ".join(watched)} ON {table}
+            BEGIN
+                {_calorie_delta_sql("OLD", column, date_expr, cond, "-")}
+                {_calorie_delta_sql("NEW", column, date_expr, cond, "+")}
+            END
+            """
+        )
+
+    # 기존 데이터 backfill
+    rebuild_calorie_components(cur)
+
+
+# 대시보드 추세용 사용자별 일일 롤업 (user_daily_stats)
+# 원천 테이블 → (날짜 컬럼, 트리거용 날짜 식, {롤업 컬럼: 원천 컬럼}) - 합계 컬럼은 변경분으로 유지
+DAILY_STATS_SOURCES = {
+    "today_meal_items": ("date", "{r}.date", {"intake_kcal": "calories", "protein": "protein"}),
+    "activities": ("completed_at", "DATE({r}.completed_at)", {"activity_minutes": "duration", "burned_kcal": "calories"}),
+}
+
+
+def _daily_stats_row_sql(row: str, date_expr: str) -> str:
+    """(user_id, date) 롤업 행이 없으면 만든다"""
+    return f"""
+        INSERT INTO user_daily_stats (user_id, date)
+        SELECT {row}.user_id, {date_expr}
+        WHERE {row}.user_id IS NOT NULL AND {date_expr} IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM user_daily_stats WHERE user_id = {row}.user_id AND date = {date_expr});
+    """
+
+
+def _daily_stats_delta_sql(row: str, date_expr: str, columns: dict, sign: str) -> str:
+    d = date_expr.format(r=row)
+    sets = ", ".join(f"{col} = {col} {sign} COALESCE({row}.{src}, 0)" for col, src in columns.items())
+    return _daily_stats_row_sql(row, d) + f"""
+        UPDATE user_daily_stats SET {sets}
+        WHERE user_id = {row}.user_id AND date = {d};
+    """
+
+
+def _daily_stats_weight_sql(row: str, value: str) -> str:
+    # 체중은 날짜당 하나(weights UNIQUE(user_id, recorded_at))라 합계가 아니라 값으로 둔다
+    return _daily_stats_row_sql(row, f"{row}.recorded_at") + f"""
+        UPDATE user_daily_stats SET weight = {value}
+        WHERE user_id = {row}.user_id AND date = {row}.recorded_at;
+    """
+
+
+def rebuild_daily_stats(cur: sqlite3.Cursor, user_id: int | None = None) -> int:
+    """원천 테이블에서 user_daily_stats 를 다시 만든다 (복구용). 생성된 행 수 반환"""
+    user_filter = "" if user_id is None else "AND user_id = :user_id"
+    cur.execute(f"DELETE FROM user_daily_stats WHERE 1=1 {user_filter}", {"user_id": user_id})
+    cur.execute(
+        f"""
+        INSERT INTO user_daily_stats (user_id, date, intake_kcal, protein, activity_minutes, burned_kcal, weight)
+        SELECT user_id, date,
+               COALESCE(SUM(intake_kcal), 0), COALESCE(SUM(protein), 0),
+               COALESCE(SUM(activity_minutes), 0), COALESCE(SUM(burned_kcal), 0),
+               MAX(weight)
+        FROM (
+            SELECT user_id, date, calories AS intake_kcal, protein, 0 AS activity_minutes, 0 AS burned_kcal, NULL AS weight
+            FROM today_meal_items
+            UNION ALL
+            SELECT user_id, DATE(completed_at), 0, 0, duration, calories, NULL
+            FROM activities
+            UNION ALL
+            SELECT user_id, recorded_at, 0, 0, 0, 0, weight
+            FROM weights
+        )
+        WHERE user_id IS NOT NULL AND date IS NOT NULL {user_filter}
+        GROUP BY user_id, date
+        """,
+        {"user_id": user_id},
+    )
+    return cur.rowcount
+
+
+def _m007_daily_stats(cur: sqlite3.Cursor):
+    # 주간/월간/연간 추세 조회가 원천 테이블을 매번 집계하지 않도록 일 단위 롤업을 쓰기 시점에 유지
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_daily_stats (
+            user_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            intake_kcal REAL NOT NULL DEFAULT 0,
+            protein REAL NOT NULL DEFAULT 0,
+            activity_minutes REAL NOT NULL DEFAULT 0,
+            burned_kcal REAL NOT NULL DEFAULT 0,
+            weight REAL,
+            PRIMARY KEY (user_id, date)
+        ) WITHOUT ROWID
+        """
+    )
+
+    for table, (date_col, date_expr, columns) in DAILY_STATS_SOURCES.items():
+        watched = ["user_id", date_col, *sorted(set(columns.values()))]
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_daily_stats_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                {_daily_stats_delta_sql("NEW", date_expr, columns, "+")}
+            END
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_daily_stats_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                {_daily_stats_delta_sql("OLD", date_expr, columns, "-")}
+            END
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_daily_stats_update
+            AFTER UPDATE OF {", ".join(watched)} ON {table}
+            BEGIN
+                {_daily_stats_delta_sql("OLD", date_expr, columns, "-")}
+                {_daily_stats_delta_sql("NEW", date_expr, columns, "+")}
+            END
+            """
+        )
+
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_weights_daily_stats_insert
+        AFTER INSERT ON weights
+        BEGIN
+            {_daily_stats_weight_sql("NEW", "NEW.weight")}
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_weights_daily_stats_delete
+        AFTER DELETE ON weights
+        BEGIN
+            {_daily_stats_weight_sql("OLD", "NULL")}
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_weights_daily_stats_update
+        AFTER UPDATE OF user_id, recorded_at, weight ON weights
+        BEGIN
+            {_daily_stats_weight_sql("OLD", "NULL")}
+            {_daily_stats_weight_sql("NEW", "NEW.weight")}
+        END
+        """
+    )
+
+    # 기존 데이터 backfill
+    rebuild_daily_stats(cur)
+
+
+# 조회 API 의 ETag 용 사용자별 데이터 버전 (user_data_versions)
+# 이 테이블들에 쓰기가 일어나면 (user_id, source) 버전이 1 증가 → 버전만 보고 304 판단
+DATA_VERSION_TABLES = (
+    "diet_recommendations",
+    "workout_recommendations",
+    "calorie_summaries",
+    "today_meals",
+    "today_meal_items",
+    "schedules",
+    "user_daily_stats",
+)
+
+
+def _data_version_bump_sql(row: str, source: str, user_col: str = "user_id") -> str:
+    return f"""
+        INSERT INTO user_data_versions (user_id, source, version)
+        SELECT {row}.{user_col}, '{source}', 0
+        WHERE {row}.{user_col} IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM user_data_versions WHERE user_id = {row}.{user_col} AND source = '{source}');
+        UPDATE user_data_versions SET version = version + 1
+        WHERE user_id = {row}.{user_col} AND source = '{source}';
+    """
+
+
+def _create_data_version_triggers(cur: sqlite3.Cursor, table: str, source: str, user_col: str = "user_id"):
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_version_insert
+        AFTER INSERT ON {table}
+        BEGIN
+            {_data_version_bump_sql("NEW", source, user_col)}
+        END
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_version_delete
+        AFTER DELETE ON {table}
+        BEGIN
+            {_data_version_bump_sql("OLD", source, user_col)}
+        END
+        """
+    )
+    # 사용자가 바뀌는 수정이면 양쪽 모두 증가
+    cur.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_version_update
+        AFTER UPDATE ON {table}
+        BEGIN
+            {_data_version_bump_sql("NEW", source, user_col)}
+            UPDATE user_data_versions SET version = version + 1
+            WHERE user_id = OLD.{user_col} AND source = '{source}' AND OLD.{user_col} IS NOT NEW.{user_col};
+        END
+        """
+    )
+
+
+def _m008_data_versions(cur: sqlite3.Cursor):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_data_versions (
+            user_id INTEGER NOT NULL,
+            source TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, source)
+        ) WITHOUT ROWID
+        """
+    )
+    for table in DATA_VERSION_TABLES:
+        _create_data_version_triggers(cur, table, table)
+
+
+def _m009_chat_jobs(cur: sqlite3.Cursor):
+    # 비동기 채팅 작업 결과 (services/chat_service.py) - 어느 워커로 조회가 가도 같은 결과
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS chat_jobs (
+            id TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            reply TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        """
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_chat_jobs_expires ON chat_jobs(expires_at)")
+
+
+# 프로필 스냅샷(models/profile_snapshot.py) 무효화용 버전
+# 세 테이블 중 하나라도 바뀌면 (user_id, "profile") 버전이 증가 → 다른 워커의 캐시도 다음 조회에서 다시 읽는다
+PROFILE_VERSION_SOURCE = "profile"
+PROFILE_VERSION_TABLES = {
+    "users": "id",
+    "diet_goals": "user_id",
+    "user_nutrition_goal": "user_id",
+}
+
+
+def _m010_profile_versions(cur: sqlite3.Cursor):
+    for table, user_col in PROFILE_VERSION_TABLES.items():
+        _create_data_version_triggers(cur, table, PROFILE_VERSION_SOURCE, user_col)
+
+
+# 다른 인덱스의 앞부분과 같아 쓰기 비용만 드는 인덱스
+# - idx_schedules_user_date (user_id, date) ⊂ idx_schedules_user_date_end (user_id, date, end_date)
+REDUNDANT_INDEXES = (
+    "idx_schedules_user_date",
+)
+
+
+def _m011_drop_redundant_indexes(cur: sqlite3.Cursor):
+    for name in REDUNDANT_INDEXES:
+        cur.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+MIGRATIONS = [
+    (1, "hot_table_indexes", _m001_hot_table_indexes),
+    (2, "day_columns", _m002_day_columns),
+    (3, "llm_cache", _m003_llm_cache),
+    (4, "conversation_state", _m004_conversation_state),
+    (5, "conversation_summaries", _m005_conversation_summaries),
+    (6, "calorie_summary_deltas", _m006_calorie_summary_deltas),
+    (7, "daily_stats", _m007_daily_stats),
+    (8, "data_versions", _m008_data_versions),
+    (9, "chat_jobs", _m009_chat_jobs),
+    (10, "profile_versions", _m010_profile_versions),
+    (11, "drop_redundant_indexes", _m011_drop_redundant_indexes),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _ensure_version_table(cur: sqlite3.Cursor):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TEXT
+        )
+        """
+    )
+
+
+def read_version(conn) -> int:
+    """읽기 전용 버전 확인 (테이블이 없으면 0) - 부팅 시 빠른 경로"""
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return int(row[0] or 0) if row else 0
+
+
+def current_version(cur: sqlite3.Cursor) -> int:
+    _ensure_version_table(cur)
+    cur.execute("SELECT COALESCE(MAX(version), 0) AS v FROM schema_version")
+    return int(cur.fetchone()[0] or 0)
+
+
+def apply_migrations(cur: sqlite3.Cursor) -> list:
+    """
+    미적용 마이그레이션 실행 후 적용된 버전 목록 반환
+    (커밋은 호출자 책임)
+    """
+    version = current_version(cur)
+    applied = []
+    for ver, name, fn in MIGRATIONS:
+        if ver <= version:
+            continue
+        fn(cur)
+        cur.execute(
+            "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+            (ver, name, datetime.utcnow().isoformat()),
+        )
+        applied.append(ver)
+        print(f"[DB] migration {ver:03d} {name} 적용")
+    return applied
@@ -0,0 +1,225 @@
+import os
+import queue
+import sqlite3
+import threading
+
+from flask import g, has_app_context
+
+
+class PoolTimeout(RuntimeError):
+    """풀의 모든 연결이 사용 중이고 대기 시간 안에 반납되지 않음"""
+
+
+class ConnectionPool:
+    """
+    SQLite 연결 풀
+
+    - 최대 max_size 개의 연결만 열고, 반납된 연결은 LIFO로 재사용
+    - 프로세스가 fork 되면(gunicorn preload 등) 부모의 연결은 버리고 새로 만든다
+    """
+
+    def __init__(self, path: str, max_size: int = 8, timeout: float = 10.0, pragmas: dict | None = None):
+        self.path = path
+        self.max_size = max(int(max_size), 1)
+        self.timeout = timeout
+        # 연결 생성 시 한 번만 적용하는 PRAGMA (순서 유지: busy_timeout 먼저)
+        self.pragmas = dict(pragmas or {})
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._opened = 0
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+
+    def _connect(self) -> sqlite3.Connection:
+        busy_ms = int(self.pragmas.get("busy_timeout") or 0)
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=busy_ms / 1000.0 or 5.0)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            if value is None or value == "":
+                continue
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        self._check_pid()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"DB 연결 풀 고갈 (max_size={self.max_size})")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            conn = self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._opened += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        if self._pid != os.getpid():
+            # fork 이전에 빌린 연결은 자식 프로세스의 풀로 돌려보내지 않는다
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # 깨진 연결은 버리고 슬롯만 반환
+            with self._lock:
+                self._opened -= 1
+            self._slots.release()
+            return
+        self._idle.put(conn)
+        self._slots.release()
+
+    def close_all(self):
+        """대기 중인 연결을 모두 닫는다 (종료/테스트용)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def stats(self) -> dict:
+        return {
+            "max_size": self.max_size,
+            "opened": self._opened,
+            "idle": self._idle.qsize(),
+        }
+
+    def profile(self, conn: sqlite3.Connection) -> dict:
+        """연결에 실제로 적용된 PRAGMA 값 (WAL 미지원 파일시스템 등 확인용)"""
+        result = {}
+        for name in self.pragmas:
+            row = conn.execute(f"PRAGMA {name}").fetchone()
+            result[name] = row[0] if row else None
+        return result
+
+
+class _Scope:
+    """한 요청(또는 스레드)이 공유하는 연결 + 참조 카운트"""
+
+    __slots__ = ("conn", "refs")
+
+    def __init__(self):
+        self.conn = None
+        self.refs = 0
+
+
+class PooledConnection:
+    """
+    sqlite3.Connection 래퍼
+
+    기존 코드의 `conn = get_connection() ... conn.close()` 패턴을 그대로 쓰도록
+    close()는 실제로 닫지 않고 스코프 참조만 해제한다.
+    마지막 참조가 해제될 때 커밋되지 않은 변경은 롤백 (기존 close()와 동일한 의미)
+    """
+
+    def __init__(self, manager, scope: _Scope, request_scoped: bool):
+        self._manager = manager
+        self._scope = scope
+        self._request_scoped = request_scoped
+        self._raw = scope.conn
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw.__exit__(exc_type, exc, tb)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._manager._unref(self._scope, self._request_scoped)
+
+
+class ConnectionManager:
+    """
+    get_connection() 뒤에서 동작하는 연결 관리자
+
+    - Flask 앱 컨텍스트 안: 요청 하나가 연결 하나를 처음부터 끝까지 공유하고,
+      teardown_appcontext 에서 풀로 반납
+    - 앱 컨텍스트 밖(init_db, 배치 작업 등): 스레드 단위로 공유하고
+      마지막 close() 시 풀로 반납
+    """
+
+    _G_KEY = "_db_scope"
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        self._local = threading.local()
+
+    def _current_scope(self):
+        if has_app_context():
+            scope = getattr(g, self._G_KEY, None)
+            if scope is None:
+                scope = _Scope()
+                setattr(g, self._G_KEY, scope)
+            return scope, True
+        scope = getattr(self._local, "scope", None)
+        if scope is None:
+            scope = _Scope()
+            self._local.scope = scope
+        return scope, False
+
+    def connect(self) -> PooledConnection:
+        scope, request_scoped = self._current_scope()
+        if scope.conn is None:
+            scope.conn = self.pool.acquire()
+        scope.refs += 1
+        return PooledConnection(self, scope, request_scoped)
+
+    def _unref(self, scope: _Scope, request_scoped: bool):
+        scope.refs = max(scope.refs - 1, 0)
+        if scope.refs or scope.conn is None:
+            return
+        if request_scoped:
+            # 요청 중에는 연결을 유지하되, 미커밋 변경은 기존 close()처럼 버린다
+            if scope.conn.in_transaction:
+                scope.conn.rollback()
+            return
+        conn, scope.conn = scope.conn, None
+        self.pool.release(conn)
+
+    def release_idle(self) -> bool:
+        """
+        요청 스코프 연결을 요청 도중에 풀로 돌려준다 (열린 참조가 없을 때만)
+        모델 호출처럼 오래 걸리는 외부 I/O 전에 호출해 연결을 붙잡고 있지 않게 한다.
+        이후 get_connection() 은 풀에서 다시 빌린다. 반납했으면 True
+        """
+        if not has_app_context():
+            return False
+        scope = getattr(g, self._G_KEY, None)
+        if scope is None or scope.conn is None or scope.refs:
+            return False
+        conn, scope.conn = scope.conn, None
+        self.pool.release(conn)
+        return True
+
+    def teardown(self, exc=None):
+        """Flask teardown_appcontext 훅: 요청 스코프 연결을 풀로 반납"""
+        scope = g.pop(self._G_KEY, None)
+        if scope is None or scope.conn is None:
+            return
+        conn, scope.conn = scope.conn, None
+        scope.refs = 0
+        self.pool.release(conn)
@@ -5,9 +5,6 @@ ON users(email);
 CREATE INDEX IF NOT EXISTS idx_diets_user_date
 ON diets(user_id, date);
 
-CREATE INDEX IF NOT EXISTS idx_schedules_user_date
-ON schedules(user_id, date);
-
 CREATE INDEX IF NOT EXISTS idx_activities_user_date
 ON activities(user_id, completed_at);
 
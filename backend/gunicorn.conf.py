@@ -0,0 +1,47 @@
+"""
+gunicorn 설정 (gunicorn -c gunicorn.conf.py wsgi:app)
+
+- 워커(프로세스) x 스레드(gthread): SSE/스트리밍 응답과 LLM 대기 중에도 다른 요청을 처리
+- preload(기본): 마스터가 앱을 한 번 import → init_db() 도 마스터에서 한 번만 실행하고 워커는 fork
+  (DB 연결 풀/로그 기록기는 fork 후 워커에서 새로 만든다)
+- preload 를 끄면 on_starting 에서 마스터가 먼저 init_db() → 워커는 버전 확인만 하고 지나감
+- 종료(SIGTERM): graceful_timeout 안에 진행 중 요청을 마치고 worker_exit 에서 백그라운드 큐 정리
+
+환경 변수: PORT, WEB_CONCURRENCY, GUNICORN_THREADS, GUNICORN_PRELOAD, GUNICORN_TIMEOUT,
+          GUNICORN_GRACEFUL_TIMEOUT, GUNICORN_MAX_REQUESTS
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+# LLM 응답을 기다리는 요청이 있으므로 넉넉하게
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# 메모리 누수 대비 주기적 워커 교체 (0 이면 끔)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+
+# 워커가 여러 개여도 안전한 이유
+# - 비동기 채팅 작업 결과는 chat_jobs 테이블에 있어 어느 워커로 조회해도 같다
+# - 대화 상태(USER_STATE)는 매 요청 DB 프로필에서 다시 읽는 캐시라 워커별 memory 백엔드로 충분
+#   (CHAT_STATE_BACKEND=sqlite 는 필요할 때만 명시적으로)
+
+
+def on_starting(server):
+    if not preload_app:
+        from db.database import init_db
+        init_db()
+
+
+def worker_exit(server, worker):
+    from services.lifecycle import shutdown_background
+    shutdown_background()
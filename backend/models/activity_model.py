@@ -19,7 +19,7 @@ def get_daily_activity(user_id, date):
     cur.execute("""
         SELECT SUM(calories) AS burned
         FROM activities
-        WHERE user_id=? AND DATE(completed_at)=?
+        WHERE user_id=? AND day=?
     """, (user_id, date))
     row = cur.fetchone()
     conn.close()
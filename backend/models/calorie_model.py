@@ -1,40 +1,70 @@
 from db.database import get_connection
-from datetime import datetime
+from db.migrations import (
+    CALORIE_COMPONENTS,
+    CALORIE_DERIVED_SET,
+    CALORIE_SOURCES,
+    rebuild_calorie_components,
+)
 from utils.time_utils import normalize_date
 
-def upsert_daily_summary(user_id: int, date: str, bmr: float, tdee: float, intake: float, exercise: float, deficit: float, est_weight_change_kg: float):
+def update_summary_energy(user_id: int, date: str, bmr: float, tdee: float):
+    """
+    프로필에서 계산한 bmr/tdee 만 갱신하고 deficit 등 파생값을 다시 계산
+    (intake/exercise 구성 요소는 트리거가 변경분으로 유지 - db/migrations.py)
+    """
     date = normalize_date(date)
     conn = get_connection()
     cur = conn.cursor()
-
     cur.execute(
-        "SELECT id FROM calorie_summaries WHERE user_id=? AND date=? LIMIT 1",
+        """
+        INSERT INTO calorie_summaries (user_id, date, bmr, tdee)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(user_id, date) DO UPDATE SET
+            bmr=excluded.bmr,
+            tdee=excluded.tdee
+        """,
+        (user_id, date, bmr, tdee)
+    )
+    cur.execute(
+        f"UPDATE calorie_summaries SET {CALORIE_DERIVED_SET} WHERE user_id=? AND date=?",
         (user_id, date)
     )
-    row = cur.fetchone()
-    now = datetime.utcnow().isoformat()
-
-    if row:
-        cur.execute(
-            """
-            UPDATE calorie_summaries
-            SET bmr=?, tdee=?, intake=?, exercise=?, deficit=?, est_weight_change_kg=?, updated_at=?
-            WHERE id=?
-            """,
-            (bmr, tdee, intake, exercise, deficit, est_weight_change_kg, now, row["id"])
-        )
-    else:
-        cur.execute(
-            """
-            INSERT INTO calorie_summaries (user_id, date, bmr, tdee, intake, exercise, deficit, est_weight_change_kg, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (user_id, date, bmr, tdee, intake, exercise, deficit, est_weight_change_kg, now)
-        )
+    conn.commit()
+    conn.close()
 
+def update_user_energy(user_id: int, bmr: float, tdee: float):
+    """사용자의 모든 요약 행에 bmr/tdee 반영 (rebuild 용)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        f"UPDATE calorie_summaries SET bmr=?, tdee=?, {CALORIE_DERIVED_SET} WHERE user_id=?",
+        (bmr, tdee, user_id)
+    )
     conn.commit()
     conn.close()
 
+def rebuild_summaries(user_id: int | None = None) -> int:
+    """원천 테이블에서 intake/exercise 구성 요소를 다시 합산 (트리거 누락/수동 수정 복구용)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        updated = rebuild_calorie_components(cur, user_id)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return updated
+
+def list_summary_users():
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT DISTINCT user_id FROM calorie_summaries ORDER BY user_id")
+    rows = [r["user_id"] for r in cur.fetchall()]
+    conn.close()
+    return rows
+
 def get_daily_summary(user_id: int, date: str):
     date = normalize_date(date)
     conn = get_connection()
@@ -50,3 +80,78 @@ def get_daily_summary(user_id: int, date: str):
     row = cur.fetchone()
     conn.close()
     return row
+
+def list_summaries_in_range(user_id: int, start: str, end: str):
+    """start~end (포함) 요약 행, 날짜순 - UNIQUE(user_id, date) 인덱스 범위 검색"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT user_id, date, bmr, tdee, intake, exercise, deficit, est_weight_change_kg, updated_at
+        FROM calorie_summaries
+        WHERE user_id=? AND date BETWEEN ? AND ?
+        ORDER BY date ASC
+        """,
+        (user_id, start, end)
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+def sum_components_in_range(user_id: int, start: str, end: str) -> dict:
+    """
+    원천 테이블별 GROUP BY 한 번씩으로 날짜별 구성 요소 합계
+    반환: {date: {intake_logged, intake_planned, exercise_logged, exercise_planned}}
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    sums = {}
+    for table, column, date_col, _, cond in CALORIE_SOURCES:
+        c = cond.format(r=table)
+        cur.execute(
+            f"""
+            SELECT {date_col} AS d, COALESCE(SUM(calories), 0) AS v
+            FROM {table}
+            WHERE user_id=? AND {date_col} BETWEEN ? AND ? AND {c}
+            GROUP BY {date_col}
+            """,
+            (user_id, start, end)
+        )
+        for r in cur.fetchall():
+            sums.setdefault(r["d"], dict.fromkeys(CALORIE_COMPONENTS, 0.0))[column] = float(r["v"] or 0)
+    conn.close()
+    return sums
+
+def upsert_summaries_bulk(user_id: int, rows):
+    """
+    rows: [(date, bmr, tdee, intake_logged, intake_planned, exercise_logged, exercise_planned)]
+    한 트랜잭션으로 기록하고 파생값 재계산
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.executemany(
+            """
+            INSERT INTO calorie_summaries
+                (user_id, date, bmr, tdee, intake_logged, intake_planned, exercise_logged, exercise_planned)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_id, date) DO UPDATE SET
+                bmr=excluded.bmr,
+                tdee=excluded.tdee,
+                intake_logged=excluded.intake_logged,
+                intake_planned=excluded.intake_planned,
+                exercise_logged=excluded.exercise_logged,
+                exercise_planned=excluded.exercise_planned
+            """,
+            [(user_id, *r) for r in rows]
+        )
+        cur.executemany(
+            f"UPDATE calorie_summaries SET {CALORIE_DERIVED_SET} WHERE user_id=? AND date=?",
+            [(user_id, r[0]) for r in rows]
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
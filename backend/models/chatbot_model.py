@@ -11,42 +11,205 @@ def log_message(user_id: int, role: str, message: str):
     conn.commit()
     conn.close()
 
-def list_logs(user_id: int, limit: int = 50, date: str | None = None):
+def insert_logs(rows):
+    """[(user_id, role, message, created_at)] 를 한 트랜잭션으로 기록"""
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.executemany(
+            "INSERT INTO chatbot_logs (user_id, role, message, created_at) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def list_logs(
+    user_id: int,
+    limit: int = 50,
+    date: str | None = None,
+    before_id: int | None = None,
+    after_id: int | None = None,
+    roles: tuple | None = None,
+):
+    """
+    키셋 페이지네이션 (idx_chatbot_logs_user_id_desc / idx_chatbot_logs_user_day 사용)
+    - before_id: id < before_id 인 것 중 최신 limit 개
+    - after_id : id > after_id 인 것 중 오래된 limit 개
+    - 둘 다 없으면 최신 limit 개
+    - roles: 지정하면 해당 역할만 (limit 전에 거른다)
+    반환은 항상 시간순
+    """
     conn = get_connection()
     cur = conn.cursor()
 
+    where = ["user_id=?"]
+    params = [user_id]
     if date:
-        cur.execute(
-            """
-            SELECT id, user_id, role, message, created_at
-            FROM chatbot_logs
-            WHERE user_id=? AND DATE(created_at)=?
-            ORDER BY id DESC
-            LIMIT ?
-            """,
-            (user_id, date, limit)
-        )
-    else:
-        cur.execute(
-            """
-            SELECT id, user_id, role, message, created_at
-            FROM chatbot_logs
-            WHERE user_id=?
-            ORDER BY id DESC
-            LIMIT ?
-            """,
-            (user_id, limit)
-        )
+        where.append("day=?")
+        params.append(date)
+    if before_id is not None:
+        where.append("id < ?")
+        params.append(before_id)
+    if after_id is not None:
+        where.append("id > ?")
+        params.append(after_id)
+    if roles:
+        where.append(f"role IN ({', '.join('?' * len(roles))})")
+        params.extend(roles)
+
+    # after_id 는 커서 다음부터 앞으로, 나머지는 최신부터 뒤로 읽는다
+    ascending = after_id is not None and before_id is None
+    cur.execute(
+        f"""
+        SELECT id, user_id, role, message, created_at
+        FROM chatbot_logs
+        WHERE {" AND ".join(where)}
+        ORDER BY id {"ASC" if ascending else "DESC"}
+        LIMIT ?
+        """,
+        (*params, limit)
+    )
 
     rows = cur.fetchall()
     conn.close()
-    return list(reversed(rows))  # 시간순
+    return rows if ascending else list(reversed(rows))  # 시간순
+
+def iter_logs(user_id: int, date: str | None = None, chunk_size: int = 500):
+    """
+    전체 로그를 시간순으로 chunk_size 개씩 읽는 제너레이터 (내보내기용)
+    id 커서로 끊어 읽으므로 메모리 사용량이 대화 길이와 무관하다
+    """
+    after_id = 0
+    while True:
+        rows = list_logs(user_id, limit=chunk_size, date=date, after_id=after_id)
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        after_id = rows[-1]["id"]
 
 def clear_logs(user_id: int):
     conn = get_connection()
     cur = conn.cursor()
     cur.execute("DELETE FROM chatbot_logs WHERE user_id=?", (user_id,))
+    deleted = cur.rowcount
+    cur.execute("DELETE FROM conversation_summaries WHERE user_id=?", (user_id,))
     conn.commit()
     conn.close()
-    return cur.rowcount
+    return deleted
 
+def _roles_filter(roles) -> tuple:
+    if not roles:
+        return "", ()
+    return f"AND role IN ({', '.join('?' * len(roles))})", tuple(roles)
+
+def list_logs_range(user_id: int, after_id: int, upto_id: int, limit: int = 100, roles: tuple | None = None):
+    """after_id < id <= upto_id 구간 로그 (오래된 순) - 대화 요약 갱신용"""
+    role_sql, role_params = _roles_filter(roles)
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT id, role, message
+        FROM chatbot_logs
+        WHERE user_id=? AND id > ? AND id <= ? {role_sql}
+        ORDER BY id ASC
+        LIMIT ?
+        """,
+        (user_id, after_id, upto_id, *role_params, limit)
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+def count_logs_range(user_id: int, after_id: int, upto_id: int, roles: tuple | None = None) -> int:
+    """after_id < id <= upto_id 구간의 이 사용자 로그 수 (id 는 전체 사용자 공용 AUTOINCREMENT)"""
+    role_sql, role_params = _roles_filter(roles)
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT COUNT(*) FROM chatbot_logs
+        WHERE user_id=? AND id > ? AND id <= ? {role_sql}
+        """,
+        (user_id, after_id, upto_id, *role_params)
+    )
+    n = cur.fetchone()[0]
+    conn.close()
+    return int(n or 0)
+
+def get_summary(user_id: int):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT summary, upto_log_id FROM conversation_summaries WHERE user_id=?",
+        (user_id,)
+    )
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+def save_summary(user_id: int, summary: str, upto_log_id: int):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO conversation_summaries (user_id, summary, upto_log_id, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET
+            summary=excluded.summary,
+            upto_log_id=excluded.upto_log_id,
+            updated_at=excluded.updated_at
+        """,
+        (user_id, summary, upto_log_id, datetime.utcnow().isoformat())
+    )
+    conn.commit()
+    conn.close()
+
+
+# ===============================
+# 비동기 채팅 작업 (chat_jobs)
+# ===============================
+def create_job(job_id: str, user_id: int, now: float, expires_at: float):
+    """작업 등록 + 만료된 작업 정리"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM chat_jobs WHERE expires_at <= ?", (now,))
+    cur.execute(
+        """
+        INSERT INTO chat_jobs (id, user_id, status, created_at, expires_at)
+        VALUES (?, ?, 'pending', ?, ?)
+        """,
+        (job_id, user_id, now, expires_at)
+    )
+    conn.commit()
+    conn.close()
+
+def finish_job(job_id: str, status: str, reply: str | None, error: str | None, now: float, expires_at: float):
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("DELETE FROM chat_jobs WHERE expires_at <= ?", (now,))
+    cur.execute(
+        "UPDATE chat_jobs SET status=?, reply=?, error=?, expires_at=? WHERE id=?",
+        (status, reply, error, expires_at, job_id)
+    )
+    conn.commit()
+    conn.close()
+
+def get_job(job_id: str, user_id: int, now: float):
+    """본인 작업만 (남의 작업/만료된 작업이면 None)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT id, status, reply, error FROM chat_jobs
+        WHERE id=? AND user_id=? AND expires_at > ?
+        """,
+        (job_id, user_id, now)
+    )
+    row = cur.fetchone()
+    conn.close()
+    return row
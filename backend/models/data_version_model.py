@@ -0,0 +1,20 @@
+from db.database import get_connection
+
+
+def get_data_versions(user_id, sources) -> dict:
+    """(user_id, source) 별 데이터 버전 - 기록이 없는 source 는 0"""
+    sources = list(sources)
+    if not sources:
+        return {}
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        f"""
+        SELECT source, version FROM user_data_versions
+        WHERE user_id=? AND source IN ({", ".join("?" * len(sources))})
+        """,
+        (user_id, *sources)
+    )
+    found = {r["source"]: r["version"] for r in cur.fetchall()}
+    conn.close()
+    return {s: found.get(s, 0) for s in sources}
@@ -0,0 +1,271 @@
+"""
+음식 카탈로그 (프로세스 전역, 읽기 전용)
+
+food.csv + food_meal_type.csv 를 한 번 읽어 아래 인덱스를 미리 만들어 둔다.
+- id / 이름 → 음식
+- meal_type 비트셋 (한 음식이 여러 끼니에 속할 수 있음)
+- 이름 / 알레르기 문자열 n-gram(1~2글자) 역색인: 좋아요/싫어요/알레르기 키워드 부분일치 검색용
+  (알레르기는 기존 SQL `allergy NOT LIKE '%x%'` 처럼 부분일치 - "견과" 는 "견과류" 도 막는다)
+
+CSV 파일이 바뀌면(mtime) 자동으로 다시 만들고, invalidate_food_catalog()로 강제 갱신할 수 있다.
+CSV가 없으면 foods 테이블에서 읽고, 테이블 요약값(행 수 / 최대 id / 내용 합계)이 바뀌면
+다시 만든다 (다른 프로세스가 seed 를 다시 넣어도 반영).
+"""
+import csv
+import os
+import re
+import threading
+
+from db.database import get_connection, DATA_DIR
+
+FOOD_CSV_PATH = os.path.join(DATA_DIR, "food.csv")
+FOOD_MEAL_TYPES_PATH = os.path.join(DATA_DIR, "food_meal_type.csv")
+
+MEAL_TYPES = ("breakfast", "lunch", "dinner", "snack")
+
+_TOKEN_SPLIT = re.compile(r"[,/·\s]+")
+
+
+def split_keywords(value) -> list:
+    """
+    "브로콜리, 버섯" → ["브로콜리", "버섯"]
+    """
+    if not value:
+        return []
+    return [v.strip().lower() for v in str(value).split(",") if v.strip()]
+
+
+def _allergy_tokens(value) -> list:
+    """사용자 알레르기 입력 → 키워드 ("견과, 우유" / "견과 우유" 모두 두 개)"""
+    if not value:
+        return []
+    return [t.lower() for t in _TOKEN_SPLIT.split(str(value)) if t]
+
+
+def _ngrams(text: str) -> set:
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+class FoodCatalog:
+    """불변 카탈로그 - 생성 후 수정하지 않는다 (반환되는 dict 도 읽기 전용으로 취급)"""
+
+    def __init__(self, foods: list):
+        self.foods = tuple(foods)
+        self.by_id = {f["id"]: f for f in self.foods}
+        self.by_name = {}
+        for f in self.foods:
+            self.by_name.setdefault(f["name"], f)
+
+        # meal_type → 비트
+        self.meal_bits = {mt: 1 << i for i, mt in enumerate(MEAL_TYPES)}
+        for f in self.foods:
+            for mt in f["meal_types"]:
+                if mt not in self.meal_bits:
+                    self.meal_bits[mt] = 1 << len(self.meal_bits)
+
+        self.meal_masks = []
+        self._by_meal = {mt: [] for mt in self.meal_bits}
+        self._names = []
+        self._grams = {}
+        self._allergy_texts = []
+        self._allergy_grams = {}
+        for idx, f in enumerate(self.foods):
+            mask = 0
+            for mt in f["meal_types"]:
+                mask |= self.meal_bits[mt]
+                self._by_meal[mt].append(idx)
+            self.meal_masks.append(mask)
+
+            name = (f["name"] or "").lower()
+            self._names.append(name)
+            for g in _ngrams(name):
+                self._grams.setdefault(g, set()).add(idx)
+
+            allergy = (f.get("allergy") or "").lower()
+            self._allergy_texts.append(allergy)
+            for g in _ngrams(allergy):
+                self._allergy_grams.setdefault(g, set()).add(idx)
+
+        self._by_meal = {mt: tuple(ids) for mt, ids in self._by_meal.items()}
+
+    def __len__(self):
+        return len(self.foods)
+
+    @staticmethod
+    def _match(keyword: str, grams: dict, texts: list) -> set:
+        """texts 에 keyword 가 포함된 음식 인덱스 (n-gram 후보 교집합 → 부분일치 확인)"""
+        kw = (keyword or "").strip().lower()
+        if not kw:
+            return set()
+        if len(kw) == 1:
+            return set(grams.get(kw, ()))
+
+        postings = []
+        for i in range(len(kw) - 1):
+            p = grams.get(kw[i:i + 2])
+            if not p:
+                return set()
+            postings.append(p)
+        postings.sort(key=len)
+        hits = set(postings[0])
+        for p in postings[1:]:
+            hits &= p
+            if not hits:
+                return hits
+        return {i for i in hits if kw in texts[i]}
+
+    def match_name(self, keyword: str) -> set:
+        return self._match(keyword, self._grams, self._names)
+
+    def match_allergy(self, keyword: str) -> set:
+        """알레르기 문자열에 keyword 가 포함된 음식 인덱스"""
+        return self._match(keyword, self._allergy_grams, self._allergy_texts)
+
+    def meal_indices(self, meal_type: str) -> tuple:
+        return self._by_meal.get(meal_type, ())
+
+    def candidates(self, meal_type, dislikes=None, allergies=None, likes=None) -> list:
+        """
+        get_food_candidates 와 같은 규칙
+        - meal_type 에 속하는 음식
+        - 알레르기 문자열에 사용자 알레르기 키워드가 포함된 음식 제외 (부분일치)
+        - 싫어하는 키워드가 이름에 포함된 음식 제외
+        - 좋아하는 키워드가 포함된 후보가 있으면 그것만 반환
+        """
+        ids = self.meal_indices(meal_type)
+        if not ids:
+            return []
+
+        blocked = set()
+        for kw in split_keywords(dislikes):
+            blocked |= self.match_name(kw)
+
+        for a in _allergy_tokens(allergies):
+            blocked |= self.match_allergy(a)
+
+        rows = [i for i in ids if i not in blocked]
+
+        like_keywords = split_keywords(likes)
+        if like_keywords:
+            liked = set()
+            for kw in like_keywords:
+                liked |= self.match_name(kw)
+            preferred = [i for i in rows if i in liked]
+            if preferred:
+                rows = preferred
+
+        return [self.foods[i] for i in rows]
+
+
+def _load_from_csv() -> list:
+    foods = {}
+    with open(FOOD_CSV_PATH, encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if not row or not row.get("name"):
+                continue
+            fid = int(row["id"])
+            foods[fid] = {
+                "id": fid,
+                "name": row["name"],
+                "calories": int(row.get("calories") or 0),
+                "protein": int(row.get("protein") or 0),
+                "carbs": int(row.get("carbs") or 0),
+                "fat": int(row.get("fat") or 0),
+                "allergy": row.get("allergy") or None,
+                "meal_types": [],
+            }
+
+    if os.path.exists(FOOD_MEAL_TYPES_PATH):
+        with open(FOOD_MEAL_TYPES_PATH, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                fid = int(row.get("food_id") or 0)
+                meal_type = (row.get("meal_type") or "").strip()
+                if fid in foods and meal_type and meal_type not in foods[fid]["meal_types"]:
+                    foods[fid]["meal_types"].append(meal_type)
+
+    result = []
+    for food in foods.values():
+        food["meal_types"] = tuple(food["meal_types"])
+        food["meal_type"] = food["meal_types"][0] if food["meal_types"] else None
+        result.append(food)
+    return result
+
+
+def _load_from_db() -> list:
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT id, name, meal_type, calories, protein, carbs, fat, allergy FROM foods")
+    rows = cur.fetchall()
+    conn.close()
+
+    result = []
+    for r in rows:
+        food = dict(r)
+        food["meal_types"] = (food["meal_type"],) if food.get("meal_type") else ()
+        result.append(food)
+    return result
+
+
+def _db_signature():
+    """foods 테이블 요약값 - 전체를 읽지 않고 변경 여부만 판단"""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            """
+            SELECT COUNT(*), MAX(id),
+                   TOTAL(calories + protein + carbs + fat),
+                   TOTAL(LENGTH(name) + LENGTH(IFNULL(meal_type, '')) + LENGTH(IFNULL(allergy, '')))
+            FROM foods
+            """
+        ).fetchone()
+    finally:
+        conn.close()
+    return tuple(row)
+
+
+def _source_signature():
+    sig = []
+    for path in (FOOD_CSV_PATH, FOOD_MEAL_TYPES_PATH):
+        try:
+            st = os.stat(path)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    if sig[0] is None:
+        # CSV 없음 → DB 에서 읽으므로 DB 상태로 판단
+        sig.append(_db_signature())
+    return tuple(sig)
+
+
+_lock = threading.Lock()
+_catalog = None
+_catalog_sig = None
+
+
+def get_food_catalog() -> FoodCatalog:
+    global _catalog, _catalog_sig
+    sig = _source_signature()
+    if _catalog is not None and sig == _catalog_sig:
+        return _catalog
+
+    with _lock:
+        if _catalog is not None and sig == _catalog_sig:
+            return _catalog
+        if sig[0] is not None:
+            foods = _load_from_csv()
+        else:
+            foods = _load_from_db()
+        _catalog = FoodCatalog(foods)
+        _catalog_sig = sig
+        print(f"[FOOD] 카탈로그 로드 ({len(_catalog)} foods)")
+        return _catalog
+
+
+def invalidate_food_catalog():
+    """음식 데이터가 바뀌었을 때 호출 → 다음 조회 시 다시 로드"""
+    global _catalog, _catalog_sig
+    with _lock:
+        _catalog = None
+        _catalog_sig = None
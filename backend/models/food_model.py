@@ -1,5 +1,6 @@
 from db.database import get_connection
 from datetime import datetime
+from models.food_catalog import get_food_catalog
 
 
 # 사용자 음식 선호 저장
@@ -34,38 +35,11 @@ def get_food_preferences(user_id):
 
 
 # 🔥 CSV 기반 음식 후보 조회 (추천용)
+# 메모리 카탈로그(models.food_catalog)의 인덱스로 필터링 - 반환 dict 는 읽기 전용
 def get_food_candidates(meal_type, dislikes=None, allergies=None, likes=None):
-    conn = get_connection()
-    cur = conn.cursor()
-
-    query = """
-        SELECT *
-        FROM foods
-        WHERE meal_type=?
-    """
-    params = [meal_type]
-
-    if allergies:
-        query += " AND (allergy IS NULL OR allergy NOT LIKE ?)"
-        params.append(f"%{allergies}%")
-
-    if dislikes:
-        for d in dislikes.split(","):
-            query += " AND name NOT LIKE ?"
-            params.append(f"%{d.strip()}%")
-
-    cur.execute(query, params)
-    rows = [dict(r) for r in cur.fetchall()]
-    conn.close()
-
-    # likes가 있으면, 우선적으로 like 키워드가 포함된 후보를 사용
-    if likes:
-      try:
-        like_keywords = [x.strip() for x in str(likes).split(",") if x.strip()]
-        if like_keywords:
-          preferred = [r for r in rows if any(k in (r.get("name") or "") for k in like_keywords)]
-          if preferred:
-            return preferred
-      except Exception:
-        pass
-    return rows
+    return get_food_catalog().candidates(
+        meal_type,
+        dislikes=dislikes,
+        allergies=allergies,
+        likes=likes,
+    )
@@ -0,0 +1,153 @@
+"""
+사용자 프로필 + 유효 영양 목표 스냅샷 (프로세스 캐시)
+
+users / diet_goals / user_nutrition_goal 을 조인 한 번으로 읽고,
+챗봇이 한 메시지를 처리하는 동안 여러 번 조회해도 DB를 다시 타지 않도록 캐시한다.
+
+- 쓰기 경로(update_my_info, upsert_diet_goal, tool_update_user_profile)에서
+  invalidate_profile()을 호출해 바로 무효화
+- 다른 워커 프로세스의 쓰기: 세 테이블의 트리거가 올리는 (user_id, "profile") 데이터 버전을
+  조회마다 확인해(PK 조회 한 번) 버전이 다르면 다시 읽는다 (db/migrations.py PROFILE_VERSION_TABLES)
+- TTL(PROFILE_CACHE_TTL_SEC)은 오래 안 쓰인 항목 정리용
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from db.database import get_connection
+from db.migrations import PROFILE_VERSION_SOURCE
+from models.data_version_model import get_data_versions
+
+PROFILE_CACHE_TTL_SEC = int(os.getenv("PROFILE_CACHE_TTL_SEC", "300"))
+PROFILE_CACHE_MAX = int(os.getenv("PROFILE_CACHE_MAX", "5000"))
+
+_SNAPSHOT_SQL = """
+    SELECT
+        u.*,
+        dg.type                 AS dg_type,
+        dg.target_calories      AS dg_calories,
+        dg.target_protein       AS dg_protein,
+        dg.target_activity_kcal AS dg_activity_kcal,
+        ng.calories             AS ng_calories,
+        ng.protein              AS ng_protein,
+        ng.activity_kcal        AS ng_activity_kcal
+    FROM users u
+    LEFT JOIN diet_goals dg ON dg.user_id = u.id
+    LEFT JOIN user_nutrition_goal ng ON ng.user_id = u.id
+    WHERE u.id = ?
+"""
+
+_PROFILE_KEYS = ("id", "email", "name", "height", "weight", "goal", "environment", "equipment", "created_at")
+
+
+def _valid(v):
+    return v is not None and v != 0
+
+
+def _build_goal(row: dict) -> dict:
+    """
+    우선순위:
+    1) diet_goals (값이 있고 > 0)
+    2) user_nutrition_goal
+    """
+    goal = {
+        "type": row.get("dg_type") or None,
+        "calories": None,
+        "protein": None,
+        "activity_kcal": None,
+        "source": {},
+    }
+    for field in ("calories", "protein", "activity_kcal"):
+        if _valid(row.get(f"dg_{field}")):
+            goal[field] = row[f"dg_{field}"]
+            goal["source"][field] = "diet_goals"
+        elif _valid(row.get(f"ng_{field}")):
+            goal[field] = row[f"ng_{field}"]
+            goal["source"][field] = "nutrition_goal"
+    return goal
+
+
+def load_profile_snapshot(user_id: int):
+    """DB에서 바로 읽기 (캐시 미사용). 사용자가 없으면 None"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(_SNAPSHOT_SQL, (user_id,))
+    row = cur.fetchone()
+    conn.close()
+    if not row:
+        return None
+
+    row = dict(row)
+    return {
+        "profile": {k: row.get(k) for k in _PROFILE_KEYS},
+        "goal": _build_goal(row),
+    }
+
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # user_id -> (loaded_at, version, snapshot)
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+# 무효화 세대: 읽는 도중 무효화되면 읽은 값을 캐시에 넣지 않는다
+_generation = 0
+
+
+def get_profile_snapshot(user_id: int):
+    """
+    캐시된 스냅샷 반환 ({"profile": {...}, "goal": {...}} 또는 None)
+    반환값은 호출자가 수정해도 캐시에 영향이 없도록 복사본
+    """
+    user_id = int(user_id)
+    now = time.time()
+    # 스냅샷보다 먼저 읽는다: 읽는 사이 쓰기가 있으면 낡은 버전으로 저장돼 다음 조회에서 다시 읽음
+    version = get_data_versions(user_id, (PROFILE_VERSION_SOURCE,))[PROFILE_VERSION_SOURCE]
+    with _lock:
+        item = _cache.get(user_id)
+        if item is not None and now - item[0] < PROFILE_CACHE_TTL_SEC and item[1] == version:
+            _cache.move_to_end(user_id)
+            _stats["hits"] += 1
+            return _copy(item[2])
+        _stats["misses"] += 1
+        gen = _generation
+
+    snap = load_profile_snapshot(user_id)
+    if snap is None:
+        return None
+
+    with _lock:
+        if gen != _generation:
+            return _copy(snap)
+        _cache[user_id] = (now, version, snap)
+        _cache.move_to_end(user_id)
+        while len(_cache) > PROFILE_CACHE_MAX:
+            _cache.popitem(last=False)
+    return _copy(snap)
+
+
+def _copy(snap: dict) -> dict:
+    goal = dict(snap["goal"])
+    goal["source"] = dict(goal["source"])
+    return {"profile": dict(snap["profile"]), "goal": goal}
+
+
+def invalidate_profile(user_id):
+    """프로필/목표가 바뀐 직후 호출"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.pop(int(user_id), None)
+        _stats["invalidations"] += 1
+
+
+def invalidate_all_profiles():
+    """일괄 재계산 등으로 여러 사용자의 목표가 바뀐 뒤 호출"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _cache.clear()
+        _stats["invalidations"] += 1
+
+
+def profile_cache_stats() -> dict:
+    with _lock:
+        return {**_stats, "size": len(_cache)}
@@ -50,6 +50,116 @@ def clear_recommendations(user_id, date):
     conn.close()
 
 
+def _replace_day(cur, user_id, date, diets, workouts, now):
+    cur.execute("DELETE FROM diet_recommendations WHERE user_id=? AND date=?", (user_id, date))
+    cur.execute("DELETE FROM workout_recommendations WHERE user_id=? AND date=?", (user_id, date))
+    cur.executemany(
+        """
+        INSERT INTO diet_recommendations
+        (user_id, date, meal_type, menu, calories, protein, created_at, confirmed)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+        """,
+        [
+            (user_id, date, d["meal_type"], d["menu"], d["calories"], d["protein"], now)
+            for d in diets
+        ],
+    )
+    cur.executemany(
+        """
+        INSERT INTO workout_recommendations
+        (user_id, date, workout, duration, calories, created_at, confirmed)
+        VALUES (?, ?, ?, ?, ?, ?, 0)
+        """,
+        [
+            (user_id, date, w["workout"], w["duration"], w["calories"], now)
+            for w in workouts
+        ],
+    )
+
+
+def replace_recommendations(user_id, date, diets, workouts):
+    """
+    해당 날짜의 추천을 한 트랜잭션으로 교체 (삭제 + 일괄 INSERT)
+    diets: [{meal_type, menu, calories, protein}]
+    workouts: [{workout, duration, calories}]
+    """
+    replace_recommendations_bulk(user_id, {date: (diets, workouts)})
+
+
+def replace_recommendations_bulk(user_id, plans: dict):
+    """
+    여러 날짜의 추천을 한 트랜잭션으로 교체
+    plans: {date: (diets, workouts)}
+    """
+    replace_recommendations_many(
+        (user_id, date, diets, workouts) for date, (diets, workouts) in plans.items()
+    )
+
+
+def replace_recommendations_many(items):
+    """
+    여러 사용자/날짜의 추천을 한 트랜잭션으로 교체 (야간 일괄 생성용)
+    items: [(user_id, date, diets, workouts)]
+    """
+    now = datetime.utcnow().isoformat()
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        for user_id, date, diets, workouts in items:
+            _replace_day(cur, user_id, date, diets, workouts, now)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def list_recommendations_in_range(user_id, start, end):
+    """
+    기간(start~end, 포함) 추천을 날짜별로 묶어 반환 (확정 포함, 쿼리 2번)
+    반환: {date: {"diets": [...], "workouts": [...]}}
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT
+            id,
+            date,
+            meal_type,
+            menu,
+            calories,
+            protein,
+            created_at,
+            COALESCE(confirmed,0) AS confirmed
+        FROM diet_recommendations
+        WHERE user_id=? AND date BETWEEN ? AND ?
+        ORDER BY date ASC, id ASC
+        """,
+        (user_id, start, end),
+    )
+    diets = cur.fetchall()
+    cur.execute(
+        """
+        SELECT id, date, workout, duration, calories, created_at, COALESCE(confirmed,0) AS confirmed
+        FROM workout_recommendations
+        WHERE user_id=? AND date BETWEEN ? AND ?
+        ORDER BY date ASC, id ASC
+        """,
+        (user_id, start, end),
+    )
+    workouts = cur.fetchall()
+    conn.close()
+
+    result = {}
+    for r in diets:
+        result.setdefault(r["date"], {"diets": [], "workouts": []})["diets"].append(r)
+    for r in workouts:
+        result.setdefault(r["date"], {"diets": [], "workouts": []})["workouts"].append(r)
+    return result
+
+
 def list_recommendations(user_id, date, include_confirmed=True):
     conn = get_connection()
     cur = conn.cursor()
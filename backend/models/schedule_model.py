@@ -24,3 +24,17 @@ def get_schedule_by_date(user_id, date):
     rows = cur.fetchall()
     conn.close()
     return rows
+
+
+def get_schedules_in_range(user_id, start, end):
+    """start~end(포함) 기간 일정 (주간 계획용 범위 조회)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT * FROM schedules
+        WHERE user_id=? AND date BETWEEN ? AND ?
+        ORDER BY date, start_time
+    """, (user_id, start, end))
+    rows = cur.fetchall()
+    conn.close()
+    return rows
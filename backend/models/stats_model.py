@@ -0,0 +1,67 @@
+from db.database import get_connection
+from db.migrations import rebuild_daily_stats
+
+
+def list_daily_stats(user_id: int, start: str, end: str):
+    """start~end (포함) 일일 롤업, 날짜순 - 기본키 (user_id, date) 범위 검색"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT date, intake_kcal, protein, activity_minutes, burned_kcal, weight
+        FROM user_daily_stats
+        WHERE user_id=? AND date BETWEEN ? AND ?
+        ORDER BY date ASC
+        """,
+        (user_id, start, end)
+    )
+    rows = cur.fetchall()
+    conn.close()
+    return rows
+
+
+def rebuild_stats(user_id: int | None = None) -> int:
+    """원천 테이블에서 일일 롤업 재생성 (트리거 누락/수동 수정 복구용)"""
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        rows = rebuild_daily_stats(cur, user_id)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return rows
+
+
+# 버킷 → 버킷 시작일 SQL 식 (주는 월요일 시작)
+BUCKET_SQL = {
+    "day": "date",
+    "week": "DATE(date, 'weekday 0', '-6 days')",
+    "month": "STRFTIME('%Y-%m-01', date)",
+}
+
+
+def iter_bucketed_stats(user_id: int, column: str, start: str, end: str, bucket: str, agg: str = "SUM"):
+    """
+    start~end 롤업을 버킷 단위로 집계해 (버킷 시작일, 값)을 날짜순으로 하나씩 반환
+    기본키 (user_id, date) 범위 검색 + GROUP BY, 결과는 커서에서 바로 흘려보낸다
+    """
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT {BUCKET_SQL[bucket]} AS bucket, {agg}({column}) AS value
+            FROM user_daily_stats
+            WHERE user_id=? AND date BETWEEN ? AND ? AND {column} IS NOT NULL
+            GROUP BY bucket
+            ORDER BY bucket ASC
+            """,
+            (user_id, start, end)
+        )
+        for row in cur:
+            yield row["bucket"], row["value"]
+    finally:
+        conn.close()
@@ -14,7 +14,7 @@ def get_daily_summary(user_id, date):
     cur.execute("""
         SELECT SUM(calories) AS actual
         FROM activities
-        WHERE user_id=? AND DATE(completed_at)=?
+        WHERE user_id=? AND day=?
     """, (user_id, date))
     actual = cur.fetchone()["actual"] or 0
 
@@ -77,7 +77,7 @@ def list_activity_logs():
         """
         SELECT id, workout, duration, calories, completed_at, intensity, source
         FROM activities
-        WHERE user_id=? AND DATE(completed_at)=?
+        WHERE user_id=? AND day=?
         ORDER BY id DESC
         """,
         (user_id, date),
@@ -1,5 +1,10 @@
 import os, re
 from openai import OpenAI
+from services.llm_cache import llm_cache, make_key
+from services.state_store import create_state_store
+from routes.intent_classifier import classify, scan, goal_from_tags
+from services.chat_context import build_context
+from db.database import release_connection
 from routes.ai_tools import (
     tool_get_user_profile,
     tool_update_user_profile,
@@ -115,22 +120,16 @@ COMBINED_SYSTEM_PROMPT = """
 """
 
 
-# ✅ In-memory chat state (DB가 고장나도 대화 중 기억 유지)
-# 주의: 서버 재시작하면 초기화됨 (그게 싫으면 DB/Redis로)
-USER_STATE = {}  # { user_id: {"height":173, "weight":80, "goal":"recomposition", "meals_per_day":3, ...} }
+# ✅ 대화 상태 저장소 (DB가 고장나도 대화 중 기억 유지)
+# - 크기/TTL 제한이 있는 LRU, CHAT_STATE_BACKEND=sqlite 이면 워커 간 공유
+USER_STATE = create_state_store()  # { user_id: {"height":173, "weight":80, "goal":"recomposition", "meals_per_day":3, ...} }
 
 # ✅ DB에 저장 가능한 필드만 (meals_per_day는 DB에 안 넣음: 툴/DB 스키마 불명확)
 PROFILE_DB_KEYS = {"height", "weight", "goal", "environment", "equipment"}
 
 
 def _normalize_goal(msg: str):
-    if ("체지방" in msg and "근육" in msg) or ("감량" in msg and "근육" in msg) or ("리컴" in msg):
-        return "recomposition"
-    if ("감량" in msg) or ("체지방" in msg) or ("다이어트" in msg):
-        return "fat_loss"
-    if ("근육" in msg) or ("근대비" in msg) or ("증량" in msg) or ("벌크" in msg):
-        return "muscle_gain"
-    return None
+    return goal_from_tags(scan((msg or "").strip().lower()))
 
 
 def extract_from_message(message: str):
@@ -140,42 +139,17 @@ def extract_from_message(message: str):
       height (int), weight (int), meals_per_day (int),
       goal (str), environment (str), equipment (str)
     """
-    msg = (message or "").strip()
-    data = {}
-
-    # height/weight: "173cm 80kg" (also works with trailing garbage like "]")
-    m_h = re.search(r"(\d{3})\s*cm", msg, re.IGNORECASE)
-    m_w = re.search(r"(\d{2,3})\s*kg", msg, re.IGNORECASE)
-    if m_h:
-        data["height"] = int(m_h.group(1))
-    if m_w:
-        data["weight"] = int(m_w.group(1))
-
-    # meals: "3끼", "하루 3끼", or just "3"
-    m_meals = re.search(r"(\d)\s*끼", msg)
-    if m_meals:
-        data["meals_per_day"] = int(m_meals.group(1))
-    else:
-        if re.fullmatch(r"\s*\d\s*", msg):
-            data["meals_per_day"] = int(msg.strip())
-
-    # environment/equipment hints
-    if ("헬스장" in msg) or ("헬스" in msg) or ("짐" in msg):
-        data["environment"] = "gym"
-        data["equipment"] = "full gym equipment"
-    if "5일" in msg:
-        data["environment"] = "gym 5x/week"
-
-    goal = _normalize_goal(msg)
-    if goal:
-        data["goal"] = goal
-
-    return data
+    return classify(message).slots
 
 
 def _get_state(user_id: int):
     # 1. 항상 DB부터 읽는다
-    db_response = tool_get_user_profile(user_id=user_id)
+    try:
+        db_response = tool_get_user_profile(user_id=user_id)
+    except Exception:
+        # DB 오류 시 마지막으로 알던 대화 상태 사용
+        # (memory 백엔드에서만 유효 - sqlite 백엔드는 같은 DB 라 함께 실패한다)
+        return USER_STATE.get(user_id) or {}
 
     if db_response and db_response.get("ok") and "profile" in db_response:
         db_profile = db_response["profile"]
@@ -188,8 +162,9 @@ def _get_state(user_id: int):
         if db_profile.get("name"):
             state["name"] = db_profile["name"]
 
-        # 2. 메모리 캐시는 DB 결과로 덮어씀
-        USER_STATE[user_id] = state
+        # 2. 메모리 캐시는 DB 결과로 덮어씀 (바뀐 경우만 - sqlite 백엔드에서 매 턴 쓰기 방지)
+        if USER_STATE.get(user_id) != state:
+            USER_STATE.set(user_id, state)
         return state
 
     # 3. DB에 진짜 아무것도 없을 때만 빈 dict
@@ -204,81 +179,24 @@ def _save_to_db_best_effort(user_id: int, state: dict):
     try:
         tool_update_user_profile(user_id=user_id, **payload)
         # ✅ DB 저장 후 메모리 캐시도 최신화
-        if user_id in USER_STATE:
-            USER_STATE[user_id].update(payload)
-        else:
-            USER_STATE[user_id] = payload
+        USER_STATE.update(user_id, payload)
     except Exception:
         # DB 저장 실패해도 대화 상태는 메모리에 남는다
         pass
 
 # 사용자의 대화 의도 판단 함수
-# ai_engine.py
+# - 키워드 표/우선순위는 routes/intent_classifier.py 에 있고, 여기서는 호환용 래퍼만 둔다
 def detect_intent(message: str) -> str:
-    text = message.lower().strip()
-
-    # ✅ 내 정보 질문 (최우선)
-    if any(k in text for k in [
-        "내 키", "키는", "신장은",
-        "내 몸무게", "몸무게는", "체중은",
-        "내 이름", "이름은",
-        "내 목표", "목표는",
-        "내 칼로리", "섭취 칼로리", "섭취칼로리",
-        "단백질은", "단백질 목표",
-        "활동 소모", "운동 소모", "소모 칼로리"
-    ]):
-        return "info_request"
-
-    # 음식 영양 정보
-    if any(k in text for k in ["칼로리", "단백질"]) and "식단" not in text:
-        return "food_nutrition"
-
-    if any(k in text for k in ["포함", "넣어서", "같이", "먹을건데"]) and "식단" in text:
-        return "diet_with_food"
-
-    if any(k in text for k in ["대신", "말고", "다른"]):
-        return "diet_food_specific"
+    return classify(message).intent
 
-    if "식단" in text:
-        return "diet"
-
-    if any(k in text for k in ["운동", "루틴"]):
-        return "exercise"
-
-    return "unknown"
 
 # 사용자 질문에 대한 답변(왜 저장이 안되나? 등)
-META_INTENTS = {
-    "WHY_NOT_WORK": ["왜 안돼", "왜 안됨", "안돼?", "왜 그래"],
-    "CONFIRM_MEMORY": ["저장", "기억", "기억해", "남아있어"],
-    "CONFUSED": ["뭐야 이게", "뭔데 이거", "이상해", "왜 이래", "말이 안돼"],
-    "FOLLOW_UP": ["그럼", "그래서", "그러면"]
-}
-
 def detect_meta_intent(message: str):
-    text = message.lower().strip()
-
-    # 저장/기억은 명시적일 때만
-    if any(k in text for k in ["저장해", "기억해줘", "남겨줘"]):
-        return "CONFIRM_MEMORY"
-
-    if len(text) > 20:
-        return None
-
-    for intent, keywords in META_INTENTS.items():
-        if any(k in text for k in keywords):
-            return intent
-
-    return None
+    return classify(message).meta_intent
 
 
 def is_greeting(message: str) -> bool:
-    text = message.lower().strip()
-    greetings = [
-        "안녕", "안녕하세요", "ㅎㅇ", "하이", "hello",
-        "좋은 아침", "굿모닝", "굿이브닝", "반가워"
-    ]
-    return any(g in text for g in greetings)
+    return classify(message).greeting
 
 # 식단 부분 변경 처리 코드
 def replace_food_in_diet(diet_list, old_food, new_food, new_kcal, new_protein):
@@ -308,17 +226,27 @@ def goal_type_to_display(goal_type: str) -> str:
     }
     return mapping.get(goal_type, "유지")  # 기본은 유지
 
+_FOOD_NAME_NOISE = re.compile(r"(칼로리|단백질|알려줘|몇|이야|은|는|\?|!)")
+_FOOD_NAME_TAIL = re.compile(r"\d+.*")
+
+
 def extract_food_name(message: str) -> str:
     msg = message.lower()
-    msg = re.sub(r"(칼로리|단백질|알려줘|몇|이야|은|는|\?|!)", "", msg)
-    msg = re.sub(r"\d+.*", "", msg)  # 숫자 이후 제거
+    msg = _FOOD_NAME_NOISE.sub("", msg)
+    msg = _FOOD_NAME_TAIL.sub("", msg)  # 숫자 이후 제거
     return msg.strip()
 
 # ai_engine.py
-def generate_reply(user_id: int, message: str) -> str:
-    # ✅ 인사 처리 (최우선)
+def prepare_reply(user_id: int, message: str):
+    """
+    고정 응답이면 str, 모델 호출이 필요하면 LLMRequest 반환
+    (의도 판별/프로필 조회까지만 수행하고 모델은 호출하지 않음)
+    """
+    # 의도/메타 의도/인사 여부를 한 번에 분류
+    cls = classify(message)
+
     # ✅ 인사 처리 (최우선)
-    if is_greeting(message):
+    if cls.greeting:
         # 사용자 상태 조회
         state = _get_state(user_id)
         name = state.get("name")
@@ -331,9 +259,9 @@ def generate_reply(user_id: int, message: str) -> str:
                 "맞춤 추천을 위해 이름과 정보를 [내 정보 페이지]에 입력해 주시면 좋아요."
             )
 
-    intent = detect_intent(message)
+    intent = cls.intent
 
-    meta_intent = detect_meta_intent(message)
+    meta_intent = cls.meta_intent
 
     # ✅ META_INTENT 처리 (intent보다 우선)
     if meta_intent == "CONFIRM_MEMORY":
@@ -361,20 +289,22 @@ def generate_reply(user_id: int, message: str) -> str:
 
     # ✅ GENERAL_QUESTION 처리 (unknown fallback)
     if intent == "unknown":
-        resp = client.responses.create(
-            model=os.getenv("OPENAI_MODEL", "gpt-4.1-mini"),
+        # 일반 대화는 이전 대화(최근 N턴, 토큰 예산 내)를 함께 보낸다
+        return LLMRequest(
             input=[
                 {
                     "role": "system",
                     "content": "너는 헬스·식단 앱의 AI 비서다. 친절하고 간결하게 한국어로 답해라."
                 },
+                *_conversation_context(user_id, message),
                 {
                     "role": "user",
                     "content": message
                 }
-            ]
+            ],
+            fallback="답변을 생성하지 못했어요.",
+            intent=intent,
         )
-        return getattr(resp, "output_text", "").strip() or "답변을 생성하지 못했어요."
     
     # ✅ info_request 처리
     # info_request 처리 개선
@@ -562,13 +492,132 @@ def generate_reply(user_id: int, message: str) -> str:
         식단과 운동을 모두 표 형식으로 추천해줘.
         """
 
-    resp = client.responses.create(
-        model=os.getenv("OPENAI_MODEL", "gpt-4.1-mini"),
+    return LLMRequest(
         input=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
-        ]
+        ],
+        fallback="⚠️ 응답 생성 실패",
+        intent=intent,
     )
 
-    return getattr(resp, "output_text", "").strip() or "⚠️ 응답 생성 실패"
 
+class LLMRequest:
+    """모델 호출이 필요한 응답 (일반 호출/스트리밍 호출이 같은 입력을 공유)"""
+
+    __slots__ = ("input", "fallback", "intent")
+
+    def __init__(self, input: list, fallback: str, intent: str = None):
+        self.input = input
+        self.fallback = fallback
+        self.intent = intent
+
+    def cache_key(self):
+        """캐시 대상 의도가 아니면 None"""
+        if not llm_cache.cacheable(self.intent):
+            return None
+        return make_key(_model_name(), self.intent, self.input)
+
+
+def _model_name() -> str:
+    return os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+
+
+SUMMARY_SYSTEM_PROMPT = """
+너는 대화 요약기다.
+이전 요약과 새 대화를 합쳐, 이후 상담에 필요한 사실(목표, 선호/비선호 음식, 운동 환경,
+이미 받은 추천, 사용자가 한 약속)만 한국어 bullet 5개 이내로 요약하라.
+"""
+
+
+def _summarize_conversation(previous: str, messages: list) -> str:
+    lines = [f"[이전 요약]\n{previous or '(없음)'}", "[새 대화]"]
+    lines += [f"{m['role']}: {m['content']}" for m in messages]
+    resp = client.responses.create(
+        model=_model_name(),
+        input=[
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": "\n".join(lines)},
+        ],
+    )
+    return getattr(resp, "output_text", "").strip()
+
+
+def _conversation_context(user_id: int, message: str) -> list:
+    try:
+        return build_context(int(user_id), message, summarize=_summarize_conversation)
+    except Exception:
+        # 컨텍스트 조회 실패 시 현재 메시지만으로 응답
+        return []
+
+
+def complete(req: LLMRequest, use_cache: bool = True) -> str:
+    key = req.cache_key()
+    if key and use_cache:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return cached
+    elif key:
+        llm_cache.bypass()
+
+    # 모델 응답을 기다리는 동안 DB 연결을 붙잡지 않는다
+    release_connection()
+    resp = client.responses.create(model=_model_name(), input=req.input)
+    text = getattr(resp, "output_text", "").strip()
+    if key and text:
+        llm_cache.set(key, text, intent=req.intent)
+    return text or req.fallback
+
+
+def stream_complete(req: LLMRequest, use_cache: bool = True):
+    """모델 응답 텍스트 조각을 도착하는 대로 yield (캐시 적중 시 한 번에)"""
+    key = req.cache_key()
+    if key and use_cache:
+        cached = llm_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+    elif key:
+        llm_cache.bypass()
+
+    parts = []
+    release_connection()
+    stream = client.responses.create(model=_model_name(), input=req.input, stream=True)
+    try:
+        for event in stream:
+            if getattr(event, "type", None) == "response.output_text.delta":
+                delta = getattr(event, "delta", "")
+                if delta:
+                    parts.append(delta)
+                    yield delta
+    finally:
+        close = getattr(stream, "close", None)
+        if close:
+            close()
+
+    # 스트림이 끝까지 완료된 경우에만 저장
+    text = "".join(parts).strip()
+    if key and text:
+        llm_cache.set(key, text, intent=req.intent)
+
+
+def generate_reply(user_id: int, message: str, use_cache: bool = True) -> str:
+    plan = prepare_reply(user_id, message)
+    if isinstance(plan, LLMRequest):
+        return complete(plan, use_cache=use_cache)
+    return plan
+
+
+def stream_reply(user_id: int, message: str, use_cache: bool = True):
+    """generate_reply 의 스트리밍 버전 - 고정 응답은 한 번에 yield"""
+    plan = prepare_reply(user_id, message)
+    if not isinstance(plan, LLMRequest):
+        yield plan
+        return
+
+    produced = False
+    for delta in stream_complete(plan, use_cache=use_cache):
+        produced = True
+        yield delta
+    if not produced:
+        yield plan.fallback
@@ -4,7 +4,8 @@ from db.database import get_connection
 
 from models.user_model import get_user_by_id, update_user_profile
 from models.diet_model import get_diet_by_date
-from models.calorie_model import get_daily_summary
+from services.calorie_service import get_daily_calorie_summary
+from models.profile_snapshot import get_profile_snapshot, invalidate_profile
 
 
 def _row_to_dict(row):
@@ -21,31 +22,18 @@ def _today_str():
 
 
 def tool_get_user_profile(user_id: int):
-    row = get_user_by_id(user_id)
-    if not row:
+    snap = get_profile_snapshot(user_id)
+    if not snap:
         return {"ok": False, "error": "user not found"}
 
-    d = _row_to_dict(row)
-    return {
-        "ok": True,
-        "profile": {
-            "id": d.get("id"),
-            "email": d.get("email"),
-            "name": d.get("name"),
-            "height": d.get("height"),
-            "weight": d.get("weight"),
-            "goal": d.get("goal"),
-            "environment": d.get("environment"),  # ✅ 추가
-            "equipment": d.get("equipment"),      # ✅ 추가
-            "created_at": d.get("created_at"),
-        },
-    }
+    return {"ok": True, "profile": snap["profile"]}
 
 
 def tool_update_user_profile(user_id: int, name=None, height=None, weight=None, goal=None, environment=None, equipment=None):
     """
     채팅에서 사용자가 말한 프로필/환경/장비 정보를 DB에 저장(업데이트)
     - 사용자가 말하지 않은 값은 기존 DB 값을 유지
+    - environment/equipment 는 users 컬럼이 없어 응답에만 반영
     """
     row = get_user_by_id(user_id)
     if not row:
@@ -67,9 +55,8 @@ def tool_update_user_profile(user_id: int, name=None, height=None, weight=None,
         new_height,
         new_weight,
         new_goal,
-        new_environment,
-        new_equipment,
     )
+    invalidate_profile(user_id)
 
     return {
         "ok": True,
@@ -139,7 +126,7 @@ def tool_get_calorie_summary(user_id: int, date: str = None):
     if not date:
         date = _today_str()
 
-    row = get_daily_summary(user_id, date)
+    row = get_daily_calorie_summary(user_id, date)
     if not row:
         return {"ok": True, "date": date, "summary": None}
 
@@ -178,68 +165,9 @@ def tool_get_effective_nutrition_goal(user_id: int):
     우선순위:
     1) diet_goals (값이 있고 > 0)
     2) user_nutrition_goal
+    (프로필 스냅샷의 조인 결과를 사용)
     """
-    conn = get_connection()
-    cur = conn.cursor()
-
-    # 1️⃣ diet_goals 조회
-    cur.execute(
-        """
-        SELECT type, target_calories, target_protein, target_activity_kcal
-        FROM diet_goals
-        WHERE user_id=?
-        """,
-        (user_id,)
-    )
-    dg = cur.fetchone()
-
-    # 2️⃣ nutrition_goal 조회
-    cur.execute(
-        """
-        SELECT calories, protein, activity_kcal
-        FROM user_nutrition_goal
-        WHERE user_id=?
-        """,
-        (user_id,)
-    )
-    ng = cur.fetchone()
-
-    conn.close()
-
-    def valid(v):
-        return v is not None and v != 0
-
-    result = {
-        "type": None,
-        "calories": None,
-        "protein": None,
-        "activity_kcal": None,
-        "source": {}
-    }
-
-    if dg:
-        if valid(dg["target_calories"]):
-            result["calories"] = dg["target_calories"]
-            result["source"]["calories"] = "diet_goals"
-        if valid(dg["target_protein"]):
-            result["protein"] = dg["target_protein"]
-            result["source"]["protein"] = "diet_goals"
-        if valid(dg["target_activity_kcal"]):
-            result["activity_kcal"] = dg["target_activity_kcal"]
-            result["source"]["activity_kcal"] = "diet_goals"
-
-        if dg["type"]:
-            result["type"] = dg["type"]
-
-    if ng:
-        if result["calories"] is None and valid(ng["calories"]):
-            result["calories"] = ng["calories"]
-            result["source"]["calories"] = "nutrition_goal"
-        if result["protein"] is None and valid(ng["protein"]):
-            result["protein"] = ng["protein"]
-            result["source"]["protein"] = "nutrition_goal"
-        if result["activity_kcal"] is None and valid(ng["activity_kcal"]):
-            result["activity_kcal"] = ng["activity_kcal"]
-            result["source"]["activity_kcal"] = "nutrition_goal"
-
-    return {"ok": True, "goal": result}
+    snap = get_profile_snapshot(user_id)
+    if not snap:
+        return {"ok": True, "goal": {"type": None, "calories": None, "protein": None, "activity_kcal": None, "source": {}}}
+    return {"ok": True, "goal": snap["goal"]}
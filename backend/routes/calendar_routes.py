@@ -1,12 +1,14 @@
 from flask import Blueprint, request, jsonify
 from db.database import get_connection
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from utils.http_cache import etag_by_versions
 
 calendar_bp = Blueprint("calendar", __name__)
 
 # 캘린더 조회
 @calendar_bp.route("", methods=["GET"])
 @jwt_required()
+@etag_by_versions("diet_recommendations", "workout_recommendations")
 def get_calendar():
     user_id = get_jwt_identity()
     month = request.args.get("month")
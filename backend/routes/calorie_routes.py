@@ -1,10 +1,34 @@
+import os
+from datetime import datetime
+
 from flask import Blueprint, request, jsonify
-from services.calorie_service import compute_and_save_daily_calorie_summary
-from models.calorie_model import get_daily_summary
+from services.calorie_service import (
+    compute_and_save_daily_calorie_summary,
+    compute_calorie_summaries_range,
+    get_daily_calorie_summary,
+)
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 calorie_bp = Blueprint("calorie", __name__)
 
+CALORIE_RANGE_MAX_DAYS = int(os.getenv("CALORIE_RANGE_MAX_DAYS", "90"))
+_TRUTHY = ("1", "true", "True", "yes")
+
+
+def _pack_summary(row):
+    if not row:
+        return None
+    return {
+        "bmr": row["bmr"],
+        "tdee": row["tdee"],
+        "intake": row["intake"],
+        "exercise": row["exercise"],
+        "deficit": row["deficit"],
+        "est_weight_change_kg": row["est_weight_change_kg"],
+        "updated_at": row["updated_at"],
+    }
+
+
 # GET /api/summary/calories/<user_id>?date=YYYY-MM-DD&recalc=1
 @calorie_bp.route("/calories", methods=["GET"])
 @jwt_required()
@@ -15,23 +39,42 @@ def calories():
     if not date:
         return jsonify({"message": "date가 필요합니다."}), 400
 
-    if recalc in ("1", "true", "True", "yes"):
+    if recalc in _TRUTHY:
         row = compute_and_save_daily_calorie_summary(user_id, date)
     else:
-        row = get_daily_summary(user_id, date)
+        row = get_daily_calorie_summary(user_id, date)
 
     if not row:
         return jsonify({"date": date, "summary": None})
 
+    return jsonify({"date": date, "summary": _pack_summary(row)})
+
+
+# GET /api/summary/calories/range?start=YYYY-MM-DD&end=YYYY-MM-DD&recalc=1
+# 최대 CALORIE_RANGE_MAX_DAYS 일, 날짜마다 항목 하나 (요약이 없던 날짜는 계산해서 저장)
+@calorie_bp.route("/calories/range", methods=["GET"])
+@jwt_required()
+def calories_range():
+    user_id = get_jwt_identity()
+    start = request.args.get("start")
+    end = request.args.get("end")
+    if not start or not end:
+        return jsonify({"message": "start, end가 필요합니다."}), 400
+
+    try:
+        start_d = datetime.strptime(start, "%Y-%m-%d").date()
+        end_d = datetime.strptime(end, "%Y-%m-%d").date()
+    except ValueError:
+        return jsonify({"message": "날짜 형식은 YYYY-MM-DD 입니다."}), 400
+    if end_d < start_d:
+        return jsonify({"message": "end는 start 이후여야 합니다."}), 400
+    if (end_d - start_d).days + 1 > CALORIE_RANGE_MAX_DAYS:
+        return jsonify({"message": f"최대 {CALORIE_RANGE_MAX_DAYS}일까지 조회할 수 있습니다."}), 400
+
+    recalc = request.args.get("recalc") in _TRUTHY
+    rows = compute_calorie_summaries_range(user_id, start, end, recalc=recalc)
     return jsonify({
-        "date": date,
-        "summary": {
-            "bmr": row["bmr"],
-            "tdee": row["tdee"],
-            "intake": row["intake"],
-            "exercise": row["exercise"],
-            "deficit": row["deficit"],
-            "est_weight_change_kg": row["est_weight_change_kg"],
-            "updated_at": row["updated_at"],
-        }
+        "start": start,
+        "end": end,
+        "items": [{"date": d, "summary": _pack_summary(r)} for d, r in rows],
     })
@@ -1,8 +1,11 @@
-from flask import Blueprint, request, jsonify
+import os
+
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from db.database import get_connection
-from models.chatbot_model import log_message, list_logs, clear_logs
+from models.chatbot_model import list_logs, iter_logs, clear_logs
+from services.log_writer import chat_log_writer
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from routes.ai_engine import generate_reply
+from services.chat_service import reply_once, stream_events, submit_job, get_job
 
 chatbot_bp = Blueprint("chatbot", __name__)
 
@@ -14,7 +17,7 @@ chatbot_bp = Blueprint("chatbot", __name__)
 @jwt_required()
 def chat():
     data = request.get_json() or {}
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     message = (data.get("message") or "").strip()
 
     if not message:
@@ -22,46 +25,128 @@ def chat():
 
     # 1) 유저 메시지 저장
     try:
-        log_message(int(user_id), "user", message)
+        chat_log_writer.submit(user_id, "user", message)
     except Exception:
         # 저장 실패해도 챗봇 응답은 계속
         pass
 
-    # 2) AI 응답 생성 (🔥 핵심 변경)
-    try:
-        reply = generate_reply(user_id, message)
-    except Exception as e:
-        reply = f"⚠️ AI 처리 중 오류가 발생했습니다.\n{str(e)}"
+    # 응답 캐시 우회: {"no_cache": true} 또는 Cache-Control: no-cache
+    use_cache = not _no_cache(data)
 
-    # 3) 어시스턴트 메시지 저장
-    try:
-        log_message(user_id, "assistant", reply)
-    except Exception:
-        pass
+    # 2) 스트리밍 요청: SSE로 토큰을 도착하는 대로 전달 (로그는 생성 완료 후 저장)
+    if _wants_stream(data):
+        resp = Response(stream_events(user_id, message, use_cache), mimetype="text/event-stream")
+        resp.headers["Cache-Control"] = "no-cache"
+        resp.headers["X-Accel-Buffering"] = "no"
+        return resp
+
+    # 3) 비동기 요청: 작업 id만 반환, 결과는 GET /api/ai/chat/jobs/<id>
+    if data.get("async"):
+        job_id = submit_job(user_id, message, use_cache)
+        return jsonify({"job_id": job_id, "status": "pending"}), 202
 
+    # 4) 기존 동기 응답 (응답 생성 + 어시스턴트 메시지 저장)
+    reply = reply_once(user_id, message, use_cache)
     return jsonify({"reply": reply})
 
+
+def _no_cache(data: dict) -> bool:
+    if data.get("no_cache"):
+        return True
+    return "no-cache" in (request.headers.get("Cache-Control") or "")
+
+
+def _wants_stream(data: dict) -> bool:
+    if data.get("stream") or request.args.get("stream") == "1":
+        return True
+    return "text/event-stream" in (request.headers.get("Accept") or "")
+
+
+# ===============================
+# 비동기 챗봇 응답 조회
+# GET /api/ai/chat/jobs/<job_id>
+# ===============================
+@chatbot_bp.route("/chat/jobs/<job_id>", methods=["GET"])
+@jwt_required()
+def get_chat_job(job_id):
+    user_id = int(get_jwt_identity())
+    job = get_job(user_id, job_id)
+    if job is None:
+        return jsonify({"message": "작업을 찾을 수 없습니다."}), 404
+    return jsonify(job)
+
 # ===============================
-# 챗봇 로그 조회
-# GET /api/ai/logs/<user_id>?limit=50&date=YYYY-MM-DD
+# 챗봇 로그 조회 (키셋 페이지네이션)
+# GET /api/ai/logs?limit=50&date=YYYY-MM-DD&before_id=&after_id=
+#  - 처음: 최신 limit 개 → 더 이전은 before_id=<next_before_id>
+#  - 새 메시지 이어 받기: after_id=<마지막 id>
 # ===============================
+CHAT_LOGS_MAX_PAGE = int(os.getenv("CHAT_LOGS_MAX_PAGE", "200"))
+CHAT_LOGS_EXPORT_CHUNK = int(os.getenv("CHAT_LOGS_EXPORT_CHUNK", "500"))
+
+
+def _log_item(r) -> dict:
+    return {
+        "id": r["id"],
+        "role": r["role"],
+        "message": r["message"],
+        "created_at": r["created_at"],
+    }
+
+
 @chatbot_bp.route("/logs", methods=["GET"])
 @jwt_required()
 def get_logs():
     user_id = get_jwt_identity()
     limit = request.args.get("limit", default=50, type=int)
     date = request.args.get("date")
-    rows = list_logs(user_id, limit=limit, date=date)
-    items = [
-        {
-            "id": r["id"],
-            "role": r["role"],
-            "message": r["message"],
-            "created_at": r["created_at"],
-        }
-        for r in rows
-    ]
-    return jsonify({"items": items})
+    before_id = request.args.get("before_id", type=int)
+    after_id = request.args.get("after_id", type=int)
+
+    if before_id is not None and after_id is not None:
+        return jsonify({"message": "before_id 와 after_id 는 함께 쓸 수 없습니다."}), 400
+    limit = max(1, min(limit, CHAT_LOGS_MAX_PAGE))
+
+    # 아직 버퍼에 있는 로그까지 보이도록 먼저 기록
+    chat_log_writer.flush()
+    # 한 개 더 읽어 다음 페이지 존재 여부를 판단
+    rows = list_logs(user_id, limit=limit + 1, date=date, before_id=before_id, after_id=after_id)
+    has_more = len(rows) > limit
+    if has_more:
+        # after_id 는 오래된 순으로 읽으므로 뒤쪽, 나머지는 앞쪽이 남는 한 개
+        rows = rows[:limit] if after_id is not None else rows[1:]
+
+    items = [_log_item(r) for r in rows]
+    return jsonify({
+        "items": items,
+        "has_more": has_more,
+        "next_before_id": items[0]["id"] if items else before_id,
+        "next_after_id": items[-1]["id"] if items else after_id,
+    })
+
+# ===============================
+# 챗봇 로그 내보내기 (전체, 스트리밍 JSON)
+# GET /api/ai/logs/export?date=YYYY-MM-DD
+# ===============================
+@chatbot_bp.route("/logs/export", methods=["GET"])
+@jwt_required()
+def export_logs():
+    user_id = get_jwt_identity()
+    date = request.args.get("date")
+    chat_log_writer.flush()
+
+    def generate():
+        # 전체를 메모리에 올리지 않고 청크 단위로 읽어 바로 내보낸다
+        yield '{"items": ['
+        first = True
+        for r in iter_logs(user_id, date=date, chunk_size=CHAT_LOGS_EXPORT_CHUNK):
+            yield ("" if first else ",") + current_app.json.dumps(_log_item(r))
+            first = False
+        yield "]}"
+
+    resp = Response(stream_with_context(generate()), mimetype="application/json")
+    resp.headers["Content-Disposition"] = "attachment; filename=chat_logs.json"
+    return resp
 
 # ===============================
 # 챗봇 로그 전체 삭제
@@ -71,6 +156,7 @@ def get_logs():
 @jwt_required()
 def delete_logs():
     user_id = get_jwt_identity()
+    chat_log_writer.flush()
     cnt = clear_logs(user_id)
     return jsonify({"message": "삭제되었습니다.", "deleted": cnt})
 
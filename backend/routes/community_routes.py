@@ -50,48 +50,7 @@ def admin_required(fn):
 community_bp = Blueprint("community", __name__)
 
 
-def init_community_tables():
-    """커뮤니티(공지, 문의)용 테이블 생성"""
-    conn = get_connection()
-    cur = conn.cursor()
-
-    # 공지사항 테이블
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS notices (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            content TEXT NOT NULL,
-            created_at TEXT NOT NULL,
-            view_count INTEGER DEFAULT 0
-        )
-        """
-    )
-
-    # 문의 테이블
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS inquiries (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            title TEXT NOT NULL,
-            content TEXT NOT NULL,
-            status TEXT DEFAULT '답변대기',
-            answer TEXT,
-            created_at TEXT NOT NULL,
-            answered_at TEXT,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-        """
-    )
-
-    conn.commit()
-    conn.close()
-
-
-# 모듈 로드 시 테이블 초기화
-init_community_tables()
-
+# 공지/문의 테이블은 db.database.init_db()에서 생성
 
 # --------------------------
 # 공지사항 API
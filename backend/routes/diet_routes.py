@@ -3,6 +3,8 @@ from datetime import datetime, timedelta, date
 from db.database import get_connection
 from services.calorie_service import compute_and_save_daily_calorie_summary
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from utils.http_cache import etag_by_versions
+from models.profile_snapshot import invalidate_profile
 from routes.user_routes import calculate_nutrition_goal
 
 
@@ -256,6 +258,7 @@ def upsert_diet_goal():
     )
     conn.commit()
     conn.close()
+    invalidate_profile(user_id)
 
     # -----------------------------
     # 5️⃣ 진행률 계산
@@ -461,6 +464,7 @@ def delete_diet_log(log_id):
 # 오늘의 식단 조회 - 2025.12.31 추가 라우트
 @diet_bp.route("/today", methods=["GET"])
 @jwt_required()
+@etag_by_versions("today_meals", "today_meal_items")
 def get_today_meal():
     user_id = get_jwt_identity()
     today = request.args.get("date") or date.today().isoformat()
@@ -479,7 +483,7 @@ def get_today_meal():
         cur.execute(
             """
             INSERT INTO today_meals (user_id, date, created_at)
-            VALUES (?, ?)
+            VALUES (?, ?, ?)
             """,
             (user_id, today, now),
         )
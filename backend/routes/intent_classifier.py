@@ -0,0 +1,208 @@
+"""
+챗봇 의도 분류기 (키워드 표를 모듈 로드 시 한 번만 컴파일)
+
+- 모든 키워드 표를 하나의 정규식으로 합쳐 메시지를 한 번만 훑는다
+  · 각 위치에서 가장 긴 키워드만 잡히므로, 그 키워드에 포함된 짧은 키워드의
+    태그도 미리 합쳐 둔다 → `any(k in text for k in 표)` 와 같은 결과
+- 우선순위 규칙은 기존 detect_intent / detect_meta_intent 순서를 그대로 따른다
+- 키/몸무게/끼니 등 슬롯도 미리 컴파일한 정규식으로 같이 뽑는다
+"""
+import re
+from collections import namedtuple
+
+# ===============================
+# 키워드 표 (태그 → 키워드)
+# ===============================
+KEYWORDS = {
+    # detect_intent
+    "info": [
+        "내 키", "키는", "신장은",
+        "내 몸무게", "몸무게는", "체중은",
+        "내 이름", "이름은",
+        "내 목표", "목표는",
+        "내 칼로리", "섭취 칼로리", "섭취칼로리",
+        "단백질은", "단백질 목표",
+        "활동 소모", "운동 소모", "소모 칼로리",
+    ],
+    "nutrient": ["칼로리", "단백질"],
+    "with_food": ["포함", "넣어서", "같이", "먹을건데"],
+    "replace": ["대신", "말고", "다른"],
+    "diet_word": ["식단"],
+    "exercise": ["운동", "루틴"],
+
+    # detect_meta_intent
+    "meta_explicit_save": ["저장해", "기억해줘", "남겨줘"],
+    "meta_WHY_NOT_WORK": ["왜 안돼", "왜 안됨", "안돼?", "왜 그래"],
+    "meta_CONFIRM_MEMORY": ["저장", "기억", "기억해", "남아있어"],
+    "meta_CONFUSED": ["뭐야 이게", "뭔데 이거", "이상해", "왜 이래", "말이 안돼"],
+    "meta_FOLLOW_UP": ["그럼", "그래서", "그러면"],
+
+    # is_greeting
+    "greeting": [
+        "안녕", "안녕하세요", "ㅎㅇ", "하이", "hello",
+        "좋은 아침", "굿모닝", "굿이브닝", "반가워",
+    ],
+
+    # _normalize_goal
+    "goal_fat": ["체지방"],
+    "goal_muscle": ["근육"],
+    "goal_loss": ["감량"],
+    "goal_recomp": ["리컴"],
+    "goal_diet": ["다이어트"],
+    "goal_gain": ["근대비", "증량", "벌크"],
+
+    # extract_from_message (환경)
+    "env_gym": ["헬스장", "헬스", "짐"],
+    "env_5days": ["5일"],
+}
+
+# detect_meta_intent 의 META_INTENTS 순서
+META_ORDER = ("WHY_NOT_WORK", "CONFIRM_MEMORY", "CONFUSED", "FOLLOW_UP")
+
+# 이 길이를 넘는 문장은 명시적 저장 요청만 메타 의도로 본다
+META_MAX_LEN = 20
+
+
+def _compile(tables: dict):
+    kw_tags = {}
+    for tag, words in tables.items():
+        for w in words:
+            kw_tags.setdefault(w.lower(), set()).add(tag)
+
+    # 긴 키워드가 잡히면 그 안에 들어 있는 짧은 키워드의 태그도 함께
+    closure = {}
+    for kw in kw_tags:
+        tags = set()
+        for other, other_tags in kw_tags.items():
+            if other in kw:
+                tags |= other_tags
+        closure[kw] = frozenset(tags)
+
+    # 전방탐색으로 모든 시작 위치에서 겹치는 매치까지 찾는다
+    return re.compile(f"(?=({_trie_pattern(kw_tags)}))"), closure
+
+
+def _trie_pattern(words) -> str:
+    """
+    키워드 목록 → 접두사를 공유하는 정규식 ("안녕(?:하세요)?" 형태)
+    각 분기는 첫 글자가 모두 달라 되돌아가기가 거의 없고, 항상 가장 긴 키워드가 잡힌다
+    """
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+_SCAN, _TAGS = _compile(KEYWORDS)
+
+_SLOT_HEIGHT = re.compile(r"(\d{3})\s*cm", re.IGNORECASE)
+_SLOT_WEIGHT = re.compile(r"(\d{2,3})\s*kg", re.IGNORECASE)
+_SLOT_MEALS = re.compile(r"(\d)\s*끼")
+_SLOT_MEALS_ONLY = re.compile(r"\s*\d\s*")
+_HAS_DIGIT = re.compile(r"\d")
+
+
+Classification = namedtuple("Classification", ["intent", "meta_intent", "greeting", "goal", "slots", "tags"])
+
+
+def scan(text: str) -> frozenset:
+    """text 에 등장하는 키워드 표 태그 집합 (text 는 이미 소문자/strip 된 상태)"""
+    tags = set()
+    for m in _SCAN.finditer(text):
+        tags |= _TAGS[m.group(1)]
+    return frozenset(tags)
+
+
+def intent_from_tags(tags) -> str:
+    if "info" in tags:
+        return "info_request"
+    if "nutrient" in tags and "diet_word" not in tags:
+        return "food_nutrition"
+    if "with_food" in tags and "diet_word" in tags:
+        return "diet_with_food"
+    if "replace" in tags:
+        return "diet_food_specific"
+    if "diet_word" in tags:
+        return "diet"
+    if "exercise" in tags:
+        return "exercise"
+    return "unknown"
+
+
+def meta_from_tags(tags, text_len: int):
+    if "meta_explicit_save" in tags:
+        return "CONFIRM_MEMORY"
+    if text_len > META_MAX_LEN:
+        return None
+    for name in META_ORDER:
+        if f"meta_{name}" in tags:
+            return name
+    return None
+
+
+def goal_from_tags(tags):
+    if ("goal_fat" in tags and "goal_muscle" in tags) or ("goal_loss" in tags and "goal_muscle" in tags) or ("goal_recomp" in tags):
+        return "recomposition"
+    if tags & {"goal_loss", "goal_fat", "goal_diet"}:
+        return "fat_loss"
+    if tags & {"goal_muscle", "goal_gain"}:
+        return "muscle_gain"
+    return None
+
+
+def extract_slots(msg: str, tags, goal) -> dict:
+    data = {}
+
+    # 숫자 슬롯은 숫자가 있을 때만 검사
+    if _HAS_DIGIT.search(msg):
+        m_h = _SLOT_HEIGHT.search(msg)
+        m_w = _SLOT_WEIGHT.search(msg)
+        if m_h:
+            data["height"] = int(m_h.group(1))
+        if m_w:
+            data["weight"] = int(m_w.group(1))
+
+        m_meals = _SLOT_MEALS.search(msg)
+        if m_meals:
+            data["meals_per_day"] = int(m_meals.group(1))
+        elif _SLOT_MEALS_ONLY.fullmatch(msg):
+            data["meals_per_day"] = int(msg.strip())
+
+    if "env_gym" in tags:
+        data["environment"] = "gym"
+        data["equipment"] = "full gym equipment"
+    if "env_5days" in tags:
+        data["environment"] = "gym 5x/week"
+
+    if goal:
+        data["goal"] = goal
+    return data
+
+
+def classify(message: str) -> Classification:
+    """의도 / 메타 의도 / 인사 여부 / 목표 / 슬롯을 한 번에 계산"""
+    raw = (message or "").strip()
+    text = raw.lower()
+    tags = scan(text)
+    goal = goal_from_tags(tags)
+    return Classification(
+        intent=intent_from_tags(tags),
+        meta_intent=meta_from_tags(tags, len(text)),
+        greeting="greeting" in tags,
+        goal=goal,
+        slots=extract_slots(raw, tags, goal),
+        tags=tags,
+    )
@@ -1,12 +1,12 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 
-from services.planning_service import regenerate_daily_plan
-from services.calorie_service import compute_and_save_daily_calorie_summary
+from services.planning_service import regenerate_daily_plan, regenerate_week_plan
+from services.calorie_service import compute_and_save_daily_calorie_summary, get_daily_calorie_summary
 from models.recommendation_model import list_recommendations, confirm_recommendations
-from models.calorie_model import get_daily_summary
 from db.database import get_connection
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from utils.http_cache import etag_by_versions
 from datetime import timedelta
 
 plan_bp = Blueprint("plan", __name__)
@@ -39,29 +39,24 @@ def get_week_plan():
     base = _to_date(start) if start else today
     week_start = _monday_of(base)
 
-    days = []
-    for i in range(7):
-        d = (week_start + timedelta(days=i)).isoformat()
-        if force:
-            # 프론트에서 week 재생성 시에도 날짜별로 다른 조합이 나오도록 nonce를 섞어줌
-            nonce = request.args.get("nonce")
-            rec = regenerate_daily_plan(int(user_id), d, progress=70, nonce=nonce or f"week-{d}")
-        else:
-            rec = list_recommendations(int(user_id), d, include_confirmed=True)
-            diets = rec.get("diets", []) if rec else []
-            workouts = rec.get("workouts", []) if rec else []
-            if len(diets) == 0 and len(workouts) == 0:
-                nonce = request.args.get("nonce")
-                rec = regenerate_daily_plan(int(user_id), d, progress=70, nonce=nonce or f"week-{d}")
-
-        days.append({
-            "date": d,
-            "recommendations": _pack_recs(rec),
-        })
+    # 7일을 한 번에 계획 (범위 조회 2번 + 일괄 저장 1번)
+    week, timing = regenerate_week_plan(
+        user_id,
+        week_start.isoformat(),
+        force=force,
+        progress=70,
+        nonce=request.args.get("nonce"),
+    )
+
+    days = [
+        {"date": d, "recommendations": _pack_recs(rec)}
+        for d, rec in week.items()
+    ]
 
     return jsonify({
         "start": week_start.isoformat(),
         "days": days,
+        "timing": timing,
     })
 
 # POST /api/plan/generate  {userId, date, progress?}
@@ -93,6 +88,7 @@ def generate_plan():
 # GET /api/plan/<user_id>?date=YYYY-MM-DD
 @plan_bp.route("/me", methods=["GET"])
 @jwt_required()
+@etag_by_versions("diet_recommendations", "workout_recommendations", "calorie_summaries")
 def get_plan():
     user_id = get_jwt_identity()
     date = request.args.get("date")
@@ -100,7 +96,7 @@ def get_plan():
         return jsonify({"message": "date가 필요합니다."}), 400
 
     rec = list_recommendations(user_id, date, include_confirmed=True)
-    cal = get_daily_summary(user_id, date)
+    cal = get_daily_calorie_summary(user_id, date)
 
     return jsonify({
         "date": date,
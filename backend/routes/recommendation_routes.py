@@ -2,44 +2,10 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime
 from db.database import get_connection
 from flask_jwt_extended import jwt_required, get_jwt_identity
-import csv
-import os
+from models.food_catalog import get_food_catalog
 
 recommendation_bp = Blueprint("recommendation", __name__)
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-FOOD_CSV_PATH = os.path.join(BASE_DIR, "data", "food.csv")
-FOOD_MEAL_TYPES_PATH = os.path.join(BASE_DIR, "data", "food_meal_type.csv")
-
-def load_food_csv():
-    # food 정보
-    food_map = {}
-    with open(FOOD_CSV_PATH, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            food_map[int(row["id"])] = {
-                "name": row["name"],
-                "calories": int(row["calories"]),
-                "protein": int(row["protein"]),
-                "carbs": int(row["carbs"]),
-                "fat": int(row["fat"]),
-                "allergy": row.get("allergy"),
-                "meal_types": []  # 나중에 채워줄 곳
-            }
-
-    # meal_type 정보
-    with open(FOOD_MEAL_TYPES_PATH, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            food_id = int(row["food_id"])
-            meal_type = row["meal_type"]
-            if food_id in food_map:
-                food_map[food_id]["meal_types"].append(meal_type)
-
-    return food_map
-
-FOOD_MAP = load_food_csv()
-
 # 식단 추천
 @recommendation_bp.route("/diet", methods=["POST"])
 @jwt_required()
@@ -52,11 +18,12 @@ def recommend_diet():
     conn = get_connection()
     cur = conn.cursor()
     now = datetime.utcnow().isoformat()
+    catalog = get_food_catalog()
 
     for meal in meals:
         menu_name = meal.get("menu")
 
-        food = next((f for f in FOOD_MAP.values() if f["name"] == menu_name), None)
+        food = catalog.by_name.get(menu_name)
         calories = food["calories"] if food else meal.get("calories", 0)
         protein = food["protein"] if food else 0
 
@@ -5,6 +5,7 @@ from db.database import get_connection
 from services.planning_service import regenerate_daily_plan
 from services.calorie_service import compute_and_save_daily_calorie_summary
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from utils.http_cache import etag_by_versions
 from flask_cors import cross_origin
 
 schedule_bp = Blueprint('schedule', __name__)
@@ -247,6 +248,7 @@ def list_schedule():
 # GET /api/schedule/month/<user_id>?month=YYYY-MM
 @schedule_bp.route('/month', methods=['GET'])
 @jwt_required()
+@etag_by_versions("schedules")
 def list_month():
     user_id = get_jwt_identity()
     month = request.args.get("month")
@@ -2,6 +2,8 @@ from flask import Blueprint, jsonify, request
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 from db.database import get_connection
+from models.profile_snapshot import invalidate_profile
+from utils.nutrition_math import calc_nutrition_goal
 from flask_jwt_extended import (jwt_required, get_jwt_identity, create_access_token, create_refresh_token)
 from datetime import timedelta
 
@@ -141,59 +143,16 @@ def get_my_info():
 
 # user_nutrition_goal 테이블 계산을 위한 계산 함수 - 26.01.09 수정
 def calculate_nutrition_goal(user):
+    """users 행 → (calories, protein, activity_kcal) (식은 utils/nutrition_math.py)"""
     user = dict(user)
-    weight = user.get("weight")
-    height = user.get("height")
-    age = user.get("age")          # 없을 수 있음
-    sex = user.get("sex", "male")
-    activity_level = user.get("activity_level", "low")
-    goal = user.get("goal", "maintain")
-
-    if not weight or not height:
-        raise ValueError("weight와 height는 필수입니다.")
-
-    # -------------------------
-    # BMR 계산
-    # -------------------------
-    # age 없을 경우 기본값 적용 (서비스 안정성용)
-    if not age:
-        age = 30
-
-    if sex in ("male", "M", "남"):
-        bmr = 10 * weight + 6.25 * height - 5 * age + 5
-    else:
-        bmr = 10 * weight + 6.25 * height - 5 * age - 161
-
-    # -------------------------
-    # 활동 계수
-    # -------------------------
-    activity_factor = {
-        "low": 1.2,
-        "medium": 1.55,
-        "high": 1.75
-    }.get(activity_level, 1.2)
-
-    tdee = bmr * activity_factor
-
-    # -------------------------
-    # 목표별 분기
-    # -------------------------
-    if goal in ("감량", "loss"):
-        calories = int(tdee - 400)
-        protein = int(weight * 2.0)
-        activity_kcal = 500
-
-    elif goal in ("증량", "gain"):
-        calories = int(tdee + 300)
-        protein = int(weight * 2.0)
-        activity_kcal = 300
-
-    else:  # 유지 / maintain
-        calories = int(tdee)
-        protein = int(weight * 1.6)
-        activity_kcal = 400
-
-    return calories, protein, activity_kcal
+    return calc_nutrition_goal(
+        user.get("weight"),
+        user.get("height"),
+        user.get("age"),
+        user.get("sex"),
+        user.get("activity_level"),
+        user.get("goal"),
+    )
 
 
 # 내 정보 수정 - diet_goals 반영 및 섭취 칼로리/단백질 계산 자동 업데이트
@@ -288,6 +247,7 @@ def update_my_info():
 
     conn.commit()
     conn.close()
+    invalidate_profile(user_id)
 
     return jsonify({"message": "내 정보 및 권장량이 저장되었습니다."})
 
@@ -1,52 +1,27 @@
-from flask import Blueprint, jsonify
+import os
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from utils.http_cache import etag_by_versions
 from datetime import datetime, timedelta
 from db.database import get_connection
+from services.stats_service import (
+    BUCKETS,
+    METRICS,
+    PERIOD_DAYS,
+    count_buckets,
+    daily_series,
+    iter_trend,
+    lttb,
+)
 
 stats_bp = Blueprint("stats", __name__)
 
-@stats_bp.route("/weekly/weight", methods=["GET"])
-@jwt_required()
-def get_weekly_weight():
-    user_id = get_jwt_identity()
-
-    start_date = (datetime.now() - timedelta(days=6)).strftime("%Y-%m-%d")
-
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("""
-        SELECT recorded_at, weight
-        FROM weights
-        WHERE user_id = ?
-          AND recorded_at >= ?
-        ORDER BY recorded_at ASC
-    """, (user_id, start_date))
-
-    rows = cur.fetchall()
-    conn.close()
-
-    return jsonify([
-        {
-            "date": row["recorded_at"],
-            "value": row["weight"]
-        }
-        for row in rows
-    ])
-
 @stats_bp.route("/weight/today", methods=["POST"])
 @jwt_required()
 def upsert_today_weight():
-    print("🔥🔥🔥 WEIGHT ROUTE HIT 🔥🔥🔥")
-
-    identity = get_jwt_identity()
-    print("JWT IDENTITY:", identity, type(identity))
-
-    data = request.get_json()
-    print("REQUEST DATA:", data)
-    
     user_id = get_jwt_identity()
-    data = request.get_json()
+    data = request.get_json() or {}
 
     weight = data.get("weight")
     if weight is None:
@@ -88,69 +63,85 @@ def upsert_today_weight():
         "weight": weight
     })
 
-@stats_bp.route("/weekly/activity", methods=["GET"])
+# ===============================
+# 임의 기간 / 해상도 추세
+# GET /api/stats/trend?metric=weight&start=YYYY-MM-DD&end=YYYY-MM-DD&bucket=day|week|month&max_points=500
+#  - 롤업(user_daily_stats)을 SQL GROUP BY 로 버킷 집계 (합계 지표는 빈 버킷 0, weight 는 평균)
+#  - 점 개수가 max_points 를 넘으면 LTTB 로 다운샘플링 (max_points=0 이면 원본)
+#  - 원본이 TREND_STREAM_POINTS 점을 넘거나 stream=1 이면 JSON 을 스트리밍
+# ===============================
+TREND_MAX_DAYS = int(os.getenv("TREND_MAX_DAYS", "3660"))
+TREND_DEFAULT_DAYS = 30
+TREND_DEFAULT_POINTS = int(os.getenv("TREND_DEFAULT_POINTS", "500"))
+TREND_MAX_POINTS = int(os.getenv("TREND_MAX_POINTS", "5000"))
+TREND_STREAM_POINTS = int(os.getenv("TREND_STREAM_POINTS", "2000"))
+
+
+@stats_bp.route("/trend", methods=["GET"])
 @jwt_required()
-def get_weekly_activity():
+@etag_by_versions("user_daily_stats")
+def get_trend_range():
     user_id = get_jwt_identity()
-
-    start_date = (datetime.now() - timedelta(days=6)).strftime("%Y-%m-%d")
-
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("""
-        SELECT completed_at, SUM(duration) as total_minutes
-        FROM activities
-        WHERE user_id = ?
-          AND completed_at >= ?
-        GROUP BY completed_at
-        ORDER BY completed_at ASC
-    """, (user_id, start_date))
-
-    rows = cur.fetchall()
-    conn.close()
-
-    return jsonify([
-        {
-            "date": row["completed_at"],
-            "value": row["total_minutes"] or 0
-        }
-        for row in rows
-    ])
-
-@stats_bp.route("/weekly/calories", methods=["GET"])
+    metric = request.args.get("metric")
+    bucket = request.args.get("bucket", "day")
+    if metric not in METRICS:
+        return jsonify({"msg": f"metric 은 {', '.join(METRICS)} 중 하나입니다."}), 400
+    if bucket not in BUCKETS:
+        return jsonify({"msg": f"bucket 은 {', '.join(BUCKETS)} 중 하나입니다."}), 400
+
+    try:
+        end = datetime.strptime(request.args["end"], "%Y-%m-%d").date() if request.args.get("end") else datetime.now().date()
+        start = (
+            datetime.strptime(request.args["start"], "%Y-%m-%d").date()
+            if request.args.get("start") else end - timedelta(days=TREND_DEFAULT_DAYS - 1)
+        )
+    except ValueError:
+        return jsonify({"msg": "날짜 형식은 YYYY-MM-DD 입니다."}), 400
+    if end < start:
+        return jsonify({"msg": "end는 start 이후여야 합니다."}), 400
+    if (end - start).days + 1 > TREND_MAX_DAYS:
+        return jsonify({"msg": f"최대 {TREND_MAX_DAYS}일까지 조회할 수 있습니다."}), 400
+
+    max_points = request.args.get("max_points", default=TREND_DEFAULT_POINTS, type=int)
+    max_points = max(0, min(max_points, TREND_MAX_POINTS))
+
+    meta = {"metric": metric, "bucket": bucket, "start": start.isoformat(), "end": end.isoformat()}
+    points = iter_trend(user_id, metric, start, end, bucket)
+    expected = count_buckets(start, end, bucket)
+
+    # 다운샘플링이 필요하면 전체를 모은 뒤 줄인다 (weight 는 기록한 날만이라 개수를 미리 알 수 없음)
+    if max_points and (expected > max_points or metric == "weight"):
+        points = list(points)
+        downsampled = len(points) > max_points
+        if downsampled:
+            points = lttb(points, max_points)
+        return jsonify({**meta, "downsampled": downsampled, "points": points})
+
+    if request.args.get("stream") == "1" or expected > TREND_STREAM_POINTS:
+        def generate():
+            yield current_app.json.dumps({**meta, "downsampled": False})[:-1] + ',"points":['
+            first = True
+            for p in points:
+                yield ("" if first else ",") + current_app.json.dumps(p)
+                first = False
+            yield "]}"
+
+        return Response(stream_with_context(generate()), mimetype="application/json")
+
+    return jsonify({**meta, "downsampled": False, "points": list(points)})
+
+
+# ===============================
+# 기간별 추세 (일 단위)
+# GET /api/stats/<weekly|monthly|yearly>/<calories|protein|activity|burned|weight>
+#  - 최근 7 / 30 / 365일, [{date, value}]
+#  - 합계 지표는 기록이 없는 날을 0 으로 채움, weight 는 기록한 날만
+# ===============================
+@stats_bp.route("/<period>/<metric>", methods=["GET"])
 @jwt_required()
-def get_weekly_calories():
+@etag_by_versions("user_daily_stats")
+def get_trend(period, metric):
     user_id = get_jwt_identity()
-    start_date = (datetime.now() - timedelta(days=6)).strftime("%Y-%m-%d")
-
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("""
-        SELECT
-            tm.date,
-            COALESCE(SUM(tmi.calories), 0) AS total_calories
-        FROM today_meals tm
-        LEFT JOIN today_meal_items tmi
-            ON tm.id = tmi.today_meal_id
-        WHERE tm.user_id = ?
-          AND tm.date >= ?
-        GROUP BY tm.date
-        ORDER BY tm.date ASC
-    """, (user_id, start_date))
-
-    rows = {row["date"]: row["total_calories"] for row in cur.fetchall()}
-
-    # 날짜 보정 (7일 꽉 채우기)
-    result = []
-    for i in range(7):
-        d = (datetime.now() - timedelta(days=6 - i)).strftime("%Y-%m-%d")
-        result.append({
-            "date": d,
-            "value": rows.get(d, 0)
-        })
-
-    conn.close()
-    return jsonify(result)
-
+    if period not in PERIOD_DAYS or metric not in METRICS:
+        return jsonify({"msg": "지원하지 않는 기간/지표입니다."}), 404
+    return jsonify(daily_series(user_id, metric, PERIOD_DAYS[period]))
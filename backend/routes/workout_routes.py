@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify
-from services.workout_service import get_all_workouts
+from services.workout_service import get_all_workouts, workouts_version
+from utils.http_cache import etag_static
 
 workout_bp = Blueprint("workouts", __name__)
 
 @workout_bp.route("/workouts", methods=["GET"])
+@etag_static(workouts_version())
 def get_workouts():
     level = request.args.get("level") # 'beginner', 'intermediate', 'advanced'
     all_workouts = get_all_workouts() # This will come from a service/data source
@@ -1,96 +1,131 @@
 from __future__ import annotations
-from db.database import get_connection
-from models.calorie_model import upsert_daily_summary, get_daily_summary
-# from services.workout_service import get_workout_calories_map # 제거: 새로 임포트
-
-# 기본 활동계수
-_ACTIVITY = {
-    "sedentary": 1.2,
-    "light": 1.375,
-    "moderate": 1.55,
-    "active": 1.725,
-    "very_active": 1.9,
-}
-
-def _calc_bmr(weight_kg: float | None, height_cm: float | None, age: int | None, sex: str | None) -> float:
-    """
-    Mifflin-St Jeor (추정)
-    sex: 'male' | 'female' | None
-    """
-    if not weight_kg or not height_cm:
-        return 0.0
+import sys
+import time
+from datetime import datetime, timedelta
 
-    age = age if (age and age > 0) else 25
-    sex = (sex or "").lower()
+from db.database import get_connection
+from db.migrations import CALORIE_COMPONENTS
+from models.calorie_model import (
+    update_summary_energy,
+    update_user_energy,
+    get_daily_summary,
+    rebuild_summaries,
+    list_summary_users,
+    list_summaries_in_range,
+    sum_components_in_range,
+    upsert_summaries_bulk,
+)
+from utils.nutrition_math import activity_factor, calc_bmr
+
+
+def _user_energy(user_id: int):
+    """(bmr, tdee) - 사용자 프로필 기준"""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT height, weight, age, sex, activity_level FROM users WHERE id=?", (user_id,))
+    u = cur.fetchone()
+    conn.close()
 
-    s = 5 if sex == "male" else (-161 if sex == "female" else -78)  # 모르면 중간값
-    return 10 * float(weight_kg) + 6.25 * float(height_cm) - 5 * float(age) + s
+    if not u:
+        return 0.0, 0.0
+    bmr = calc_bmr(u["weight"], u["height"], u["age"], u["sex"])
+    tdee = bmr * activity_factor(u["activity_level"])
+    return round(bmr, 2), round(tdee, 2)
 
 def compute_and_save_daily_calorie_summary(user_id: int, date: str):
     """
+    - bmr/tdee: utils.nutrition_math (Mifflin-St Jeor, 활동계수)
     - intake: diets(calories 합) + diet_recommendations(calories 합, confirmed=0만)
     - exercise: activities(calories 합) + workout_recommendations(calories 합, confirmed=0만)
-    - tdee: bmr * activity_factor
     - deficit: (tdee + exercise) - intake
     - est_weight_change_kg: deficit / 7700
-    """
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("SELECT height, weight, age, sex, activity_level FROM users WHERE id=?", (user_id,))
-    u = cur.fetchone()
-
-    height = u["height"] if u else None
-    weight = u["weight"] if u else None
-    age = u["age"] if u else None
-    sex = u["sex"] if u else None
-    activity_level = u["activity_level"] if u else None
-    factor = _ACTIVITY.get((activity_level or "sedentary").lower(), 1.2)
-
-    bmr = _calc_bmr(weight, height, age, sex)
-    tdee = bmr * factor if bmr else 0.0
-
-    # intake: 기록 + (미확정 추천만)
-    cur.execute("SELECT COALESCE(SUM(calories), 0) AS v FROM diets WHERE user_id=? AND date=?", (user_id, date))
-    intake_diets = float(cur.fetchone()["v"] or 0)
 
-    cur.execute(
-        "SELECT COALESCE(SUM(calories), 0) AS v FROM diet_recommendations WHERE user_id=? AND date=? AND COALESCE(confirmed,0)=0",
-        (user_id, date),
-    )
-    intake_rec = float(cur.fetchone()["v"] or 0)
+    intake/exercise 는 원천 테이블 트리거가 변경분으로 이미 반영해 두므로
+    여기서는 프로필 기반 bmr/tdee 만 갱신한다 (합계 쿼리 없음)
+    """
+    bmr, tdee = _user_energy(user_id)
+    update_summary_energy(user_id, date, bmr, tdee)
+    return get_daily_summary(user_id, date)
 
-    intake = intake_diets + intake_rec
+def get_daily_calorie_summary(user_id: int, date: str):
+    """
+    하루 요약 조회 (계산 없이 저장된 행)
+    - 트리거가 프로필 정보 없이 만든 행(tdee=0)이면 프로필 기준 bmr/tdee 를 채워 저장한 뒤 반환
+      (compute_calorie_summaries_range 와 같은 기준)
+    """
+    row = get_daily_summary(user_id, date)
+    if row and not row["tdee"]:
+        bmr, tdee = _user_energy(user_id)
+        if tdee:
+            update_summary_energy(user_id, date, bmr, tdee)
+            row = get_daily_summary(user_id, date)
+    return row
+
+def compute_calorie_summaries_range(user_id: int, start: str, end: str, recalc: bool = False) -> list:
+    """
+    start~end (포함) 날짜별 요약을 한 번에 반환: [(date, row)] 날짜순, 모든 날짜 포함
+    - 요약 행이 없거나 bmr/tdee 가 비어 있는 날짜(recalc=True 면 전체)만 원천 테이블별 GROUP BY 한 번씩으로 계산해
+      한 트랜잭션으로 저장 → 날짜 수와 무관하게 쿼리 수가 고정
+    """
+    start_d = datetime.strptime(start, "%Y-%m-%d").date()
+    end_d = datetime.strptime(end, "%Y-%m-%d").date()
+    dates = [(start_d + timedelta(days=i)).isoformat() for i in range((end_d - start_d).days + 1)]
+
+    rows = {r["date"]: r for r in list_summaries_in_range(user_id, start, end)}
+    bmr, tdee = _user_energy(user_id)
+    if recalc:
+        targets = dates
+    else:
+        # 트리거가 프로필 정보 없이 만든 행(tdee=0)도 함께 채운다
+        targets = [d for d in dates if d not in rows or (tdee and not rows[d]["tdee"])]
+    if targets:
+        sums = sum_components_in_range(user_id, start, end)
+        zero = dict.fromkeys(CALORIE_COMPONENTS, 0.0)
+        upsert_summaries_bulk(user_id, [
+            (d, bmr, tdee, *(sums.get(d, zero)[c] for c in CALORIE_COMPONENTS))
+            for d in targets
+        ])
+        rows = {r["date"]: r for r in list_summaries_in_range(user_id, start, end)}
+
+    return [(d, rows.get(d)) for d in dates]
+
+def rebuild_calorie_summaries(user_id: int | None = None) -> dict:
+    """
+    calorie_summaries 전체 재계산 (복구용)
+    - intake/exercise: 원천 테이블에서 다시 합산
+    - bmr/tdee: 현재 프로필 기준으로 모든 날짜에 반영
+    """
+    updated = rebuild_summaries(user_id)
+    users = [user_id] if user_id is not None else list_summary_users()
+    for uid in users:
+        bmr, tdee = _user_energy(uid)
+        update_user_energy(uid, bmr, tdee)
+    return {"rows": updated, "users": len(users)}
 
-    # exercise: 실제 + (미확정 추천만)
-    cur.execute(
-        "SELECT COALESCE(SUM(calories), 0) AS v FROM activities WHERE user_id=? AND DATE(completed_at)=?",
-        (user_id, date),
-    )
-    ex_actual = float(cur.fetchone()["v"] or 0)
 
-    cur.execute(
-        "SELECT COALESCE(SUM(calories), 0) AS v FROM workout_recommendations WHERE user_id=? AND date=? AND COALESCE(confirmed,0)=0",
-        (user_id, date),
+def main(argv=None):
+    """
+    사용법 (backend 디렉터리에서):
+        python -m services.calorie_service rebuild            # 전체 사용자
+        python -m services.calorie_service rebuild --user 3   # 한 사용자
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "rebuild":
+        print(main.__doc__)
+        return 2
+
+    user_id = None
+    if "--user" in argv:
+        user_id = int(argv[argv.index("--user") + 1])
+
+    started = time.perf_counter()
+    result = rebuild_calorie_summaries(user_id)
+    print(
+        f"[CALORIE] rebuild 완료: rows={result['rows']} users={result['users']} "
+        f"({(time.perf_counter() - started) * 1000:.1f} ms)"
     )
-    ex_rec = float(cur.fetchone()["v"] or 0)
+    return 0
 
-    exercise = ex_actual + ex_rec
 
-    deficit = (tdee + exercise) - intake
-    est_weight_change_kg = deficit / 7700.0 if deficit else 0.0
-
-    conn.close()
-
-    upsert_daily_summary(
-        user_id=user_id,
-        date=date,
-        bmr=round(bmr, 2),
-        tdee=round(tdee, 2),
-        intake=round(intake, 2),
-        exercise=round(exercise, 2),
-        deficit=round(deficit, 2),
-        est_weight_change_kg=round(est_weight_change_kg, 4),
-    )
-
-    return get_daily_summary(user_id, date)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+모델 호출용 대화 컨텍스트 (chatbot_logs 기반)
+
+- 최근 CHAT_CONTEXT_TURNS 개 메시지를 인덱스(user_id, id DESC) 쿼리 한 번으로 읽고
+- 최신 메시지부터 토큰 예산(CHAT_CONTEXT_TOKEN_BUDGET) 안에 들어가는 만큼만 싣는다
+- (선택) CHAT_CONTEXT_SUMMARY=1 이면 창 밖으로 밀려난 오래된 대화를 누적 요약해
+  conversation_summaries 에 저장하고, 다음 호출부터 시스템 메시지로 붙인다
+  요약 갱신은 백그라운드 스레드에서 하므로 응답 지연에 영향이 없다
+
+대화 길이가 아무리 길어도 모델 입력 크기는 예산 + 요약 길이로 고정된다.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from models.chatbot_model import list_logs, list_logs_range, count_logs_range, get_summary, save_summary
+from services.log_writer import chat_log_writer
+
+CHAT_CONTEXT_TURNS = int(os.getenv("CHAT_CONTEXT_TURNS", "10"))
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "1200"))
+# 메시지 하나가 예산을 독차지하지 않도록 자르는 길이(토큰 추정치)
+CHAT_CONTEXT_MESSAGE_TOKENS = int(os.getenv("CHAT_CONTEXT_MESSAGE_TOKENS", "400"))
+CHAT_CONTEXT_SUMMARY = os.getenv("CHAT_CONTEXT_SUMMARY", "0") == "1"
+# 요약되지 않은 오래된 메시지가 이만큼 쌓이면 요약 갱신
+CHAT_CONTEXT_SUMMARY_EVERY = int(os.getenv("CHAT_CONTEXT_SUMMARY_EVERY", "10"))
+CHAT_CONTEXT_SUMMARY_TOKENS = int(os.getenv("CHAT_CONTEXT_SUMMARY_TOKENS", "300"))
+
+_ROLES = {"user": "user", "assistant": "assistant"}
+
+_summary_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-summary")
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 쓰는 빠른 추정치
+    - ASCII: 약 4글자당 1토큰
+    - 한글 등 비ASCII: 글자당 약 1토큰
+    """
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # 비ASCII 기준(글자당 1토큰)으로 보수적으로 자른다
+    return text[:max_tokens] + "…"
+
+
+def _select_window(rows, budget: int):
+    """최신부터 예산 안에 들어가는 메시지 (시간순으로 반환)"""
+    picked = []
+    used = 0
+    for r in reversed(rows):
+        content = _truncate(r["message"] or "", CHAT_CONTEXT_MESSAGE_TOKENS)
+        cost = estimate_tokens(content) + 4  # 역할/구분자 오버헤드
+        if used + cost > budget:
+            break
+        picked.append({"id": r["id"], "role": _ROLES[r["role"]], "content": content})
+        used += cost
+    picked.reverse()
+    return picked, used
+
+
+def build_context(user_id: int, current_message: str, summarize=None) -> list:
+    """
+    모델 input 에 끼워 넣을 이전 대화 메시지 목록
+    (현재 메시지는 제외 - 호출자가 마지막에 붙인다)
+
+    summarize: (이전 요약, [메시지]) → 새 요약 문자열. CHAT_CONTEXT_SUMMARY=1 일 때만 사용
+    """
+    if CHAT_CONTEXT_TURNS <= 0 or CHAT_CONTEXT_TOKEN_BUDGET <= 0:
+        return []
+
+    # 직전 턴의 로그가 아직 기록 대기 중일 수 있으므로 먼저 기록
+    chat_log_writer.flush(timeout=1.0)
+    # 'system' 등 다른 역할 행이 창을 차지하지 않도록 SQL 에서 거른다
+    rows = list_logs(user_id, limit=CHAT_CONTEXT_TURNS + 1, roles=tuple(_ROLES))
+    # 채팅 라우트가 현재 메시지를 먼저 저장하므로 중복 제거
+    if rows and rows[-1]["role"] == "user" and (rows[-1]["message"] or "").strip() == (current_message or "").strip():
+        rows = rows[:-1]
+    rows = rows[-CHAT_CONTEXT_TURNS:]
+
+    budget = CHAT_CONTEXT_TOKEN_BUDGET
+    messages = []
+
+    use_summary = CHAT_CONTEXT_SUMMARY and summarize is not None
+    summary = get_summary(user_id) if use_summary else None
+    if summary:
+        text = _truncate(summary["summary"], CHAT_CONTEXT_SUMMARY_TOKENS)
+        messages.append({"role": "system", "content": f"이전 대화 요약:\n{text}"})
+        budget -= estimate_tokens(text) + 8
+
+    window, _ = _select_window(rows, budget)
+    if summary:
+        # 이미 요약에 포함된 메시지는 다시 싣지 않는다
+        window = [m for m in window if m["id"] > summary["upto_log_id"]]
+    messages.extend({"role": m["role"], "content": m["content"]} for m in window)
+
+    if use_summary and window:
+        _maybe_refresh_summary(user_id, window[0]["id"] - 1, summary, summarize)
+
+    return messages
+
+
+def _maybe_refresh_summary(user_id: int, upto_id: int, summary, summarize):
+    """창 밖으로 밀려난 메시지가 충분히 쌓였으면 백그라운드에서 요약 갱신"""
+    summarized_upto = summary["upto_log_id"] if summary else 0
+    # id 는 전체 사용자 공용이라 차이만으로는 부족하다 (차이가 작으면 개수도 작으므로 먼저 거른다)
+    if upto_id - summarized_upto < CHAT_CONTEXT_SUMMARY_EVERY:
+        return
+    if count_logs_range(user_id, summarized_upto, upto_id, roles=tuple(_ROLES)) < CHAT_CONTEXT_SUMMARY_EVERY:
+        return
+    with _pending_lock:
+        if user_id in _pending:
+            return
+        _pending.add(user_id)
+    _summary_executor.submit(_refresh_summary, user_id, upto_id, summary, summarize)
+
+
+def _refresh_summary(user_id: int, upto_id: int, summary, summarize):
+    try:
+        after_id = summary["upto_log_id"] if summary else 0
+        rows = list_logs_range(user_id, after_id, upto_id, roles=tuple(_ROLES))
+        msgs = [
+            {"role": _ROLES[r["role"]], "content": _truncate(r["message"] or "", CHAT_CONTEXT_MESSAGE_TOKENS)}
+            for r in rows if r["role"] in _ROLES
+        ]
+        if not rows:
+            return
+        previous = summary["summary"] if summary else ""
+        text = (summarize(previous, msgs) or "").strip()
+        if text:
+            save_summary(user_id, text, rows[-1]["id"])
+    except Exception as e:
+        print(f"[CHAT] 대화 요약 갱신 실패 (user={user_id}): {e}")
+    finally:
+        with _pending_lock:
+            _pending.discard(user_id)
+
+
+def shutdown(wait: bool = True):
+    _summary_executor.shutdown(wait=wait)
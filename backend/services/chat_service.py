@@ -0,0 +1,141 @@
+"""
+챗봇 응답 처리 (스트리밍 / 비동기)
+
+- 모델 호출은 별도 스레드 풀(CHAT_WORKERS)에서 실행
+  · 스트리밍: 워커는 큐에서 조각을 꺼내 SSE로 흘려보내기만 한다
+  · 비동기: 작업 id만 바로 돌려주고, 결과는 조회 API로 가져간다
+- 어시스턴트 메시지 로그는 응답이 모두 생성된 뒤 한 번만 저장
+  (클라이언트가 중간에 끊어도 생성 스레드가 끝까지 돌고 저장함)
+"""
+import json
+import os
+import queue
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from models.chatbot_model import create_job, finish_job, get_job as find_job
+from services.log_writer import chat_log_writer
+from routes.ai_engine import generate_reply, stream_reply
+
+CHAT_WORKERS = int(os.getenv("CHAT_WORKERS", "8"))
+# 첫 토큰 전까지 연결이 끊기지 않도록 보내는 keep-alive 주기(초)
+SSE_HEARTBEAT_SEC = float(os.getenv("CHAT_SSE_HEARTBEAT_SEC", "10"))
+# 비동기 작업 결과 보관 시간(초) - 등록/완료 시점부터
+CHAT_JOB_TTL_SEC = int(os.getenv("CHAT_JOB_TTL_SEC", "600"))
+
+_executor = ThreadPoolExecutor(max_workers=CHAT_WORKERS, thread_name_prefix="chat")
+
+_DONE = object()
+
+
+def error_reply(e: Exception) -> str:
+    return f"⚠️ AI 처리 중 오류가 발생했습니다.\n{str(e)}"
+
+
+def _save_assistant(user_id: int, reply: str):
+    try:
+        chat_log_writer.submit(user_id, "assistant", reply)
+    except Exception:
+        pass
+
+
+def reply_once(user_id: int, message: str, use_cache: bool = True) -> str:
+    """기존 동기 경로: 응답 생성 + 로그 저장"""
+    try:
+        reply = generate_reply(user_id, message, use_cache=use_cache)
+    except Exception as e:
+        reply = error_reply(e)
+    _save_assistant(user_id, reply)
+    return reply
+
+
+# ===============================
+# 스트리밍 (SSE)
+# ===============================
+def _produce(user_id: int, message: str, out: queue.Queue, use_cache: bool):
+    parts = []
+    try:
+        for delta in stream_reply(user_id, message, use_cache=use_cache):
+            parts.append(delta)
+            out.put(("delta", delta))
+    except Exception as e:
+        err = error_reply(e)
+        parts.append(err)
+        out.put(("delta", err))
+    reply = "".join(parts)
+    _save_assistant(user_id, reply)
+    out.put(("done", reply))
+    out.put(_DONE)
+
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def stream_events(user_id: int, message: str, use_cache: bool = True):
+    """
+    SSE 이벤트 문자열 제너레이터
+    - event: delta  data: {"delta": "..."}
+    - event: done   data: {"reply": "전체 응답"}
+    """
+    out = queue.Queue()
+    _executor.submit(_produce, user_id, message, out, use_cache)
+
+    # 프록시 버퍼링 방지 + 즉시 첫 바이트 전송
+    yield ": stream-start\n\n"
+    while True:
+        try:
+            item = out.get(timeout=SSE_HEARTBEAT_SEC)
+        except queue.Empty:
+            yield ": keep-alive\n\n"
+            continue
+        if item is _DONE:
+            break
+        kind, value = item
+        if kind == "delta":
+            yield _sse("delta", {"delta": value})
+        else:
+            yield _sse("done", {"reply": value})
+
+
+# ===============================
+# 비동기 작업
+# - 상태/결과는 chat_jobs 테이블에 저장 → 다른 워커로 조회가 가도 같은 결과
+# - 만료(CHAT_JOB_TTL_SEC)된 작업은 작업 등록/완료 시 정리
+# ===============================
+def _run_job(job_id: str, user_id: int, message: str, use_cache: bool):
+    try:
+        reply = generate_reply(user_id, message, use_cache=use_cache)
+        status, error = "done", None
+    except Exception as e:
+        reply = error_reply(e)
+        status, error = "error", str(e)
+    _save_assistant(user_id, reply)
+    now = time.time()
+    try:
+        finish_job(job_id, status, reply, error, now, now + CHAT_JOB_TTL_SEC)
+    except Exception as e:
+        print(f"[CHAT] 작업 결과 저장 실패 (job={job_id}): {e}")
+
+
+def submit_job(user_id: int, message: str, use_cache: bool = True) -> str:
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    # 결과가 나오기 전이라도 워커가 죽으면 TTL 뒤 정리되도록 만료 시각을 둔다
+    create_job(job_id, user_id, now, now + CHAT_JOB_TTL_SEC)
+    _executor.submit(_run_job, job_id, user_id, message, use_cache)
+    return job_id
+
+
+def get_job(user_id: int, job_id: str):
+    """본인 작업만 조회 가능 (없거나 남의 작업/만료면 None)"""
+    row = find_job(job_id, user_id, time.time())
+    if row is None:
+        return None
+    return {"id": row["id"], "status": row["status"], "reply": row["reply"], "error": row["error"]}
+
+
+def shutdown(wait: bool = True):
+    """진행 중인 응답 생성/로그 저장을 마치고 스레드 풀 종료"""
+    _executor.shutdown(wait=wait)
@@ -0,0 +1,85 @@
+"""
+프로세스 수명 관리 (준비 상태 / 정상 종료)
+
+- readiness(): 트래픽을 받아도 되는지 (/api/ready)
+  DB 연결 + 스키마 최신 여부 + 종료 중 아님 + 로그 버퍼 여유. /api/health 는 프로세스 생존/지표용
+- shutdown_background(): 백그라운드 큐를 비우고 스레드 풀 종료
+  gunicorn worker_exit / waitress 종료 시 호출. 순서가 중요하다:
+  채팅 작업(로그 기록 포함) → 대화 요약 → 로그 기록기
+"""
+import os
+import threading
+import time
+
+from db.database import get_connection
+from db.migrations import LATEST_VERSION, read_version
+from services import chat_context, chat_service
+from services.log_writer import chat_log_writer
+
+SHUTDOWN_TIMEOUT_SEC = float(os.getenv("SHUTDOWN_TIMEOUT_SEC", "20"))
+
+_state_lock = threading.Lock()
+_draining_pid = None
+_shutdown_pid = None
+
+
+def is_draining() -> bool:
+    return _draining_pid == os.getpid()
+
+
+def begin_drain():
+    """종료 시작 표시 - 이후 readiness 는 503 (로드밸런서가 새 요청을 보내지 않도록)"""
+    global _draining_pid
+    _draining_pid = os.getpid()
+
+
+def readiness() -> tuple:
+    """(ready, checks)"""
+    checks = {"draining": is_draining()}
+    try:
+        conn = get_connection()
+        try:
+            conn.execute("SELECT 1").fetchone()
+            version = read_version(conn)
+        finally:
+            conn.close()
+        checks["db"] = "ok"
+        checks["schema_version"] = version
+        checks["schema_latest"] = version >= LATEST_VERSION
+    except Exception as e:
+        checks["db"] = f"error: {e}"
+        checks["schema_latest"] = False
+
+    log_stats = chat_log_writer.stats()
+    checks["chat_log_backlog"] = log_stats["depth"]
+    checks["chat_log_saturated"] = log_stats["depth"] >= log_stats["max_queue"]
+
+    ready = (
+        checks["db"] == "ok"
+        and checks["schema_latest"]
+        and not checks["draining"]
+        and not checks["chat_log_saturated"]
+    )
+    return ready, checks
+
+
+def shutdown_background(timeout: float = SHUTDOWN_TIMEOUT_SEC):
+    """진행 중인 백그라운드 작업을 마치고 남은 로그를 모두 기록 (프로세스당 한 번)"""
+    global _shutdown_pid
+    with _state_lock:
+        if _shutdown_pid == os.getpid():
+            return
+        _shutdown_pid = os.getpid()
+    begin_drain()
+
+    started = time.perf_counter()
+    for name, fn in (
+        ("chat_service", lambda: chat_service.shutdown(wait=True)),
+        ("chat_context", lambda: chat_context.shutdown(wait=True)),
+        ("chat_log_writer", lambda: chat_log_writer.close(timeout=timeout)),
+    ):
+        try:
+            fn()
+        except Exception as e:
+            print(f"[APP] {name} 종료 실패: {e}")
+    print(f"[APP] 백그라운드 작업 정리 완료 (pid={os.getpid()}, {time.perf_counter() - started:.2f}s)")
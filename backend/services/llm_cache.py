@@ -0,0 +1,210 @@
+"""
+AI 응답 캐시
+
+같은 의도 + 같은 프롬프트(키/몸무게/목표 칼로리 등 프로필 값이 이미 들어 있음)면
+모델을 다시 호출하지 않고 저장된 응답을 돌려준다.
+
+- 1차: 프로세스 메모리 LRU (TTL, 최대 개수)
+- 2차(선택): SQLite llm_cache 테이블 - 워커/재시작 간 공유 (LLM_CACHE_SQLITE=1)
+- 계층은 get/set 만 구현하면 교체 가능 (get 은 (value, expires_at) 또는 None)
+- 하위 계층 적중을 상위 계층에 채울 때는 원래 만료 시각을 그대로 쓴다 (TTL 연장 없음)
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from db.database import get_connection
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_TTL_SEC = int(os.getenv("LLM_CACHE_TTL_SEC", str(6 * 60 * 60)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+LLM_CACHE_SQLITE = os.getenv("LLM_CACHE_SQLITE", "0") == "1"
+
+# 프롬프트만으로 답이 정해지는 의도만 캐시 (일반 대화(unknown)는 제외)
+CACHEABLE_INTENTS = {
+    "diet",
+    "exercise",
+    "diet_with_food",
+    "diet_food_specific",
+    "food_nutrition",
+}
+
+_WS = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s?!.~]+$")
+
+
+def normalize_prompt(text: str) -> str:
+    """공백/대소문자/끝 문장부호 차이는 같은 프롬프트로 취급"""
+    text = _WS.sub(" ", (text or "").strip()).casefold()
+    return _TRAILING.sub("", text)
+
+
+def make_key(model: str, intent: str, messages: list) -> str:
+    h = hashlib.sha256()
+    h.update(f"{model}\x1f{intent}".encode("utf-8"))
+    for m in messages:
+        h.update(b"\x1e")
+        h.update(str(m.get("role")).encode("utf-8"))
+        h.update(b"\x1f")
+        h.update(normalize_prompt(m.get("content")).encode("utf-8"))
+    return h.hexdigest()
+
+
+class MemoryTier:
+    name = "memory"
+
+    def __init__(self, max_entries: int = 2000):
+        self.max_entries = max(int(max_entries), 1)
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: str, now: float):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return item[1], item[0]
+
+    def set(self, key: str, value: str, expires_at: float, intent: str = None):
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteTier:
+    name = "sqlite"
+
+    def get(self, key: str, now: float):
+        conn = get_connection()
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key=? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        finally:
+            conn.close()
+        return (row["value"], row["expires_at"]) if row else None
+
+    def set(self, key: str, value: str, expires_at: float, intent: str = None):
+        conn = get_connection()
+        try:
+            conn.execute(
+                """
+                INSERT INTO llm_cache (key, intent, value, created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value=excluded.value,
+                    created_at=excluded.created_at,
+                    expires_at=excluded.expires_at
+                """,
+                (key, intent, value, time.time(), expires_at),
+            )
+            # 만료 행 정리 (인덱스 범위 삭제라 가볍다)
+            conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def clear(self):
+        conn = get_connection()
+        try:
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+class LLMCache:
+    def __init__(self, tiers: list, ttl: int = LLM_CACHE_TTL_SEC, enabled: bool = True):
+        self.tiers = list(tiers)
+        self.ttl = ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "bypass": 0, "stores": 0, "errors": 0}
+        self._tier_hits = {t.name: 0 for t in self.tiers}
+
+    def _count(self, name: str, tier: str = None):
+        with self._lock:
+            self._metrics[name] += 1
+            if tier:
+                self._tier_hits[tier] += 1
+
+    def cacheable(self, intent: str) -> bool:
+        return self.enabled and intent in CACHEABLE_INTENTS
+
+    def get(self, key: str):
+        now = time.time()
+        for i, tier in enumerate(self.tiers):
+            try:
+                found = tier.get(key, now)
+            except Exception:
+                self._count("errors")
+                continue
+            if found is None:
+                continue
+            value, expires_at = found
+            # 하위 계층에서 찾았으면 상위 계층에도 채워 둔다 (만료 시각은 그대로 - 워커 간 TTL 연장 방지)
+            for upper in self.tiers[:i]:
+                upper.set(key, value, expires_at)
+            self._count("hits", tier.name)
+            return value
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: str, intent: str = None):
+        expires_at = time.time() + self.ttl
+        for tier in self.tiers:
+            try:
+                tier.set(key, value, expires_at, intent)
+            except Exception:
+                self._count("errors")
+        self._count("stores")
+
+    def bypass(self):
+        self._count("bypass")
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                "enabled": self.enabled,
+                **self._metrics,
+                "hit_rate": round(self._metrics["hits"] / total, 4) if total else 0.0,
+                "tier_hits": dict(self._tier_hits),
+                "tiers": [t.name for t in self.tiers],
+                "memory_entries": sum(len(t) for t in self.tiers if isinstance(t, MemoryTier)),
+            }
+
+
+def _default_cache() -> LLMCache:
+    tiers = [MemoryTier(LLM_CACHE_MAX_ENTRIES)]
+    if LLM_CACHE_SQLITE:
+        tiers.append(SQLiteTier())
+    return LLMCache(tiers, ttl=LLM_CACHE_TTL_SEC, enabled=LLM_CACHE_ENABLED)
+
+
+llm_cache = _default_cache()
+
+
+def llm_cache_stats() -> dict:
+    return llm_cache.stats()
@@ -0,0 +1,193 @@
+"""
+챗봇 로그 비동기 일괄 기록기
+
+요청마다 log_message()를 두 번(사용자/어시스턴트) 호출하면 INSERT+COMMIT 이 두 번씩 일어나
+SQLite 쓰기 잠금 경합이 커진다. 대신 메모리 버퍼에 쌓아 두고 백그라운드 스레드가
+CHAT_LOG_FLUSH_MS 마다(또는 CHAT_LOG_BATCH 개가 모이면) 한 트랜잭션으로 기록한다.
+
+- 버퍼 상한(CHAT_LOG_QUEUE_MAX): 가득 차면 잠시 대기(backpressure), 그래도 자리가 없으면
+  요청 스레드에서 직접 기록 → 로그는 버리지 않는다
+- flush(): 호출 시점까지 받은 로그가 모두 기록될 때까지 대기 (조회 직전 read-your-writes)
+- 정상 종료 시 atexit 에서 남은 로그를 모두 기록
+- CHAT_LOG_ASYNC=0 이면 기존처럼 즉시 기록
+"""
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from models.chatbot_model import insert_logs
+
+CHAT_LOG_ASYNC = os.getenv("CHAT_LOG_ASYNC", "1") == "1"
+CHAT_LOG_QUEUE_MAX = int(os.getenv("CHAT_LOG_QUEUE_MAX", "10000"))
+CHAT_LOG_BATCH = int(os.getenv("CHAT_LOG_BATCH", "200"))
+CHAT_LOG_FLUSH_MS = int(os.getenv("CHAT_LOG_FLUSH_MS", "200"))
+CHAT_LOG_BLOCK_MS = int(os.getenv("CHAT_LOG_BLOCK_MS", "500"))
+
+
+class ChatLogWriter:
+    def __init__(
+        self,
+        max_queue: int = CHAT_LOG_QUEUE_MAX,
+        batch_size: int = CHAT_LOG_BATCH,
+        flush_interval: float = CHAT_LOG_FLUSH_MS / 1000.0,
+        block_timeout: float = CHAT_LOG_BLOCK_MS / 1000.0,
+        enabled: bool = CHAT_LOG_ASYNC,
+    ):
+        self.max_queue = max(int(max_queue), 1)
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self.enabled = enabled
+        self._cond = threading.Condition()
+        self._reset()
+        self._metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "blocked": 0,
+            "sync_fallback": 0,
+            "errors": 0,
+            "max_depth": 0,
+        }
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._buf = deque()
+        self._submitted = 0  # 지금까지 받은 로그 수
+        self._done = 0       # 지금까지 기록 완료된 로그 수
+        self._thread = None
+        self._stopping = False
+        self._flush_waiters = 0
+
+    def _ensure_thread(self):
+        # gunicorn preload 등으로 fork 되면 부모의 스레드/버퍼는 쓰지 않는다
+        if self._pid != os.getpid():
+            self._reset()
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="chat-log-writer", daemon=True)
+            self._thread.start()
+
+    # ===============================
+    # 기록 요청
+    # ===============================
+    def submit(self, user_id: int, role: str, message: str):
+        row = (user_id, role, message, datetime.utcnow().isoformat())
+        if not self.enabled:
+            insert_logs([row])
+            return
+
+        with self._cond:
+            self._ensure_thread()
+            if len(self._buf) >= self.max_queue:
+                self._metrics["blocked"] += 1
+                deadline = time.monotonic() + self.block_timeout
+                while len(self._buf) >= self.max_queue:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+            if len(self._buf) < self.max_queue:
+                self._buf.append(row)
+                self._submitted += 1
+                self._metrics["enqueued"] += 1
+                self._metrics["max_depth"] = max(self._metrics["max_depth"], len(self._buf))
+                if len(self._buf) >= self.batch_size:
+                    self._cond.notify_all()
+                return
+
+        # 버퍼가 계속 가득 차 있으면 직접 기록 (유실 방지)
+        insert_logs([row])
+        with self._cond:
+            self._metrics["sync_fallback"] += 1
+
+    # ===============================
+    # 백그라운드 기록
+    # ===============================
+    def _take_batch(self):
+        with self._cond:
+            # 배치가 찰 때까지 최대 flush_interval 만큼 모은다 (flush/종료 요청이 오면 바로 깨어남)
+            self._cond.wait_for(
+                lambda: len(self._buf) >= self.batch_size or self._stopping or self._flush_waiters,
+                timeout=self.flush_interval,
+            )
+            n = min(len(self._buf), self.batch_size)
+            return [self._buf[i] for i in range(n)]
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                with self._cond:
+                    if self._stopping and not self._buf:
+                        return
+                continue
+            try:
+                insert_logs(batch)
+            except Exception as e:
+                with self._cond:
+                    self._metrics["errors"] += 1
+                print(f"[CHAT] 로그 일괄 기록 실패, 재시도 예정: {e}")
+                time.sleep(min(self.flush_interval * 5, 2.0))
+                continue
+            with self._cond:
+                # 기록이 끝난 뒤에만 버퍼에서 제거 → 실패해도 유실되지 않음
+                for _ in batch:
+                    self._buf.popleft()
+                self._done += len(batch)
+                self._metrics["written"] += len(batch)
+                self._metrics["batches"] += 1
+                self._cond.notify_all()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """지금까지 받은 로그가 기록될 때까지 대기. 시간 내 완료되면 True"""
+        if not self.enabled:
+            return True
+        with self._cond:
+            if self._pid != os.getpid() or self._thread is None:
+                return not self._buf
+            target = self._submitted
+            if self._done >= target:
+                return True
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: self._done >= target, timeout=timeout)
+            finally:
+                self._flush_waiters -= 1
+
+    def close(self, timeout: float = 10.0):
+        """남은 로그를 모두 기록하고 스레드 종료 (정상 종료 시 호출)"""
+        with self._cond:
+            if self._pid != os.getpid() or self._thread is None:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        thread.join(timeout)
+        with self._cond:
+            leftover = list(self._buf)
+            self._buf.clear()
+            self._thread = None
+            self._stopping = False
+        if leftover:
+            # 스레드가 시간 내 끝내지 못한 경우 직접 기록
+            insert_logs(leftover)
+            self._done += len(leftover)
+            self._metrics["written"] += len(leftover)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "async": self.enabled,
+                "depth": len(self._buf),
+                "max_queue": self.max_queue,
+                **self._metrics,
+            }
+
+
+chat_log_writer = ChatLogWriter()
+atexit.register(chat_log_writer.close)
@@ -0,0 +1,97 @@
+"""
+user_nutrition_goal 일괄 재계산
+
+사용자 프로필(users + diet_goals.type)을 한 번에 읽어 utils.nutrition_math 의
+배열 연산으로 목표를 계산하고, 한 트랜잭션으로 저장한다.
+
+사용법 (backend 디렉터리에서):
+    python -m services.nutrition_goal_service            # 전체 사용자
+    python -m services.nutrition_goal_service --user 3   # 한 사용자
+"""
+import sys
+import time
+
+from db.database import get_connection
+from models.profile_snapshot import invalidate_all_profiles, invalidate_profile
+from utils.nutrition_math import calc_nutrition_goal_batch
+
+# update_my_info 와 같은 규칙: users.goal 이 없으면 diet_goals.type
+_PROFILE_SQL = """
+    SELECT u.id, u.height, u.weight, u.age, u.sex, u.activity_level,
+           COALESCE(NULLIF(u.goal, ''), dg.type) AS goal
+    FROM users u
+    LEFT JOIN diet_goals dg ON dg.user_id = u.id
+    WHERE u.weight IS NOT NULL AND u.weight != 0
+"""
+
+
+def recompute_nutrition_goals(user_ids=None) -> dict:
+    """체중/키가 있는 사용자의 목표 재계산. {"users", "updated", "skipped"} 반환"""
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        if user_ids is None:
+            cur.execute(_PROFILE_SQL)
+        else:
+            ids = [int(u) for u in user_ids]
+            cur.execute(
+                _PROFILE_SQL + f" AND u.id IN ({','.join('?' * len(ids))})",
+                ids,
+            )
+        rows = cur.fetchall()
+        if not rows:
+            return {"users": 0, "updated": 0, "skipped": 0}
+
+        cols = list(zip(*[(r["weight"], r["height"], r["age"], r["sex"], r["activity_level"], r["goal"]) for r in rows]))
+        calories, protein, activity_kcal, valid = calc_nutrition_goal_batch(*cols)
+
+        params = [
+            (rows[i]["id"], int(calories[i]), int(protein[i]), int(activity_kcal[i]))
+            for i in valid.nonzero()[0]
+        ]
+        cur.executemany(
+            """
+            INSERT INTO user_nutrition_goal
+            (user_id, calories, protein, activity_kcal, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(user_id)
+            DO UPDATE SET
+                calories=excluded.calories,
+                protein=excluded.protein,
+                activity_kcal=excluded.activity_kcal,
+                updated_at=CURRENT_TIMESTAMP
+            """,
+            params,
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    if user_ids is None:
+        invalidate_all_profiles()
+    else:
+        for uid in user_ids:
+            invalidate_profile(uid)
+    return {"users": len(rows), "updated": len(params), "skipped": len(rows) - len(params)}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    user_ids = None
+    if "--user" in argv:
+        user_ids = [int(argv[argv.index("--user") + 1])]
+
+    started = time.perf_counter()
+    result = recompute_nutrition_goals(user_ids)
+    print(
+        f"[NUTRITION] 목표 재계산 완료: users={result['users']} updated={result['updated']} "
+        f"skipped={result['skipped']} ({(time.perf_counter() - started) * 1000:.1f} ms)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
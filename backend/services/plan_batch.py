@@ -0,0 +1,167 @@
+"""
+다음 날 추천 일괄 생성 (야간 배치)
+
+첫 화면 진입 시 get_week_plan / generate_plan 이 추천을 만드느라 늦어지지 않도록
+활성 사용자 전체의 다음 날 diet_recommendations / workout_recommendations 를 미리 만든다.
+
+- 사용자를 user_id % workers 로 나눠 프로세스 풀에서 병렬 계획 (SQLite WAL + busy_timeout)
+- 각 워커는 PLAN_BATCH_CHUNK 명씩 모아 한 트랜잭션으로 저장
+- 이미 추천이 있는 사용자는 건너뜀 (--force 로 덮어쓰기)
+- 끝나면 처리량(users/sec)을 출력
+
+사용법 (backend 디렉터리에서, cron 등에서 실행):
+    python -m services.plan_batch                         # 내일, 활성 사용자
+    python -m services.plan_batch --date 2025-01-02 --workers 4 --chunk 200
+    python -m services.plan_batch --all-users --force
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date as date_cls, datetime, timedelta
+
+from db.database import get_connection, init_db
+from models.recommendation_model import replace_recommendations_many
+from services.planning_service import plan_days
+
+PLAN_BATCH_WORKERS = int(os.getenv("PLAN_BATCH_WORKERS", str(min(os.cpu_count() or 1, 4))))
+PLAN_BATCH_CHUNK = int(os.getenv("PLAN_BATCH_CHUNK", "200"))
+# 최근 이 기간 안에 기록/대화/추천이 있으면 활성 사용자
+PLAN_BATCH_ACTIVE_DAYS = int(os.getenv("PLAN_BATCH_ACTIVE_DAYS", "14"))
+# 직전 며칠의 메뉴와 겹치지 않게 (regenerate_week_plan 과 같은 기준)
+PLAN_BATCH_VARIETY_DAYS = 3
+
+_ACTIVE_USERS_SQL = """
+    SELECT id AS user_id FROM users WHERE created_at >= :since
+    UNION SELECT user_id FROM chatbot_logs WHERE day >= :since
+    UNION SELECT user_id FROM activities WHERE day >= :since
+    UNION SELECT user_id FROM diets WHERE date >= :since
+    UNION SELECT user_id FROM diet_recommendations WHERE date >= :since
+"""
+
+
+def active_user_ids(since: str) -> list:
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(f"SELECT user_id FROM ({_ACTIVE_USERS_SQL}) WHERE user_id IS NOT NULL ORDER BY user_id", {"since": since})
+    ids = [r["user_id"] for r in cur.fetchall()]
+    conn.close()
+    return ids
+
+
+def all_user_ids() -> list:
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT id FROM users ORDER BY id")
+    ids = [r["id"] for r in cur.fetchall()]
+    conn.close()
+    return ids
+
+
+def _plan_partition(user_ids, target: str, force: bool, chunk_size: int) -> dict:
+    """워커 프로세스 하나의 작업: 계획 → chunk_size 명씩 한 트랜잭션으로 저장"""
+    day = datetime.strptime(target, "%Y-%m-%d").date()
+    dates = [(day - timedelta(days=i)).isoformat() for i in range(PLAN_BATCH_VARIETY_DAYS, -1, -1)]
+
+    stats = {"users": len(user_ids), "generated": 0, "skipped": 0, "errors": 0, "chunks": 0}
+    buf = []
+
+    def flush():
+        if not buf:
+            return
+        try:
+            replace_recommendations_many(buf)
+            stats["generated"] += len(buf)
+            stats["chunks"] += 1
+        except Exception as e:
+            stats["errors"] += len(buf)
+            print(f"[PLAN] 저장 실패 ({len(buf)}명): {e}")
+        buf.clear()
+
+    for user_id in user_ids:
+        try:
+            _, planned = plan_days(
+                user_id, dates,
+                force=force,
+                nonce=f"batch-{target}",
+                variety_days=PLAN_BATCH_VARIETY_DAYS,
+                plan_from=target,
+            )
+        except Exception as e:
+            stats["errors"] += 1
+            print(f"[PLAN] 계획 실패 (user={user_id}): {e}")
+            continue
+
+        if target not in planned:
+            stats["skipped"] += 1
+            continue
+        diets, workouts = planned[target]
+        buf.append((user_id, target, diets, workouts))
+        if len(buf) >= chunk_size:
+            flush()
+    flush()
+    return stats
+
+
+def run_batch(target: str, user_ids, workers: int = PLAN_BATCH_WORKERS,
+              chunk_size: int = PLAN_BATCH_CHUNK, force: bool = False) -> dict:
+    started = time.perf_counter()
+    workers = max(1, min(workers, len(user_ids) or 1))
+    partitions = [[u for u in user_ids if u % workers == i] for i in range(workers)]
+
+    if workers == 1:
+        results = [_plan_partition(user_ids, target, force, chunk_size)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(
+                _plan_partition,
+                partitions,
+                [target] * workers,
+                [force] * workers,
+                [chunk_size] * workers,
+            ))
+
+    total = {"users": 0, "generated": 0, "skipped": 0, "errors": 0, "chunks": 0}
+    for r in results:
+        for k in total:
+            total[k] += r[k]
+    elapsed = time.perf_counter() - started
+    total.update({
+        "date": target,
+        "workers": workers,
+        "elapsed_sec": round(elapsed, 3),
+        "users_per_sec": round(total["users"] / elapsed, 1) if elapsed > 0 else None,
+    })
+    return total
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="다음 날 추천 일괄 생성")
+    parser.add_argument("--date", help="대상 날짜 YYYY-MM-DD (기본: 내일)")
+    parser.add_argument("--workers", type=int, default=PLAN_BATCH_WORKERS)
+    parser.add_argument("--chunk", type=int, default=PLAN_BATCH_CHUNK, help="트랜잭션당 사용자 수")
+    parser.add_argument("--force", action="store_true", help="이미 있는 추천도 다시 생성")
+    parser.add_argument("--all-users", action="store_true", help="활성 여부와 관계없이 전체 사용자")
+    args = parser.parse_args(argv)
+
+    target = args.date or (date_cls.today() + timedelta(days=1)).isoformat()
+    init_db()
+
+    if args.all_users:
+        user_ids = all_user_ids()
+    else:
+        since = (date_cls.today() - timedelta(days=PLAN_BATCH_ACTIVE_DAYS)).isoformat()
+        user_ids = active_user_ids(since)
+
+    result = run_batch(target, user_ids, workers=args.workers, chunk_size=max(args.chunk, 1), force=args.force)
+    print(
+        f"[PLAN] {result['date']} users={result['users']} generated={result['generated']} "
+        f"skipped={result['skipped']} errors={result['errors']} chunks={result['chunks']} "
+        f"workers={result['workers']} {result['elapsed_sec']}s ({result['users_per_sec']} users/sec)"
+    )
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,23 @@
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
 import random
+import time
 from utils.time_utils import normalize_date
-from models.schedule_model import get_schedule_by_date
-from models.recommendation_model import clear_recommendations, list_recommendations
-from services.recommendation_service import recommend_diet, recommend_workout
-from utils.time_utils import normalize_date
+from models.schedule_model import get_schedule_by_date, get_schedules_in_range
+from models.recommendation_model import (
+    replace_recommendations,
+    replace_recommendations_bulk,
+    list_recommendations,
+    list_recommendations_in_range,
+)
+from models.food_model import get_food_candidates
+from models.workout_model import get_workouts_by_intensity
+from services.recommendation_service import (
+    load_food_preferences,
+    intensity_for_progress,
+    pick_diet,
+    pick_workout,
+)
 
 
 _MEAL_KEYWORDS = {
@@ -42,62 +55,188 @@ def _signature(rec):
     diets = tuple((r["meal_type"], r["menu"]) for r in (rec.get("diets") or []))
     workouts = tuple(
         (r["workout"], int(r["duration"] or 0))
-        for r in (rec["workouts"] or [])
+        for r in (rec.get("workouts") or [])
     )
+    return (diets, workouts)
 
 
-def regenerate_daily_plan(user_id: int, date: str, progress: int = 70, nonce: str | int | None = None):
+class _CandidatePool:
+    """사용자 선호 기반 후보를 끼니/강도별로 한 번만 조회해 재사용"""
+
+    def __init__(self, user_id: int):
+        self.likes, self.dislikes, self.allergies = load_food_preferences(user_id)
+        self._foods = {}
+        self._workouts = {}
+
+    def foods(self, meal_type):
+        if meal_type not in self._foods:
+            self._foods[meal_type] = get_food_candidates(
+                meal_type=meal_type,
+                dislikes=self.dislikes,
+                allergies=self.allergies,
+                likes=self.likes,
+            )
+        return self._foods[meal_type]
+
+    def workouts(self, progress):
+        intensity = intensity_for_progress(progress)
+        if intensity not in self._workouts:
+            self._workouts[intensity] = get_workouts_by_intensity(intensity)
+        return self._workouts[intensity]
+
+
+def _plan_day(user_id, date, schedules, prev, pool: _CandidatePool, progress=70, nonce=None, avoid_menus=None):
     """
-    일정 기반 자동 추천(식단/운동)을 생성하고 DB에 저장합니다.
-    - 기존 추천은 (user_id, date) 기준으로 삭제 후 재생성
-    - meal_type: breakfast | lunch | dinner | snack
+    하루치 추천 조합을 메모리에서 고른다 (DB 쓰기 없음)
+    - prev: 직전 추천(미확정). 같은 조합이 나오지 않도록 최대 5회 재시도
+    - avoid_menus: 최근 며칠 사이 이미 추천된 메뉴 (주간 계획의 다양성 확보용)
     """
-    date = normalize_date(date)
-    schedules = get_schedule_by_date(user_id, date)
-
-    # (요청사항) '다시 추천' 시 직전 추천과 동일 조합이 나오지 않도록 최대한 회피
-    prev = list_recommendations(user_id, date, include_confirmed=False)
     prev_sig = _signature(prev)
-    prev_meal_map = {}
-    try:
-        for r in (prev.get("diets") or []):
-            prev_meal_map[r["meal_type"]] = r["menu"]
-    except Exception:
-        prev_meal_map = {}
-    prev_workouts = []
-    try:
-        prev_workouts = [r["workout"] for r in (prev.get("workouts") or []) if r.get("workout")]
-    except Exception:
-        prev_workouts = []
+    prev_meal_map = {r["meal_type"]: r["menu"] for r in (prev.get("diets") or [])} if prev else {}
+    prev_workouts = [r["workout"] for r in (prev.get("workouts") or []) if r["workout"]] if prev else []
 
     meals = _infer_meals_from_schedules(schedules)
     if not meals:
         meals = ["breakfast", "lunch", "dinner"]
+    need_workout = _infer_need_workout(schedules)
 
-    # 동일 조합이면 몇 번 재시도
+    # 동일 조합이면 몇 번 재시도 (메모리에서만)
     attempts = 5
+    diets, workouts = [], []
     for _ in range(attempts):
         # (버그픽스) 프론트에서 nonce를 보내면 매번 다른 조합이 나오도록 RNG를 분리
         # - week 생성/다시추천에서도 date+nonce 기반으로 변하도록 함
         seed = f"{user_id}|{date}|{nonce}|{_}|{datetime.utcnow().timestamp()}" if nonce is not None else f"{user_id}|{date}|{_}|{datetime.utcnow().timestamp()}"
         rng = random.Random(seed)
 
-        clear_recommendations(user_id, date)
-
+        diets = []
         for meal_type in meals:
-            exclude = []
+            exclude = set(avoid_menus or ())
             if prev_meal_map.get(meal_type):
-                exclude = [prev_meal_map.get(meal_type)]
-            recommend_diet(user_id, date, meal_type, exclude_menus=exclude, rng=rng)
+                exclude.add(prev_meal_map[meal_type])
+            picked = pick_diet(pool.foods(meal_type), exclude_menus=exclude, rng=rng)
+            diets.append({"meal_type": meal_type, **picked})
 
-        if _infer_need_workout(schedules):
-            recommend_workout(user_id, date, progress=progress, exclude_workouts=prev_workouts, rng=rng)
+        workouts = []
+        if need_workout:
+            workouts.append(pick_workout(pool.workouts(progress), exclude_workouts=prev_workouts, rng=rng))
 
-        cur = list_recommendations(user_id, date)
         if prev_sig == ((), ()):  # 이전 추천이 없으면 1회 생성으로 충분
-            return cur
-        if _signature(cur) != prev_sig:
-            return cur
+            break
+        if _signature({"diets": diets, "workouts": workouts}) != prev_sig:
+            break
+    # 그래도 동일하면(후보가 적은 경우) 마지막 결과 사용
 
-    # 그래도 동일하면(후보가 적은 경우) 마지막 결과 반환
+    return diets, workouts
+
+
+def regenerate_daily_plan(user_id: int, date: str, progress: int = 70, nonce: str | int | None = None):
+    """
+    일정 기반 자동 추천(식단/운동)을 생성하고 DB에 저장합니다.
+    - 기존 추천은 (user_id, date) 기준으로 삭제 후 재생성
+    - meal_type: breakfast | lunch | dinner | snack
+    - 선호/후보는 한 번만 읽고, 조합은 메모리에서 고른 뒤 한 트랜잭션으로 저장
+    """
+    date = normalize_date(date)
+    schedules = get_schedule_by_date(user_id, date)
+
+    # (요청사항) '다시 추천' 시 직전 추천과 동일 조합이 나오지 않도록 최대한 회피
+    prev = list_recommendations(user_id, date, include_confirmed=False)
+
+    diets, workouts = _plan_day(user_id, date, schedules, prev, _CandidatePool(user_id), progress=progress, nonce=nonce)
+
+    replace_recommendations(user_id, date, diets, workouts)
     return list_recommendations(user_id, date)
+
+
+def plan_days(
+    user_id: int,
+    dates: list,
+    force: bool = False,
+    progress: int = 70,
+    nonce: str | int | None = None,
+    variety_days: int = 3,
+    plan_from: str | None = None,
+    pool: _CandidatePool | None = None,
+):
+    """
+    dates(연속, 오름차순) 범위의 추천을 메모리에서 계획 (DB 쓰기 없음)
+    - 일정/기존 추천은 기간 범위 조회로 한 번에 읽음
+    - force=False 이면 추천이 비어 있는 날만 생성, True 이면 전체 재생성
+    - plan_from 보다 이전 날짜는 메뉴 다양성 판단에만 쓰고 생성하지 않음
+    - variety_days 일 안에 같은 메뉴가 반복되지 않도록 조정 (후보가 부족하면 허용)
+
+    반환: (기존 추천 {date: {...}}, 계획 {date: (diets, workouts)})
+    """
+    schedules = get_schedules_in_range(user_id, dates[0], dates[-1])
+    existing = list_recommendations_in_range(user_id, dates[0], dates[-1])
+
+    schedules_by_date = {}
+    for row in schedules:
+        schedules_by_date.setdefault(row["date"], []).append(row)
+
+    pool = pool or _CandidatePool(user_id)
+    recent = deque(maxlen=max(variety_days, 0) or None)
+    planned = {}
+    for d in dates:
+        rec = existing.get(d) or {"diets": [], "workouts": []}
+        has_any = bool(rec["diets"] or rec["workouts"])
+
+        if (has_any and not force) or (plan_from and d < plan_from):
+            recent.append({r["menu"] for r in rec["diets"]})
+            continue
+
+        prev = {
+            "diets": [r for r in rec["diets"] if not r["confirmed"]],
+            "workouts": [r for r in rec["workouts"] if not r["confirmed"]],
+        }
+        avoid = set().union(*recent) if recent and variety_days else set()
+        diets, workouts = _plan_day(
+            user_id, d, schedules_by_date.get(d, []), prev, pool,
+            progress=progress,
+            nonce=nonce or f"week-{d}",
+            avoid_menus=avoid,
+        )
+        planned[d] = (diets, workouts)
+        recent.append({x["menu"] for x in diets})
+    return existing, planned
+
+
+def regenerate_week_plan(
+    user_id: int,
+    week_start: str,
+    days: int = 7,
+    force: bool = False,
+    progress: int = 70,
+    nonce: str | int | None = None,
+    variety_days: int = 3,
+):
+    """
+    주간 추천을 한 번에 계획합니다 (plan_days 참고)
+    - 생성된 날짜는 한 트랜잭션으로 일괄 저장
+
+    반환: ({date: {"diets": [...], "workouts": [...]}}, timing dict)
+    """
+    t0 = time.perf_counter()
+    start = datetime.strptime(normalize_date(week_start), "%Y-%m-%d").date()
+    dates = [(start + timedelta(days=i)).isoformat() for i in range(days)]
+
+    existing, planned = plan_days(
+        user_id, dates,
+        force=force, progress=progress, nonce=nonce, variety_days=variety_days,
+    )
+    t_plan = time.perf_counter()
+
+    if planned:
+        replace_recommendations_bulk(user_id, planned)
+        existing.update(list_recommendations_in_range(user_id, dates[0], dates[-1]))
+    t_save = time.perf_counter()
+
+    timing = {
+        "plan_ms": round((t_plan - t0) * 1000, 2),
+        "save_ms": round((t_save - t_plan) * 1000, 2),
+        "total_ms": round((t_save - t0) * 1000, 2),
+        "generated_days": len(planned),
+    }
+    result = {d: existing.get(d) or {"diets": [], "workouts": []} for d in dates}
+    return result, timing
@@ -26,45 +26,86 @@ from utils.time_utils import normalize_date
 """
 
 
-# 식단 추천
-def recommend_diet(user_id, date, meal_type, exclude_menus=None, rng: random.Random | None = None):
-    date = normalize_date(date)
-
+def load_food_preferences(user_id):
+    """(likes, dislikes, allergies) - 없으면 None"""
     pref = get_food_preferences(user_id)
     likes = (pref.get("likes") if pref else None) or None
     dislikes = (pref.get("dislikes") if pref else None) or None
     allergies = (pref.get("allergies") if pref else None) or None
+    return likes, dislikes, allergies
 
-    foods = get_food_candidates(
-        meal_type=meal_type,
-        dislikes=dislikes,
-        allergies=allergies,
-        likes=likes,
-    )
 
+def intensity_for_progress(progress) -> str:
+    """진행률 기반 강도 조절"""
+    if progress < 60:
+        return "low"
+    elif progress < 85:
+        return "medium"
+    return "high"
+
+
+def pick_diet(foods, exclude_menus=None, rng: random.Random | None = None) -> dict:
+    """후보 목록에서 메뉴 1개 선택 (DB 접근 없음)"""
     exclude_set = set([m for m in (exclude_menus or []) if m])
     if foods and exclude_set:
         filtered = [f for f in foods if f.get("name") not in exclude_set]
         foods = filtered or foods
 
     if not foods:
-        menu = "닭가슴살 샐러드"
-        calories = 450
-        protein = 30
-    else:
-        picker = rng if rng is not None else random
-        food = picker.choice(foods)
-        menu = food["name"]
-        calories = food.get("calories", 400)
-        protein = food.get("protein", 0)
+        return {"menu": "닭가슴살 샐러드", "calories": 450, "protein": 30}
+
+    picker = rng if rng is not None else random
+    food = picker.choice(foods)
+    return {
+        "menu": food["name"],
+        "calories": food.get("calories", 400),
+        "protein": food.get("protein", 0),
+    }
+
+
+def pick_workout(workouts, exclude_workouts=None, rng: random.Random | None = None) -> dict:
+    """후보 목록에서 운동 1개 선택 (DB 접근 없음)"""
+    # 이전 추천과 동일한 운동은 가능한 한 제외
+    exclude_set = set([w for w in (exclude_workouts or []) if w])
+    if workouts and exclude_set:
+        filtered = [w for w in workouts if (w.get("name") not in exclude_set)]
+        workouts = filtered or workouts
+
+    # 후보 없을 때 fallback
+    if not workouts:
+        return {"workout": "걷기", "duration": 30, "calories": 120}
+
+    picker = rng if rng is not None else random
+    workout = picker.choice(workouts)
+    return {
+        "workout": workout["name"],
+        "duration": workout.get("duration", 30),
+        "calories": workout.get("calories", 150),
+    }
+
+
+# 식단 추천
+def recommend_diet(user_id, date, meal_type, exclude_menus=None, rng: random.Random | None = None):
+    date = normalize_date(date)
+
+    likes, dislikes, allergies = load_food_preferences(user_id)
+
+    foods = get_food_candidates(
+        meal_type=meal_type,
+        dislikes=dislikes,
+        allergies=allergies,
+        likes=likes,
+    )
+
+    picked = pick_diet(foods, exclude_menus=exclude_menus, rng=rng)
 
     save_diet_recommendation(
         user_id=user_id,
         date=date,
         meal_type=meal_type,
-        menu=menu,
-        calories=calories,
-        protein=protein
+        menu=picked["menu"],
+        calories=picked["calories"],
+        protein=picked["protein"]
     )
 
 
@@ -76,38 +117,13 @@ def recommend_workout(user_id, date, progress=70, exclude_workouts=None, rng: ra
 
     date = normalize_date(date)
 
-    # 진행률 기반 강도 조절
-    if progress < 60:
-        intensity = "low"
-    elif progress < 85:
-        intensity = "medium"
-    else:
-        intensity = "high"
-
-    workouts = get_workouts_by_intensity(intensity)
-
-    # 이전 추천과 동일한 운동은 가능한 한 제외
-    exclude_set = set([w for w in (exclude_workouts or []) if w])
-    if workouts and exclude_set:
-        filtered = [w for w in workouts if (w.get("name") not in exclude_set)]
-        workouts = filtered or workouts
-
-    # 후보 없을 때 fallback
-    if not workouts:
-        workout_name = "걷기"
-        duration = 30
-        calories = 120
-    else:
-        picker = rng if rng is not None else random
-        workout = picker.choice(workouts)
-        workout_name = workout["name"]
-        duration = workout.get("duration", 30)
-        calories = workout.get("calories", 150)
+    workouts = get_workouts_by_intensity(intensity_for_progress(progress))
+    picked = pick_workout(workouts, exclude_workouts=exclude_workouts, rng=rng)
 
     save_workout_recommendation(
         user_id=user_id,
         date=date,
-        workout=workout_name,
-        duration=duration,
-        calories=calories
+        workout=picked["workout"],
+        duration=picked["duration"],
+        calories=picked["calories"]
     )
@@ -0,0 +1,171 @@
+"""
+챗봇 대화 상태 저장소
+
+기존 USER_STATE(전역 dict)는 사용자 수만큼 계속 커지고 워커마다 내용이 달랐다.
+- memory: 워커 내 LRU + TTL, 최대 CHAT_STATE_MAX 명까지만 유지
+- sqlite: conversation_state 테이블에 저장해 모든 워커가 같은 상태를 본다
+  (만료 행은 쓰기 시 정리, 쓰기는 요청 공유 연결과 분리된 전용 연결의 독립 트랜잭션 -
+   전용 연결은 요청 풀과 별도 슬롯이라 요청 연결을 쥔 채 써도 풀이 막히지 않는다)
+
+주의: ai_engine._get_state 는 프로필 DB 조회가 실패하면 이 저장소의 마지막 상태로 대체하는데,
+이 대체는 memory 백엔드에서만 의미가 있다 (sqlite 백엔드는 같은 DB 라 함께 실패한다)
+
+CHAT_STATE_BACKEND=memory|sqlite 로 선택
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from db.database import dedicated_connection, get_connection
+
+CHAT_STATE_BACKEND = os.getenv("CHAT_STATE_BACKEND", "memory")
+CHAT_STATE_MAX = int(os.getenv("CHAT_STATE_MAX", "1000"))
+CHAT_STATE_TTL_SEC = int(os.getenv("CHAT_STATE_TTL_SEC", str(60 * 60)))
+
+
+class MemoryStateStore:
+    backend = "memory"
+
+    def __init__(self, max_users: int = CHAT_STATE_MAX, ttl: int = CHAT_STATE_TTL_SEC):
+        self.max_users = max(int(max_users), 1)
+        self.ttl = ttl
+        self._data = OrderedDict()  # user_id -> (updated_at, state)
+        self._lock = threading.Lock()
+        self._evicted = 0
+
+    def get(self, user_id, default=None):
+        now = time.time()
+        with self._lock:
+            item = self._data.get(user_id)
+            if item is None:
+                return default
+            if now - item[0] > self.ttl:
+                del self._data[user_id]
+                self._evicted += 1
+                return default
+            self._data.move_to_end(user_id)
+            return dict(item[1])
+
+    def _touch(self, user_id):
+        # 잠금 안에서 호출: 최근 사용으로 이동 + 용량 초과분 제거
+        self._data.move_to_end(user_id)
+        while len(self._data) > self.max_users:
+            self._data.popitem(last=False)
+            self._evicted += 1
+
+    def set(self, user_id, state: dict):
+        with self._lock:
+            self._data[user_id] = (time.time(), dict(state))
+            self._touch(user_id)
+
+    def update(self, user_id, patch: dict):
+        with self._lock:
+            item = self._data.get(user_id)
+            state = dict(item[1]) if item else {}
+            state.update(patch)
+            self._data[user_id] = (time.time(), state)
+            self._touch(user_id)
+
+    def pop(self, user_id, default=None):
+        with self._lock:
+            item = self._data.pop(user_id, None)
+        return item[1] if item else default
+
+    def __contains__(self, user_id):
+        return self.get(user_id) is not None
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "size": len(self._data),
+            "max": self.max_users,
+            "ttl_sec": self.ttl,
+            "evicted": self._evicted,
+        }
+
+
+class SQLiteStateStore:
+    backend = "sqlite"
+
+    def __init__(self, ttl: int = CHAT_STATE_TTL_SEC):
+        self.ttl = ttl
+
+    def get(self, user_id, default=None):
+        conn = get_connection()
+        try:
+            row = conn.execute(
+                "SELECT state FROM conversation_state WHERE user_id=? AND updated_at > ?",
+                (user_id, time.time() - self.ttl),
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row["state"]) if row else default
+
+    def _write(self, conn, user_id, state: dict):
+        now = time.time()
+        conn.execute(
+            """
+            INSERT INTO conversation_state (user_id, state, updated_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                state=excluded.state,
+                updated_at=excluded.updated_at
+            """,
+            (user_id, json.dumps(state, ensure_ascii=False), now),
+        )
+        conn.execute("DELETE FROM conversation_state WHERE updated_at <= ?", (now - self.ttl,))
+
+    # 쓰기는 전용 연결에서: 요청 공유 연결에 commit/rollback 하면 호출자의 다른 미커밋 변경까지 영향을 받는다
+    def set(self, user_id, state: dict):
+        with dedicated_connection() as conn:
+            self._write(conn, user_id, state)
+            conn.commit()
+
+    def update(self, user_id, patch: dict):
+        with dedicated_connection() as conn:
+            try:
+                # 읽기-수정-쓰기를 한 트랜잭션으로 (다른 워커와 경합 방지)
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT state FROM conversation_state WHERE user_id=? AND updated_at > ?",
+                    (user_id, time.time() - self.ttl),
+                ).fetchone()
+                state = json.loads(row["state"]) if row else {}
+                state.update(patch)
+                self._write(conn, user_id, state)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def pop(self, user_id, default=None):
+        state = self.get(user_id, default)
+        with dedicated_connection() as conn:
+            conn.execute("DELETE FROM conversation_state WHERE user_id=?", (user_id,))
+            conn.commit()
+        return state
+
+    def __contains__(self, user_id):
+        return self.get(user_id) is not None
+
+    def __len__(self):
+        conn = get_connection()
+        try:
+            row = conn.execute("SELECT COUNT(*) AS n FROM conversation_state").fetchone()
+        finally:
+            conn.close()
+        return int(row["n"])
+
+    def stats(self) -> dict:
+        return {"backend": self.backend, "size": len(self), "ttl_sec": self.ttl}
+
+
+def create_state_store(backend: str = CHAT_STATE_BACKEND):
+    if backend == "sqlite":
+        return SQLiteStateStore()
+    return MemoryStateStore()
@@ -0,0 +1,175 @@
+"""
+대시보드 추세 (user_daily_stats 롤업 기반)
+
+롤업은 today_meal_items / activities / weights 쓰기 시점에 트리거로 유지되므로
+(db/migrations.py 007) 조회는 기간 일수만큼의 행만 읽는다.
+
+사용법 (backend 디렉터리에서):
+    python -m services.stats_service rebuild            # 전체 롤업 재생성
+    python -m services.stats_service rebuild --user 3
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+
+from models.stats_model import list_daily_stats, rebuild_stats, iter_bucketed_stats
+
+PERIOD_DAYS = {"weekly": 7, "monthly": 30, "yearly": 365}
+
+# API 지표 이름 → 롤업 컬럼
+METRICS = {
+    "calories": "intake_kcal",
+    "protein": "protein",
+    "activity": "activity_minutes",
+    "burned": "burned_kcal",
+    "weight": "weight",
+}
+
+# 합계가 아닌 지표는 기록이 있는 날만 반환 (0 으로 채우면 추세가 왜곡됨)
+_SPARSE_METRICS = {"weight"}
+
+
+def _number(v):
+    if v is None:
+        return None
+    return int(v) if float(v).is_integer() else round(v, 2)
+
+
+def daily_series(user_id: int, metric: str, days: int, end=None) -> list:
+    """
+    end(기본: 오늘)까지 days 일의 [{date, value}]
+    합계 지표는 기록이 없는 날을 0 으로 채운다
+    """
+    column = METRICS[metric]
+    end = end or datetime.now().date()
+    start = end - timedelta(days=days - 1)
+    rows = {
+        r["date"]: r[column]
+        for r in list_daily_stats(user_id, start.isoformat(), end.isoformat())
+    }
+
+    if metric in _SPARSE_METRICS:
+        return [{"date": d, "value": _number(v)} for d, v in rows.items() if v is not None]
+
+    result = []
+    for i in range(days):
+        d = (start + timedelta(days=i)).isoformat()
+        result.append({"date": d, "value": _number(rows.get(d) or 0)})
+    return result
+
+
+# ===============================
+# 임의 기간 / 해상도 추세
+# ===============================
+BUCKETS = ("day", "week", "month")
+
+
+def bucket_start(d, bucket: str):
+    if bucket == "week":
+        return d - timedelta(days=d.weekday())
+    if bucket == "month":
+        return d.replace(day=1)
+    return d
+
+
+def next_bucket(d, bucket: str):
+    if bucket == "week":
+        return d + timedelta(days=7)
+    if bucket == "month":
+        return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return d + timedelta(days=1)
+
+
+def count_buckets(start, end, bucket: str) -> int:
+    if bucket == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    if bucket == "week":
+        return (bucket_start(end, "week") - bucket_start(start, "week")).days // 7 + 1
+    return (end - start).days + 1
+
+
+def iter_trend(user_id: int, metric: str, start, end, bucket: str = "day"):
+    """
+    {"date": 버킷 시작일, "value": 값} 을 날짜순으로 하나씩 반환
+    - 합계 지표: 버킷 합계, 빈 버킷은 0 으로 채움
+    - weight: 버킷 평균, 기록이 있는 버킷만
+    """
+    column = METRICS[metric]
+    sparse = metric in _SPARSE_METRICS
+    rows = iter_bucketed_stats(
+        user_id, column, start.isoformat(), end.isoformat(), bucket,
+        agg="AVG" if sparse else "SUM",
+    )
+    if sparse:
+        for key, value in rows:
+            yield {"date": key, "value": _number(value)}
+        return
+
+    cursor = bucket_start(start, bucket)
+    for key, value in rows:
+        key_d = datetime.strptime(key, "%Y-%m-%d").date()
+        while cursor < key_d:
+            yield {"date": cursor.isoformat(), "value": 0}
+            cursor = next_bucket(cursor, bucket)
+        yield {"date": key, "value": _number(value or 0)}
+        cursor = next_bucket(key_d, bucket)
+    while cursor <= end:
+        yield {"date": cursor.isoformat(), "value": 0}
+        cursor = next_bucket(cursor, bucket)
+
+
+def lttb(points: list, threshold: int) -> list:
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링
+    첫/마지막 점은 유지하고, 사이 구간마다 이웃 구간 평균과 만드는 삼각형이 가장 큰 점을 고른다
+    (급격한 변화(피크)를 평균보다 잘 보존)
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return points
+
+    xs = [datetime.strptime(p["date"], "%Y-%m-%d").toordinal() for p in points]
+    ys = [p["value"] or 0 for p in points]
+
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # 다음 구간 평균 (삼각형의 세 번째 꼭짓점)
+        nxt_start = int((i + 1) * every) + 1
+        nxt_end = min(int((i + 2) * every) + 1, n)
+        span = max(nxt_end - nxt_start, 1)
+        avg_x = sum(xs[nxt_start:nxt_end]) / span
+        avg_y = sum(ys[nxt_start:nxt_end]) / span
+
+        cur_start = int(i * every) + 1
+        cur_end = int((i + 1) * every) + 1
+        best, best_area = cur_start, -1.0
+        for j in range(cur_start, cur_end):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "rebuild":
+        print(__doc__)
+        return 2
+
+    user_id = None
+    if "--user" in argv:
+        user_id = int(argv[argv.index("--user") + 1])
+
+    started = time.perf_counter()
+    rows = rebuild_stats(user_id)
+    print(f"[STATS] 롤업 재생성 완료: rows={rows} ({(time.perf_counter() - started) * 1000:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
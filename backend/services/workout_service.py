@@ -1,3 +1,7 @@
+import hashlib
+import json
+
+
 # This would typically fetch from a database, but for now we'll use dummy data
 def get_all_workouts():
     return [
@@ -73,4 +77,10 @@ def get_all_workouts():
             "description": "유산소 능력과 지구력을 극대화하는 고급 인터벌 러닝 루틴입니다.",
             "videoUrl": "https://www.youtube.com/watch=dQw4w9WgXcQ",
         },
-    ]
\ No newline at end of file
+    ]
+
+
+def workouts_version() -> str:
+    """운동 목록 내용 해시 (ETag 용) - 목록이 바뀌면 달라진다"""
+    raw = json.dumps(get_all_workouts(), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,98 @@
+"""
+응답 압축 (gzip / br)
+
+월간 일정, 주간 계획, 캘린더, 대화 로그 내보내기 등 반복이 많은 JSON(한글) 응답을
+Accept-Encoding 에 맞춰 압축한다.
+
+- br(brotli 설치 시) > gzip 순으로 클라이언트가 허용한 것 선택 (q=0 은 제외)
+- COMPRESS_MIN_BYTES 보다 작은 본문, 이미 인코딩된 응답, 204/304, 압축 효과 없는 타입은 그대로
+- 스트리밍 응답(대화 로그 내보내기 등)은 청크마다 이어서 압축 (sync flush 로 바로 전송)
+- Vary: Accept-Encoding 추가 (ETag 는 weak 라 그대로 유효)
+- COMPRESS_ENABLED=0 이면 끔 (앞단 nginx 가 압축하는 배포 등)
+"""
+import gzip
+import os
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "1") == "1"
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+# 동적 응답이므로 압축률보다 속도 위주 (0~11)
+COMPRESS_BR_QUALITY = int(os.getenv("COMPRESS_BR_QUALITY", "4"))
+COMPRESS_MIMETYPES = {"application/json", "text/html", "text/plain", "text/css", "text/csv", "application/javascript"}
+
+
+def available_encodings() -> list:
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def choose_encoding(accept) -> str | None:
+    """Accept-Encoding(werkzeug Accept) → 사용할 인코딩 (없으면 None)"""
+    best, best_q = None, 0
+    for enc in available_encodings():
+        q = accept.quality(enc)
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=COMPRESS_BR_QUALITY)
+    return gzip.compress(data, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+
+def _compress_stream(chunks, encoding: str):
+    if encoding == "br":
+        comp = brotli.Compressor(quality=COMPRESS_BR_QUALITY)
+        for chunk in chunks:
+            out = comp.process(chunk.encode("utf-8") if isinstance(chunk, str) else chunk) + comp.flush()
+            if out:
+                yield out
+        yield comp.finish()
+        return
+
+    # wbits 16+ → gzip 헤더/트레일러
+    comp = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        out = comp.compress(chunk.encode("utf-8") if isinstance(chunk, str) else chunk) + comp.flush(zlib.Z_SYNC_FLUSH)
+        if out:
+            yield out
+    yield comp.flush()
+
+
+def compress_response(response):
+    if not COMPRESS_ENABLED or request.method == "HEAD":
+        return response
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return response
+    if response.mimetype not in COMPRESS_MIMETYPES or "Content-Encoding" in response.headers:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < COMPRESS_MIN_BYTES:
+            return response
+        response.set_data(compress_bytes(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_app(app):
+    """Flask 앱에 응답 압축 훅 등록"""
+    app.after_request(compress_response)
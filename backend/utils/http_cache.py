@@ -0,0 +1,90 @@
+"""
+조회 API 조건부 GET (ETag / 304)
+
+대시보드가 같은 조회 API 를 주기적으로 다시 부르므로, 응답 본문 대신 사용자별 데이터 버전
+(user_data_versions, 원천 테이블 트리거가 쓰기마다 증가)으로 ETag 를 만든다.
+
+- If-None-Match 가 현재 ETag 와 같으면 라우트 함수(조회 쿼리)를 실행하지 않고 304
+- ETag = hash(경로+쿼리, 사용자, 오늘 날짜, 관련 테이블 버전) → 날짜가 바뀌면 자동 무효화
+- 라우트 실행 중 버전이 바뀌었으면(조회 중 쓰기) ETag 를 붙이지 않는다 (낡은 본문에 새 태그 방지)
+- 사용자 데이터: Cache-Control: private, no-cache (브라우저는 저장하되 매번 재검증)
+- HTTP_CACHE_ENABLED=0 이면 끔
+"""
+import hashlib
+import os
+from datetime import date
+from functools import wraps
+
+from flask import make_response, request
+from flask_jwt_extended import get_jwt_identity
+
+from models.data_version_model import get_data_versions
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "1") == "1"
+# 응답 형식이 바뀌면 올려서 기존 ETag 를 모두 무효화
+HTTP_CACHE_SALT = os.getenv("HTTP_CACHE_SALT", "1")
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _etag(parts) -> str:
+    raw = "|".join(str(p) for p in (HTTP_CACHE_SALT, request.full_path, *parts))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:24]
+
+
+def _not_modified(tag: str, cache_control: str):
+    resp = make_response("", 304)
+    resp.set_etag(tag, weak=True)
+    resp.headers["Cache-Control"] = cache_control
+    return resp
+
+
+def _conditional(fn, args, kwargs, make_tag, cache_control):
+    tag = make_tag()
+    if request.if_none_match.contains_weak(tag):
+        return _not_modified(tag, cache_control)
+
+    resp = make_response(fn(*args, **kwargs))
+    if resp.status_code == 200 and make_tag() == tag:
+        resp.set_etag(tag, weak=True)
+        resp.headers["Cache-Control"] = cache_control
+    return resp
+
+
+def etag_by_versions(*sources):
+    """
+    사용자 데이터 조회 라우트용 (@jwt_required() 아래에 둔다)
+    sources: 응답이 의존하는 테이블 (db.migrations.DATA_VERSION_TABLES 중)
+
+        @bp.route("/month")
+        @jwt_required()
+        @etag_by_versions("schedules")
+        def list_month(): ...
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not HTTP_CACHE_ENABLED or request.method != "GET":
+                return fn(*args, **kwargs)
+            user_id = get_jwt_identity()
+
+            def make_tag():
+                versions = get_data_versions(user_id, sources)
+                return _etag([user_id, date.today().isoformat(), *versions.values()])
+
+            return _conditional(fn, args, kwargs, make_tag, PRIVATE_CACHE_CONTROL)
+        return wrapper
+    return decorator
+
+
+def etag_static(version: str, max_age: int = 3600):
+    """코드에 고정된 데이터 조회용 - version(데이터 해시)이 같으면 304, 공용 캐시 허용"""
+    cache_control = f"public, max-age={int(max_age)}"
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not HTTP_CACHE_ENABLED or request.method != "GET":
+                return fn(*args, **kwargs)
+            return _conditional(fn, args, kwargs, lambda: _etag([version]), cache_control)
+        return wrapper
+    return decorator
@@ -0,0 +1,72 @@
+"""
+빠른 JSON 직렬화 (Flask JSON provider)
+
+jsonify / app.json.dumps 가 orjson 이 설치되어 있으면 orjson 으로, 없으면 표준 json 으로 직렬화한다.
+
+- 출력 의미는 기본 provider 와 같다: 키 정렬, datetime/date 는 HTTP 날짜 문자열,
+  Decimal/UUID/dataclass 는 Flask 기본 변환 (orjson 에는 passthrough 로 넘겨 Flask 규칙 사용)
+- 한글은 \\uXXXX 이스케이프 없이 UTF-8 그대로 (본문이 약 절반 크기, 파싱 결과는 같음)
+- orjson 이 처리 못 하는 값(64비트 초과 정수 등)은 표준 json 으로 다시 직렬화
+- 디버그 모드 등 pretty print 가 필요하면 기본 구현 사용
+- JSON_FAST=0 이면 끔 (표준 json, ensure_ascii=False 만 적용)
+"""
+import json
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+JSON_FAST = os.getenv("JSON_FAST", "1") == "1"
+
+if orjson is not None:
+    _ORJSON_OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    ensure_ascii = False
+
+    @property
+    def backend(self) -> str:
+        return "orjson" if (orjson is not None and JSON_FAST) else "json"
+
+    def dumps_bytes(self, obj) -> bytes:
+        """UTF-8 bytes 로 직렬화 (응답 본문/스트리밍용 - str 변환 생략)"""
+        if orjson is not None and JSON_FAST:
+            try:
+                return orjson.dumps(obj, default=self.default, option=_ORJSON_OPTIONS)
+            except (orjson.JSONEncodeError, TypeError):
+                pass
+        return json.dumps(
+            obj, default=self.default, ensure_ascii=False, sort_keys=self.sort_keys, separators=(",", ":")
+        ).encode("utf-8")
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            # indent 등 옵션이 있으면 기본 구현
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and JSON_FAST and not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                # 표준 json 만 받는 입력(NaN 등)은 기본 구현으로 재시도
+                pass
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
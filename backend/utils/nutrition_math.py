@@ -0,0 +1,128 @@
+"""
+BMR / TDEE / 영양 목표 계산 (공용)
+
+- calorie_service(일일 요약)와 user_routes / diet_routes(영양 목표)가 같은 상수와 식을 쓴다
+- 스칼라 함수: 요청 하나 처리용
+- *_batch 함수: NumPy 배열 연산으로 여러 사용자를 한 번에 계산 (전체 재계산/야간 배치용)
+  스칼라 함수와 결과가 같다 (benchmarks/nutrition_math.py 에서 검증)
+
+BMR 은 Mifflin-St Jeor: 10*체중 + 6.25*키 - 5*나이 + 성별 보정
+"""
+import numpy as np
+
+# 프론트(low/medium/high)와 기존 요약 코드(sedentary~very_active) 표기를 모두 받는다
+ACTIVITY_FACTORS = {
+    "low": 1.2,
+    "medium": 1.55,
+    "high": 1.75,
+    "sedentary": 1.2,
+    "light": 1.375,
+    "moderate": 1.55,
+    "active": 1.725,
+    "very_active": 1.9,
+}
+DEFAULT_ACTIVITY_FACTOR = 1.2
+
+# 성별 보정 (모르면 남녀 중간값)
+SEX_OFFSETS = {
+    "male": 5, "m": 5, "남": 5, "남성": 5,
+    "female": -161, "f": -161, "여": -161, "여성": -161,
+}
+UNKNOWN_SEX_OFFSET = -78
+
+DEFAULT_AGE = 30
+
+# 목표 → (TDEE 대비 칼로리 조정, 체중 1kg 당 단백질 g, 활동 소모 목표 kcal)
+GOAL_RULES = {
+    "loss": (-400, 2.0, 500),
+    "gain": (300, 2.0, 300),
+    "maintain": (0, 1.6, 400),
+}
+GOAL_ALIASES = {"감량": "loss", "loss": "loss", "증량": "gain", "gain": "gain"}
+
+
+def activity_factor(level) -> float:
+    return ACTIVITY_FACTORS.get((level or "").strip().lower(), DEFAULT_ACTIVITY_FACTOR)
+
+
+def sex_offset(sex) -> int:
+    return SEX_OFFSETS.get((sex or "").strip().lower(), UNKNOWN_SEX_OFFSET)
+
+
+def goal_rule(goal) -> tuple:
+    return GOAL_RULES[GOAL_ALIASES.get((goal or "").strip(), "maintain")]
+
+
+def calc_bmr(weight, height, age=None, sex=None) -> float:
+    """체중/키가 없으면 0.0"""
+    if not weight or not height:
+        return 0.0
+    age = age if (age and age > 0) else DEFAULT_AGE
+    return 10 * float(weight) + 6.25 * float(height) - 5 * float(age) + sex_offset(sex)
+
+
+def calc_tdee(weight, height, age=None, sex=None, activity_level=None) -> float:
+    return calc_bmr(weight, height, age, sex) * activity_factor(activity_level)
+
+
+def calc_nutrition_goal(weight, height, age=None, sex=None, activity_level=None, goal=None):
+    """(calories, protein, activity_kcal) - 체중/키가 없으면 ValueError"""
+    if not weight or not height:
+        raise ValueError("weight와 height는 필수입니다.")
+    tdee = calc_tdee(weight, height, age, sex, activity_level)
+    cal_delta, protein_per_kg, activity_kcal = goal_rule(goal)
+    return int(tdee + cal_delta), int(float(weight) * protein_per_kg), activity_kcal
+
+
+# ===============================
+# 배치 (NumPy)
+# ===============================
+def _lookup(values, fn) -> np.ndarray:
+    """문자열 열 → 수치 열. 고유값마다 한 번만 fn 을 호출하고 나머지는 dict 조회"""
+    table = {v: fn(v) for v in set(values)}
+    return np.fromiter(map(table.__getitem__, values), dtype=np.float64, count=len(values))
+
+
+def _numeric(values) -> np.ndarray:
+    # None → nan → 0 (스칼라 함수의 "값 없음"과 같게)
+    return np.nan_to_num(np.array(values, dtype=np.float64), nan=0.0)
+
+
+def _bmr_arrays(w, h, age, sex) -> np.ndarray:
+    a = _numeric(age)
+    a = np.where(a > 0, a, DEFAULT_AGE)
+    bmr = 10 * w + 6.25 * h - 5 * a + _lookup(sex, sex_offset)
+    return np.where((w > 0) & (h > 0), bmr, 0.0)
+
+
+def calc_bmr_batch(weight, height, age, sex) -> np.ndarray:
+    """calc_bmr 의 배열 버전 (체중/키가 없는 행은 0.0)"""
+    return _bmr_arrays(_numeric(weight), _numeric(height), age, sex)
+
+
+def calc_tdee_batch(weight, height, age, sex, activity_level) -> np.ndarray:
+    return calc_bmr_batch(weight, height, age, sex) * _lookup(activity_level, activity_factor)
+
+
+def calc_nutrition_goal_batch(weight, height, age, sex, activity_level, goal):
+    """
+    calc_nutrition_goal 의 배열 버전 (입력은 열 단위 시퀀스)
+    반환: (calories, protein, activity_kcal, valid) - valid 가 False 인 행(체중/키 없음)은 0
+    """
+    w, h = _numeric(weight), _numeric(height)
+    valid = (w > 0) & (h > 0)
+    tdee = _bmr_arrays(w, h, age, sex) * _lookup(activity_level, activity_factor)
+
+    names = list(GOAL_RULES)
+    rules = np.array([GOAL_RULES[n] for n in names], dtype=np.float64)
+    rule = rules[_lookup(goal, lambda g: names.index(GOAL_ALIASES.get((g or "").strip(), "maintain"))).astype(np.int64)]
+
+    calories = np.trunc(tdee + rule[:, 0]).astype(np.int64)
+    protein = np.trunc(w * rule[:, 1]).astype(np.int64)
+    activity_kcal = rule[:, 2].astype(np.int64)
+    return (
+        np.where(valid, calories, 0),
+        np.where(valid, protein, 0),
+        np.where(valid, activity_kcal, 0),
+        valid,
+    )
@@ -0,0 +1,33 @@
+"""
+운영용 WSGI 엔트리 포인트
+
+    gunicorn -c gunicorn.conf.py wsgi:app     # Linux / Docker (권장)
+    python -m wsgi                            # waitress (gunicorn 을 쓸 수 없는 환경, 예: Windows)
+
+waitress 설정: PORT, WAITRESS_THREADS (기본 8)
+"""
+import atexit
+import os
+import sys
+
+from app import app
+from services.lifecycle import shutdown_background
+
+WAITRESS_THREADS = int(os.getenv("WAITRESS_THREADS", "8"))
+
+
+def main() -> int:
+    try:
+        from waitress import serve
+    except ImportError:
+        print("[APP] waitress 가 설치되어 있지 않습니다: pip install waitress (또는 gunicorn 사용)")
+        return 1
+
+    # 단일 프로세스 + 스레드 모델. 종료(Ctrl+C/SIGTERM) 시 백그라운드 큐 정리
+    atexit.register(shutdown_background)
+    serve(app, host="0.0.0.0", port=int(os.getenv("PORT", "5000")), threads=WAITRESS_THREADS)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())